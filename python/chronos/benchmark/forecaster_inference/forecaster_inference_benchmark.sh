@@ -23,3 +23,8 @@ echo "Chronos_Perf: Running TCNForecaster Inference with OpenVINO"
 source bigdl-nano-init
 python forecaster_inference.py --name "TCNForecaster Inference with OpenVINO" --accelerator "openvino"
 source bigdl-nano-unset-env
+
+echo "Chronos_Perf: Running TCNForecaster Online Latency with ONNX"
+source bigdl-nano-init
+python forecaster_online_latency.py --name "TCNForecaster Online Latency with ONNX" --accelerator "onnx"
+source bigdl-nano-unset-env
@@ -0,0 +1,80 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+# Latency of forecasting the latest window of a time series one point at a time,
+# compares predict on the latest rolled TSDataset with predict_latest.
+
+import argparse
+import json
+import numpy as np
+from bigdl.chronos.forecaster import TCNForecaster
+from bigdl.chronos.data import get_public_dataset
+from bigdl.chronos.metric.forecast_metrics import Evaluator
+from sklearn.preprocessing import StandardScaler
+
+lookback, horizon = 48, 1
+
+parser = argparse.ArgumentParser(description="TCNForecaster Online Latency")
+parser.add_argument("--name", default="TCNForecaster Online Latency", type=str)
+parser.add_argument("--accelerator", default="pytorch", type=str)
+parser.add_argument("--num_running", default=1000, type=int)
+
+
+def main():
+    args = parser.parse_args()
+    tsdata_train, _, tsdata_test = get_public_dataset(name="nyc_taxi")
+    scaler = StandardScaler()
+    for tsdata in [tsdata_train, tsdata_test]:
+        tsdata.deduplicate().impute().scale(scaler, fit=(tsdata is tsdata_train))
+
+    forecaster = TCNForecaster.from_tsdataset(tsdata_train, past_seq_len=lookback,
+                                              future_seq_len=horizon, seed=1)
+    forecaster.fit(tsdata_train, epochs=1)
+    if args.accelerator == "onnx":
+        forecaster.build_onnx()
+    elif args.accelerator == "openvino":
+        forecaster.build_openvino()
+    elif args.accelerator == "jit":
+        forecaster.build_jit()
+
+    history = tsdata_test.df.iloc[:-args.num_running]
+    new_points = tsdata_test.df[tsdata_test.target_col].values[-args.num_running:]\
+        .astype(np.float32)
+    latest = tsdata_test.df[tsdata_test.target_col].values[None, -lookback:].astype(np.float32)
+
+    # predict on the latest window built by user
+    predict_latency = Evaluator.get_latency(forecaster.predict, latest, batch_size=None,
+                                            num_running=args.num_running)
+
+    # predict_latest on the ring buffer, one new point per call
+    tsdata_test.df = history
+    forecaster.predict_latest(tsdata_test)
+    points = iter(new_points)
+    latest_latency = Evaluator.get_latency(lambda: forecaster.predict_latest(next(points)[None],
+                                                                             id="0"),
+                                           num_running=args.num_running)
+
+    output = json.dumps({
+        "config": args.name,
+        "accelerator": args.accelerator,
+        "predict_latency": predict_latency,
+        "predict_latest_latency": latest_latency
+    })
+    print(f'>>>{output}<<<')
+
+
+if __name__ == "__main__":
+    main()
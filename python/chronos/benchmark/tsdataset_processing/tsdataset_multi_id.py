@@ -0,0 +1,83 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+# Compares TSDataset impute/resample on many series with imputing/resampling
+# each series separately, for a sweep of the number of ids and series length.
+
+import time
+import json
+import argparse
+
+import numpy as np
+import pandas as pd
+from bigdl.chronos.data import TSDataset
+from bigdl.chronos.data.utils.impute import impute_timeseries_dataframe
+from bigdl.chronos.data.utils.resample import resample_timeseries_dataframe
+
+parser = argparse.ArgumentParser(description="TSDataset multi-id processing")
+parser.add_argument("--num_ids", default="10,100,1000", type=str,
+                    help="comma separated numbers of ids")
+parser.add_argument("--lengths", default="50,500", type=str,
+                    help="comma separated lengths of each series")
+parser.add_argument("--mode", default="last", type=str, help="imputation mode")
+parser.add_argument("--skip_per_id", action="store_true",
+                    help="skip the per id baseline, which is slow for many ids")
+
+
+def get_df(num_id, length):
+    df = pd.DataFrame({"datetime": np.tile(pd.date_range('1/1/2019', periods=length,
+                                                         freq='H'), num_id),
+                       "id": np.repeat(np.arange(num_id).astype(str), length),
+                       "value": np.random.randn(num_id * length).astype(np.float32),
+                       "extra feature": np.random.randn(num_id * length)})
+    df.loc[np.random.rand(len(df)) < 0.1, ["value", "extra feature"]] = np.nan
+    return df
+
+
+def per_id_impute(df, mode):
+    return pd.concat([impute_timeseries_dataframe(group, "datetime", mode=mode)
+                      for _, group in df.groupby("id")]).reset_index(drop=True)
+
+
+def per_id_resample(df):
+    result = []
+    for id_name, group in df.groupby("id"):
+        res = resample_timeseries_dataframe(group.drop(columns="id"), "datetime", "2H")
+        res["id"] = id_name
+        result.append(res)
+    return pd.concat(result).reset_index(drop=True)
+
+
+def timeit(func, *args):
+    start = time.time()
+    func(*args)
+    return time.time() - start
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    for num_id in map(int, args.num_ids.split(",")):
+        for length in map(int, args.lengths.split(",")):
+            df = get_df(num_id, length)
+            tsdata = TSDataset.from_pandas(df, dt_col="datetime", target_col="value",
+                                           extra_feature_col=["extra feature"], id_col="id")
+            result = {"num_id": num_id, "length": length,
+                      "impute_time": timeit(tsdata.impute, args.mode),
+                      "resample_time": timeit(tsdata.resample, "2H")}
+            if not args.skip_per_id:
+                result["per_id_impute_time"] = timeit(per_id_impute, df, args.mode)
+                result["per_id_resample_time"] = timeit(per_id_resample, df)
+            print(f'>>>{json.dumps(result)}<<<')
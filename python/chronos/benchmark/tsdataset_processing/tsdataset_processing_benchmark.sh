@@ -10,4 +10,10 @@ cd $ANALYTICS_ZOO_ROOT/python/chronos/benchmark/tsdataset_processing/
 echo "Chronos_Perf: Running TSDataset Processing Baseline"
 source bigdl-nano-init
 python tsdataset_processing.py --name "TSDataset Processing Baseline on nyc_taxi"
+
+echo "Chronos_Perf: Running TSDataset Multi-id Processing"
+python tsdataset_multi_id.py --num_ids 10,1000,10000 --lengths 50,500 --skip_per_id
+
+echo "Chronos_Perf: Running TSDataset Torch DataLoader"
+python tsdataset_torch_loader.py
 source bigdl-nano-unset-env
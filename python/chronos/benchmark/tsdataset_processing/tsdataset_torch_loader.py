@@ -0,0 +1,65 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+# Samples/sec of iterating TSDataset.to_torch_data_loader, fetching sample by sample
+# or a whole batch at once, with different number of workers.
+
+import time
+import json
+import argparse
+
+import numpy as np
+import pandas as pd
+from bigdl.chronos.data import TSDataset
+
+parser = argparse.ArgumentParser(description="TSDataset torch data loader")
+parser.add_argument("--length", default=100000, type=int, help="length of each series")
+parser.add_argument("--num_id", default=4, type=int, help="number of ids")
+parser.add_argument("--num_feature", default=8, type=int, help="number of extra features")
+parser.add_argument("--lookback", default=48, type=int)
+parser.add_argument("--horizon", default=1, type=int)
+parser.add_argument("--batch_size", default=256, type=int)
+parser.add_argument("--num_workers", default="0,2", type=str,
+                    help="comma separated numbers of workers")
+
+
+def get_tsdata(args):
+    num_row = args.length * args.num_id
+    df = pd.DataFrame(np.random.randn(num_row, args.num_feature + 1),
+                      columns=["value"] + [f"f{i}" for i in range(args.num_feature)])
+    df["datetime"] = np.tile(pd.date_range('1/1/2019', periods=args.length, freq='H'),
+                             args.num_id)
+    df["id"] = np.repeat(np.arange(args.num_id), args.length)
+    return TSDataset.from_pandas(df, dt_col="datetime", target_col="value", id_col="id",
+                                 extra_feature_col=[f"f{i}" for i in range(args.num_feature)])
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    tsdata = get_tsdata(args)
+    for num_workers in map(int, args.num_workers.split(",")):
+        for batch_fetch in [False, True]:
+            loader = tsdata.to_torch_data_loader(batch_size=args.batch_size,
+                                                 lookback=args.lookback,
+                                                 horizon=args.horizon,
+                                                 num_workers=num_workers,
+                                                 batch_fetch=batch_fetch)
+            start = time.time()
+            num_sample = sum(x.shape[0] for x, _ in loader)
+            output = json.dumps({"num_workers": num_workers,
+                                 "batch_fetch": batch_fetch,
+                                 "samples_per_sec": num_sample / (time.time() - start)})
+            print(f'>>>{output}<<<')
@@ -22,7 +22,7 @@ from bigdl.chronos.data.utils.roll import roll_timeseries_dataframe
 from bigdl.chronos.data.utils.impute import impute_timeseries_dataframe
 from bigdl.chronos.data.utils.split import split_timeseries_dataframe
 from bigdl.chronos.data.experimental.utils import add_row, transform_to_dict
-from bigdl.chronos.data.utils.scale import unscale_timeseries_numpy
+from bigdl.chronos.data.utils.scale import unscale_timeseries_numpy, merge_scaler
 
 
 _DEFAULT_ID_COL_NAME = "id"
@@ -261,7 +261,7 @@ class XShardsTSDataset:
 
         return self
 
-    def scale(self, scaler, fit=True):
+    def scale(self, scaler, fit=True, incremental=False):
         '''
         Scale the time series dataset's feature column and target column.
 
@@ -272,6 +272,11 @@ class XShardsTSDataset:
         :param fit: if we need to fit the scaler. Typically, the value should
                be set to True for training set, while False for validation and
                test set. The value is defaulted to True.
+        :param incremental: if True and fit=True, the scalers already fitted are updated
+               with this dataset instead of being refit from scratch, so that new data
+               could be scaled without another pass over the previous data. Scalers fitted
+               on different shards are merged by running moments, StandardScaler,
+               MaxAbsScaler and MinMaxScaler are supported. The value is defaulted to False.
 
         :return: the xshardtsdataset instance.
 
@@ -289,10 +294,12 @@ class XShardsTSDataset:
             This function is used to fit scaler dictionary on each shard.
             returns a dictionary of id-scaler pair for each shard.
 
-            Note: this function will not transform the shard.
+            Note: this function will not transform the shard, and will not change
+            the state of the input scaler.
             '''
-            scaler_for_this_id = scaler[df[id_col].iloc[0]]
-            df[target_col + feature_col] = scaler_for_this_id.fit(df[target_col + feature_col])
+            from sklearn.base import clone
+            scaler_for_this_id = clone(scaler[df[id_col].iloc[0]])
+            scaler_for_this_id.fit(df[target_col + feature_col])
 
             return {id_col: df[id_col].iloc[0], "scaler": scaler_for_this_id}
 
@@ -317,8 +324,15 @@ class XShardsTSDataset:
         if fit:
             self.shards_scaler = self.shards.transform_shard(_fit, self.id_col, scaler,
                                                              self.feature_col, self.target_col)
-            self.scaler_dict = self.shards_scaler.collect()
-            self.scaler_dict = {sc[self.id_col]: sc["scaler"] for sc in self.scaler_dict}
+            shard_scalers = {}
+            if incremental:
+                # fitted scalers keep the running state of the previous data
+                shard_scalers = {id: [sc] for id, sc in scaler.items()
+                                 if hasattr(sc, "n_samples_seen_")}
+            for sc in self.shards_scaler.collect():
+                shard_scalers.setdefault(sc[self.id_col], []).append(sc["scaler"])
+            self.scaler_dict = {id: merge_scaler(scalers)
+                                for id, scalers in shard_scalers.items()}
             scaler.update(self.scaler_dict)  # make the change up-to-date outside the tsdata
 
             self.shards = self.shards.transform_shard(_transform, self.id_col, self.scaler_dict,
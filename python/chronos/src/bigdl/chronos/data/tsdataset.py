@@ -22,12 +22,12 @@ import logging
 from bigdl.chronos.data.utils.feature import generate_dt_features, generate_global_features
 from bigdl.chronos.data.utils.impute import impute_timeseries_dataframe
 from bigdl.chronos.data.utils.deduplicate import deduplicate_timeseries_dataframe
-from bigdl.chronos.data.utils.roll import roll_timeseries_dataframe
+from bigdl.chronos.data.utils.roll import roll_timeseries_dataframe, _concat_roll_result
 from bigdl.chronos.data.utils.time_feature import time_features, gen_time_enc_arr
 from bigdl.chronos.data.utils.scale import unscale_timeseries_numpy
 from bigdl.chronos.data.utils.resample import resample_timeseries_dataframe
 from bigdl.chronos.data.utils.split import split_timeseries_dataframe
-from bigdl.chronos.data.utils.cycle_detection import cycle_length_est
+from bigdl.chronos.data.utils.cycle_detection import cycle_length_est_batch
 from bigdl.chronos.data.utils.quality_inspection import quality_check_timeseries_dataframe,\
     _abnormal_value_repair
 from bigdl.chronos.data.utils.utils import _to_list, _check_type,\
@@ -71,6 +71,8 @@ class TSDataset:
         self.scaler_index = [i for i in range(len(self.target_col))]
         self.id_sensitive = None
         self._has_generate_agg_feature = False
+        # (aggregate, top_k, max_ids) -> cycle length, cleared when target_col is changed
+        self._cycle_length_cache = {}
         if not self.deploy_mode:
             self._check_basic_invariants()
 
@@ -185,9 +187,16 @@ class TSDataset:
                      test_ratio=0.1,
                      repair=False,
                      deploy_mode=False,
+                     start_time=None,
+                     end_time=None,
+                     ids=None,
+                     ids_per_chunk=None,
                      **kwargs):
         """
         Initialize tsdataset(s) from path of parquet file.
+        Only dt_col, target_col, id_col and extra_feature_col are read from the file, and
+        the filters on time range and ids are pushed down to pyarrow to skip the row groups
+        and partitions out of range.
 
         :param path: A string path to parquet file. The string could be a URL.
                Valid URL schemes include hdfs, http, ftp, s3, gs, and file. For file URLs, a host
@@ -215,11 +224,23 @@ class TSDataset:
         :param deploy_mode: a bool indicates whether to use deploy mode, which will be used in
                production environment to reduce the latency of data processing. The value
                defaults to False.
+        :param start_time: (optional) only the rows with dt_col no earlier than start_time
+               are read. The value defaults to None.
+        :param end_time: (optional) only the rows with dt_col no later than end_time
+               are read. The value defaults to None.
+        :param ids: (optional) a list of ids, only the rows of these ids are read.
+               The value defaults to None.
+        :param ids_per_chunk: (optional) an int, if set, a generator is returned, which
+               reads the file by pyarrow.dataset and yields the TSDataset(s) of ids_per_chunk
+               ids at a time, so that the peak memory is bounded by the chunk. It requires
+               id_col. The value defaults to None.
         :param kwargs: Any additional kwargs are passed to the pd.read_parquet
-               and pyarrow.parquet.read_table.
+               and pyarrow.parquet.read_table, or pyarrow.dataset.dataset if ids_per_chunk
+               is set.
 
         :return: a TSDataset instance when with_split is set to False,
-                 three TSDataset instances when with_split is set to True.
+                 three TSDataset instances when with_split is set to True,
+                 or a generator of them when ids_per_chunk is set.
 
         Create a tsdataset instance by:
 
@@ -233,23 +254,44 @@ class TSDataset:
         >>>                                   target_col="value", id_col="id",
         >>>                                   extra_feature_col=["extra feature 1",
         >>>                                                      "extra feature 2"])
+        >>> # read the data of 2022 by chunks of 100 ids
+        >>> for tsdataset in TSDataset.from_parquet("hdfs://path/to/table.parquet",
+        >>>                                         dt_col="datetime", target_col="value",
+        >>>                                         id_col="id", start_time="2022-01-01",
+        >>>                                         end_time="2022-12-31", ids_per_chunk=100):
+        >>>     ...
         """
-        from bigdl.chronos.data.utils.file import parquet2pd
+        from bigdl.chronos.data.utils.file import parquet2pd, parquet_filters, \
+            iter_parquet2pd
         columns = _to_list(dt_col, name="dt_col", deploy_mode=deploy_mode) + \
             _to_list(target_col, name="target_col", deploy_mode=deploy_mode) + \
             _to_list(id_col, name="id_col", deploy_mode=deploy_mode) + \
             _to_list(extra_feature_col, name="extra_feature_col", deploy_mode=deploy_mode)
-        df = parquet2pd(path, columns=columns, **kwargs)
-        return TSDataset.from_pandas(df,
-                                     repair=repair,
-                                     dt_col=dt_col,
-                                     target_col=target_col,
-                                     id_col=id_col,
-                                     extra_feature_col=extra_feature_col,
-                                     with_split=with_split,
-                                     val_ratio=val_ratio,
-                                     test_ratio=test_ratio,
-                                     deploy_mode=deploy_mode)
+        if not deploy_mode:
+            from bigdl.nano.utils.log4Error import invalidInputError
+            invalidInputError(id_col is not None or (ids is None and ids_per_chunk is None),
+                              "id_col should be set to filter or chunk by ids.")
+        filters = parquet_filters(dt_col, id_col, start_time=start_time, end_time=end_time,
+                                  ids=ids, filters=kwargs.pop("filters", None))
+
+        def _from_pandas(df):
+            return TSDataset.from_pandas(df,
+                                         repair=repair,
+                                         dt_col=dt_col,
+                                         target_col=target_col,
+                                         id_col=id_col,
+                                         extra_feature_col=extra_feature_col,
+                                         with_split=with_split,
+                                         val_ratio=val_ratio,
+                                         test_ratio=test_ratio,
+                                         deploy_mode=deploy_mode)
+
+        if ids_per_chunk is not None:
+            return (_from_pandas(df)
+                    for df in iter_parquet2pd(path, id_col, columns=columns, filters=filters,
+                                              ids=ids, ids_per_chunk=ids_per_chunk, **kwargs))
+        df = parquet2pd(path, columns=columns, filters=filters, **kwargs)
+        return _from_pandas(df)
 
     @staticmethod
     def from_prometheus(prometheus_url,
@@ -355,15 +397,13 @@ class TSDataset:
 
         :return: the tsdataset instance.
         '''
-        result = []
-        groups = self.df.groupby([self.id_col])
-        for _, group in groups:
-            result.append(impute_timeseries_dataframe(df=group,
-                                                      dt_col=self.dt_col,
-                                                      mode=mode,
-                                                      const_num=const_num))
-        self.df = pd.concat(result, axis=0)
+        self.df = impute_timeseries_dataframe(df=self.df,
+                                              dt_col=self.dt_col,
+                                              mode=mode,
+                                              const_num=const_num,
+                                              id_col=self.id_col)
         self.df.reset_index(drop=True, inplace=True)
+        self._cycle_length_cache.clear()
         return self
 
     def deduplicate(self):
@@ -374,6 +414,7 @@ class TSDataset:
         :return: the tsdataset instance.
         '''
         self.df = deduplicate_timeseries_dataframe(df=self.df, dt_col=self.dt_col)
+        self._cycle_length_cache.clear()
         return self
 
     def resample(self, interval, start_time=None, end_time=None, merge_mode="mean"):
@@ -406,18 +447,18 @@ class TSDataset:
                 invalidInputError(False,
                                   "All the columns of target_col "
                                   "and extra_feature_col should be of numeric type.")
-        self.df = self.df.groupby([self.id_col]) \
-            .apply(lambda df: resample_timeseries_dataframe(df=df,
-                                                            dt_col=self.dt_col,
-                                                            interval=interval,
-                                                            start_time=start_time,
-                                                            end_time=end_time,
-                                                            id_col=self.id_col,
-                                                            merge_mode=merge_mode,
-                                                            deploy_mode=self.deploy_mode))
+        self.df = resample_timeseries_dataframe(df=self.df,
+                                                dt_col=self.dt_col,
+                                                interval=interval,
+                                                start_time=start_time,
+                                                end_time=end_time,
+                                                id_col=self.id_col,
+                                                merge_mode=merge_mode,
+                                                deploy_mode=self.deploy_mode)
         self._freq = pd.Timedelta(interval)
         self._freq_certainty = True
         self.df.reset_index(drop=True, inplace=True)
+        self._cycle_length_cache.clear()
         return self
 
     def repair_abnormal_data(self, mode="relative", threshold=3.0):
@@ -439,6 +480,7 @@ class TSDataset:
         '''
         self.df = _abnormal_value_repair(df=self.df, dt_col=self.dt_col,
                                          mode=mode, threshold=threshold)
+        self._cycle_length_cache.clear()
         return self
 
     def gen_dt_feature(self, features="auto", one_hot_features=None):
@@ -636,7 +678,8 @@ class TSDataset:
              id_sensitive=False,
              time_enc=False,
              label_len=0,
-             is_predict=False):
+             is_predict=False,
+             strided=False):
         '''
         Sampling by rolling for machine learning/deep learning models.
 
@@ -679,6 +722,12 @@ class TSDataset:
         :param is_predict: bool.
                This parameter indicates if the dataset will be sampled as a prediction dataset
                (without groud truth).
+        :param strided: bool.
+               If `strided` is True, samples are read-only strided views of the data instead
+               of copies, so the memory does not grow with lookback. The rolling result is
+               copied only if there are multiple ids, some samples are dropped for N/A or
+               rolling features are appended. Call `.to_numpy(copy=True)` to get writable
+               ndarrays. Default to False.
 
         :return: the tsdataset instance.
 
@@ -758,17 +807,18 @@ class TSDataset:
                                                             feature_col=feature_col,
                                                             target_col=target_col,
                                                             label_len=label_len,
-                                                            deploy_mode=self.deploy_mode))
+                                                            deploy_mode=self.deploy_mode,
+                                                            strided=strided))
 
         # concat the result on required axis
         concat_axis = 2 if id_sensitive else 0
-        self.numpy_x = np.concatenate([rolling_result[i][0]
-                                       for i in range(len(self._id_list))],
-                                      axis=concat_axis).astype(np.float32)
+        self.numpy_x = _concat_roll_result([rolling_result[i][0]
+                                            for i in range(len(self._id_list))],
+                                           concat_axis, strided)
         if (horizon != 0 and is_predict is False) or time_enc:
-            self.numpy_y = np.concatenate([rolling_result[i][1]
-                                           for i in range(len(self._id_list))],
-                                          axis=concat_axis).astype(np.float32)
+            self.numpy_y = _concat_roll_result([rolling_result[i][1]
+                                                for i in range(len(self._id_list))],
+                                               concat_axis, strided)
         else:
             self.numpy_y = None
 
@@ -805,6 +855,12 @@ class TSDataset:
             sorted_index = sorted(range(len(reindex_list)), key=reindex_list.__getitem__)
             self.numpy_x = self.numpy_x[:, :, sorted_index]
 
+        if strided:
+            # copies are also read-only so that results of strided rolling behave the same
+            for arr in [self.numpy_x, self.numpy_y]:
+                if arr is not None:
+                    arr.flags.writeable = False
+
         # scaler index
         num_roll_target = len(self.roll_target)
         repeat_factor = len(self._id_list) if self.id_sensitive else 1
@@ -824,7 +880,11 @@ class TSDataset:
                              shuffle=True,
                              time_enc=False,
                              label_len=0,
-                             is_predict=False):
+                             is_predict=False,
+                             num_workers=0,
+                             prefetch_factor=2,
+                             persistent_workers=False,
+                             batch_fetch=False):
         """
         Convert TSDataset to a PyTorch DataLoader with or without rolling. We recommend to use
         to_torch_data_loader(default roll=True) if you don't need to output the rolled numpy array.
@@ -860,6 +920,18 @@ class TSDataset:
                This parameter should be set to True only when you are processing test data without
                accuracy evaluation. This indicates if the dataset will be sampled as a prediction
                dataset(without groud truth).
+        :param num_workers: int, how many subprocesses to use for data loading.
+               0 means that the data will be loaded in the main process. Default to 0.
+        :param prefetch_factor: int, number of batches loaded in advance by each worker,
+               only effective when num_workers > 0. Default to 2.
+        :param persistent_workers: bool, if True, the worker processes will not be shutdown
+               after a dataset has been consumed once, only effective when num_workers > 0.
+               Default to False.
+        :param batch_fetch: bool, only effective when roll is True. If True, each batch is
+               gathered from the rolled dataframe at once instead of sample by sample, which
+               is much faster for small samples. The DataLoader is then created with
+               batch_size=None and a BatchSampler, so it should not be used where the sampler
+               is replaced, e.g. distributed training. Default to False.
 
         :return: A pytorch DataLoader instance. The data returned from dataloader is in the
                  following form:
@@ -893,9 +965,14 @@ class TSDataset:
         >>> data_loader = tsdataset.to_torch_data_loader(batch_size=32, roll=False)
 
         """
-        from torch.utils.data import TensorDataset, DataLoader
+        from torch.utils.data import TensorDataset, DataLoader, BatchSampler, \
+            RandomSampler, SequentialSampler
         import torch
         from bigdl.nano.utils.log4Error import invalidInputError
+        worker_kwargs = {"num_workers": num_workers}
+        if num_workers > 0:
+            worker_kwargs.update(prefetch_factor=prefetch_factor,
+                                 persistent_workers=persistent_workers)
         if roll:
             if horizon is None:
                 invalidInputError(False,
@@ -945,9 +1022,19 @@ class TSDataset:
             self.roll_feature = feature_col
 
             batch_size = 32 if batch_size is None else batch_size  # _pytorch_fashion_inference
+            if batch_fetch:
+                # RollDataset gathers a whole batch of indices from the BatchSampler at once,
+                # so automatic batching is disabled by batch_size=None
+                sampler = RandomSampler(torch_dataset) if shuffle \
+                    else SequentialSampler(torch_dataset)
+                return DataLoader(torch_dataset,
+                                  batch_size=None,
+                                  sampler=BatchSampler(sampler, batch_size, drop_last=False),
+                                  **worker_kwargs)
             return DataLoader(torch_dataset,
                               batch_size=batch_size,
-                              shuffle=shuffle)
+                              shuffle=shuffle,
+                              **worker_kwargs)
         else:
             if self.numpy_x is None:
                 invalidInputError(False,
@@ -957,13 +1044,15 @@ class TSDataset:
                 x = self.numpy_x
                 return DataLoader(TensorDataset(torch.from_numpy(x).float()),
                                   batch_size=batch_size,
-                                  shuffle=shuffle)
+                                  shuffle=shuffle,
+                                  **worker_kwargs)
             elif self.numpy_x_timeenc is None:
                 x, y = self.to_numpy()
                 return DataLoader(TensorDataset(torch.from_numpy(x).float(),
                                                 torch.from_numpy(y).float()),
                                   batch_size=batch_size,
-                                  shuffle=shuffle)
+                                  shuffle=shuffle,
+                                  **worker_kwargs)
             else:
                 x, y, x_enc, y_enc = self.to_numpy()
                 return DataLoader(TensorDataset(torch.from_numpy(x).float(),
@@ -971,7 +1060,8 @@ class TSDataset:
                                                 torch.from_numpy(x_enc).float(),
                                                 torch.from_numpy(y_enc).float()),
                                   batch_size=batch_size,
-                                  shuffle=shuffle)
+                                  shuffle=shuffle,
+                                  **worker_kwargs)
 
     def to_tf_dataset(self, batch_size=32, shuffle=False):
         """
@@ -997,7 +1087,7 @@ class TSDataset:
             data = data.batch(batch_size).cache()
         return data.prefetch(tf.data.AUTOTUNE)
 
-    def to_numpy(self):
+    def to_numpy(self, copy=False):
         '''
         Export rolling result in form of :
             1. a 3d numpy ndarray when is_predict=True or horizon=0
@@ -1014,6 +1104,9 @@ class TSDataset:
                  or a 4-dim tuple of 3d numpy ndarray (x, y, x_enc, y_enc)
                  when time_enc=True.
                  The ndarray is casted to float32.
+
+        :param copy: bool, if True, return copies of the rolling result, which is
+               needed to modify the result of `roll(strided=True)`. Default to False.
         '''
         if not self.deploy_mode:
             from bigdl.nano.utils.log4Error import invalidInputError
@@ -1022,11 +1115,14 @@ class TSDataset:
                                   "Please call 'roll' method "
                                   "before transform a TSDataset to numpy ndarray!")
         if self.numpy_y is None and self.numpy_x_timeenc is None:
-            return self.numpy_x
+            result = (self.numpy_x,)
         elif self.numpy_x_timeenc is None:
-            return self.numpy_x, self.numpy_y
+            result = (self.numpy_x, self.numpy_y)
         else:
-            return self.numpy_x, self.numpy_y, self.numpy_x_timeenc, self.numpy_y_timeenc
+            result = (self.numpy_x, self.numpy_y, self.numpy_x_timeenc, self.numpy_y_timeenc)
+        if copy:
+            result = tuple(np.array(arr) for arr in result)
+        return result if len(result) > 1 else result[0]
 
     def to_pandas(self):
         '''
@@ -1036,7 +1132,7 @@ class TSDataset:
         '''
         return self.df.copy()
 
-    def scale(self, scaler, fit=True):
+    def scale(self, scaler, fit=True, incremental=False):
         '''
         Scale the time series dataset's feature column and target column.
 
@@ -1045,6 +1141,12 @@ class TSDataset:
         :param fit: if we need to fit the scaler. Typically, the value should
                be set to True for training set, while False for validation and
                test set. The value is defaulted to True.
+        :param incremental: if True and fit=True, the scaler is updated with this dataset
+               by partial_fit on top of its current state instead of being refit from
+               scratch, so that a stream of chunks (e.g. each created by from_pandas)
+               could be scaled without another pass over the previous data.
+               StandardScaler, MaxAbsScaler and MinMaxScaler are supported.
+               The value is defaulted to False.
 
         :return: the tsdataset instance.
 
@@ -1056,6 +1158,11 @@ class TSDataset:
         >>> scaler = StandardScaler()
         >>> tsdata.scale(scaler, fit=True)
         >>> tsdata_test.scale(scaler, fit=False)
+
+        For streaming data, the scaler could be updated chunk by chunk.
+
+        >>> for df in chunks:
+        >>>     tsdata = TSDataset.from_pandas(df, ...).scale(scaler, incremental=True)
         '''
         feature_col = self.feature_col
         if self.roll_additional_feature:
@@ -1063,7 +1170,14 @@ class TSDataset:
             for feature in self.feature_col:
                 if feature not in self.roll_additional_feature:
                     feature_col.append(feature)
-        if fit and not self.deploy_mode:
+        if fit and incremental and not self.deploy_mode:
+            from bigdl.nano.utils.log4Error import invalidInputError
+            invalidInputError(hasattr(scaler, "partial_fit"),
+                              f"{type(scaler).__name__} does not support incremental fit.")
+            scaler.partial_fit(self.df[self.target_col + feature_col])
+            self.df[self.target_col + feature_col] = \
+                scaler.transform(self.df[self.target_col + feature_col])
+        elif fit and not self.deploy_mode:
             self.df[self.target_col + feature_col] = \
                 scaler.fit_transform(self.df[self.target_col + feature_col])
         else:
@@ -1079,6 +1193,7 @@ class TSDataset:
             self.df[self.target_col + feature_col] = \
                 scaler.transform(self.df[self.target_col + feature_col])
         self.scaler = scaler
+        self._cycle_length_cache.clear()
         return self
 
     def unscale(self):
@@ -1095,6 +1210,7 @@ class TSDataset:
                     feature_col.append(feature)
         self.df[self.target_col + feature_col] = \
             self.scaler.inverse_transform(self.df[self.target_col + feature_col])
+        self._cycle_length_cache.clear()
         return self
 
     def unscale_numpy(self, data):
@@ -1140,9 +1256,12 @@ class TSDataset:
         if strict_check:
             _check_dt_is_sorted(self.df, self.dt_col)
 
-    def get_cycle_length(self, aggregate='mode', top_k=3):
+    def get_cycle_length(self, aggregate='mode', top_k=3, max_ids=None):
         """
         Calculate the cycle length of the time series in this TSDataset.
+        The result is cached until the target columns are changed, e.g. by impute or scale,
+        so repeated calls with the same arguments (e.g. by roll with lookback='auto') do
+        not calculate it again.
 
         Args:
             top_k (int): The freq with top top_k power after fft will be
@@ -1150,6 +1269,9 @@ class TSDataset:
                 The value is default to 3.
             aggregate (str): Select the mode of calculation time period,
                 We only support 'min', 'max', 'mode', 'median', 'mean'.
+            max_ids (int): If not None and there are more ids than max_ids, the cycle
+                length is calculated on max_ids randomly (with a fixed seed) sampled ids.
+                The value is default to None.
 
         Returns:
             Describe the value of the time period distribution.
@@ -1162,22 +1284,24 @@ class TSDataset:
         invalidInputError(aggregate.lower().strip() in ['min', 'max', 'mode', 'median', 'mean'],
                           f"We Only support 'min' 'max' 'mode' 'median' 'mean',"
                           f" but found {aggregate}.")
-
-        if len(self.target_col) == 1:
-            res = []
-            groups = self.df.groupby(self.id_col)
-            for _, group in groups:
-                res.append(cycle_length_est(group[self.target_col[0]].values, top_k))
-            res = pd.Series(res)
-        else:
-            res = []
-            groups = self.df.groupby(self.id_col)
-            for _, group in groups:
-                res.append(pd.DataFrame({'cycle_length':
-                           [cycle_length_est(group[col].values,
-                                             top_k)for col in self.target_col]}))
-            res = pd.concat(res, axis=0)
-            res = res.cycle_length
+        invalidInputError(max_ids is None or (isinstance(max_ids, int) and max_ids > 0),
+                          f"max_ids must be a positive int, but found {max_ids}.")
+
+        key = (aggregate.lower().strip(), top_k, max_ids)
+        if key in self._cycle_length_cache:
+            self.best_cycle_length = self._cycle_length_cache[key]
+            return self.best_cycle_length
+
+        indices = list(self.df.groupby(self.id_col).indices.values())
+        if max_ids is not None and len(indices) > max_ids:
+            sampled = np.sort(np.random.default_rng(0).choice(len(indices), max_ids,
+                                                              replace=False))
+            indices = [indices[i] for i in sampled]
+        # series ordered by id and then by target_col
+        values = self.df[self.target_col].values
+        res = pd.Series(cycle_length_est_batch([values[idx, i] for idx in indices
+                                                for i in range(len(self.target_col))],
+                                               top_k))
 
         if aggregate.lower().strip() == 'mode':
             self.best_cycle_length = int(res.value_counts().index[0])
@@ -1190,4 +1314,5 @@ class TSDataset:
         elif aggregate.lower().strip() == 'max':
             self.best_cycle_length = int(res.max())
 
+        self._cycle_length_cache[key] = self.best_cycle_length
         return self.best_cycle_length
@@ -75,3 +75,57 @@ def acf(x, lag, adjust):
         return sum_product / ((length - lag) * var)
     else:
         return sum_product
+
+
+def cycle_length_est_batch(data, top_k=3, adjust=False):
+    '''
+    Detect the cycles of a batch of time series, the result is the same as calling
+    cycle_length_est on each of them. Series of the same length are stacked to a 2 dim
+    ndarray, whose power spectra are calculated at once by rfft, and the acf scores of
+    the candidate lags are calculated at once for all series with the same lag.
+
+    :param data: list of 1 dim ndarray for time series, or a 2 dim ndarray.
+    :param top_k: The freq with top top_k power after fft will be
+           used to check the autocorrelation. Higher top_k might be time-consuming.
+           The value is default to 3.
+    :param adjust: if normalization is applied to the acf score.
+
+    :return: 1 dim ndarray of the cycle length of each time series.
+    '''
+    from bigdl.nano.utils.log4Error import invalidInputError
+    lengths = np.array([len(x) for x in data])
+    res = np.zeros(len(data), dtype=int)
+    for length in np.unique(lengths):
+        invalidInputError((length//2) > abs(top_k)+1,
+                          "top_k must be less than half the length of the time series,"
+                          f" but top_k and data length are {top_k} and {length} respectively.")
+        idxs = np.where(lengths == length)[0]
+        res[idxs] = _cycle_length_est_2d(np.stack([data[i] for i in idxs]), top_k, adjust)
+    return res
+
+
+def _cycle_length_est_2d(data, top_k, adjust):
+    length = data.shape[1]
+    # positive frequencies of fftfreq are 1/length, ..., ((length - 1) // 2) / length
+    num_freqs = (length - 1) // 2
+    powers = np.abs(np.fft.rfft(data, axis=1)[:, 1:num_freqs + 1])
+    freqs = np.arange(1, num_freqs + 1) * (1.0 / length)
+
+    top_k_idxs = np.argpartition(powers, -top_k, axis=1)[:, -top_k:]
+    fft_periods = (1 / freqs[top_k_idxs]).astype(int)
+
+    # the sum products of the candidate lags, rows with the same lag are calculated at once
+    centered = data - data.mean(axis=1, keepdims=True)
+    acf_scores = np.zeros(fft_periods.shape)
+    for lag in np.unique(fft_periods):
+        rows, cols = np.nonzero(fft_periods == lag)
+        acf_scores[rows, cols] = np.einsum('ij,ij->i', centered[rows, :length - lag],
+                                           centered[rows, lag:])
+    if adjust:
+        var = data.var(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            acf_scores = np.where(var == 0, 0, acf_scores / ((length - fft_periods) * var))
+        # nan score of lag == length is never the largest, same as cycle_length_est
+        acf_scores[np.isnan(acf_scores)] = -np.inf
+    # the first lag with the largest acf score
+    return fft_periods[np.arange(len(data)), np.argmax(acf_scores, axis=1)]
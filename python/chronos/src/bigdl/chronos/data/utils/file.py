@@ -27,3 +27,65 @@ def parquet2pd(path, columns=None, **kwargs):
     import pandas as pd
     df = pd.read_parquet(path, engine="pyarrow", columns=columns, **kwargs)
     return df
+
+
+def parquet_filters(dt_col=None, id_col=None, start_time=None, end_time=None, ids=None,
+                    filters=None):
+    """
+    Build the filters of pyarrow.parquet.read_table in disjunctive normal form,
+    which are pushed down to skip the row groups and partitions out of range.
+
+    :param dt_col: string. datetime column name.
+    :param id_col: string. id column name.
+    :param start_time: if not None, only rows with dt_col >= start_time are read.
+    :param end_time: if not None, only rows with dt_col <= end_time are read.
+    :param ids: list. If not None, only rows with id_col in ids are read.
+    :param filters: other filters in disjunctive normal form to combine with.
+    :return: the filters, None if there is no filter.
+    """
+    import pandas as pd
+    conditions = []
+    if start_time is not None:
+        conditions.append((dt_col, ">=", pd.Timestamp(start_time)))
+    if end_time is not None:
+        conditions.append((dt_col, "<=", pd.Timestamp(end_time)))
+    if ids is not None:
+        conditions.append((id_col, "in", list(ids)))
+    if not filters:
+        return conditions if conditions else None
+    if isinstance(filters[0], tuple):
+        return list(filters) + conditions
+    return [list(f) + conditions for f in filters]
+
+
+def iter_parquet2pd(path, id_col, columns=None, filters=None, ids=None, ids_per_chunk=1,
+                    **kwargs):
+    """
+    Read a parquet dataset to pandas dataframes chunk by chunk, each of which contains
+    all the rows of ids_per_chunk ids, so only one chunk is decoded in memory at a time.
+
+    :param path: string. parquet file or directory path.
+    :param id_col: string. id column name.
+    :param columns: list. If not None, only these columns will be read from the file.
+    :param filters: filters in disjunctive normal form, refer to parquet_filters.
+    :param ids: list. The ids to read, if None, all ids satisfying filters are read
+           in sorted order.
+    :param ids_per_chunk: int. The number of ids in each chunk.
+    :param kwargs: Any additional kwargs are passed to pyarrow.dataset.dataset.
+    :return: a generator of pandas dataframes.
+    """
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    to_expression = getattr(pq, "filters_to_expression", None) or pq._filters_to_expression
+    dataset = ds.dataset(path, format="parquet", **kwargs)
+    expression = to_expression(filters) if filters else None
+    if ids is None:
+        # only the id column is decoded to find the ids
+        id_table = dataset.to_table(columns=[id_col], filter=expression)
+        ids = sorted(id_table.column(id_col).unique().to_pylist())
+    for i in range(0, len(ids), ids_per_chunk):
+        chunk_expression = ds.field(id_col).isin(ids[i:i + ids_per_chunk])
+        if expression is not None:
+            chunk_expression = chunk_expression & expression
+        table = dataset.to_table(columns=columns, filter=chunk_expression)
+        yield table.to_pandas()
@@ -14,13 +14,16 @@
 # limitations under the License.
 #
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_float_dtype
 
 
 def impute_timeseries_dataframe(df,
                                 dt_col,
                                 mode="last",
-                                const_num=0):
+                                const_num=0,
+                                id_col=None):
     '''
     impute and return a dataframe without N/A.
     :param df: input dataframe.
@@ -31,6 +34,9 @@ def impute_timeseries_dataframe(df,
            "const": impute by a const value input by user.
            "linear": impute by linear interpolation.
     :param const_num: only effective when mode is set to "const".
+    :param id_col: name of id column, if set, each time series distinguished by id_col
+           is imputed separately in one pass on the whole dataframe, and the result
+           is sorted by id_col.
     '''
     from bigdl.nano.utils.log4Error import invalidInputError
     invalidInputError(dt_col in df.columns, f"dt_col {dt_col} can not be found in df.")
@@ -38,6 +44,9 @@ def impute_timeseries_dataframe(df,
     invalidInputError(mode in ['last', 'const', 'linear'],
                       f"mode should be one of ['last', 'const', 'linear'], but found {mode}.")
 
+    if id_col is not None:
+        return _impute_timeseries_dataframe_by_id(df, id_col, mode, const_num)
+
     res_df = None
     if mode == "last":
         res_df = _last_impute_timeseries_dataframe(df)
@@ -64,3 +73,48 @@ def _const_impute_timeseries_dataframe(df, const_num):
 def _linear_impute_timeseries_dataframe(df):
     res_df = df.interpolate(axis=0, limit_direction='both')
     return res_df
+
+
+def _impute_timeseries_dataframe_by_id(df, id_col, mode, const_num):
+    # same as imputing each group of df.groupby(id_col) and concatenating them
+    if not df[id_col].is_monotonic_increasing:
+        df = df.sort_values(id_col, kind="mergesort")
+    # sorted by id, so the first row of each group is its first occurrence
+    first_row = ~df[id_col].duplicated().to_numpy()
+    if mode == "last":
+        res_df = df.copy()
+        res_df.iloc[first_row] = res_df.iloc[first_row].fillna(0)
+        # the first row of each group has no N/A, so pad never crosses groups
+        return res_df.fillna(method='pad')
+    if mode == "const":
+        return _const_impute_timeseries_dataframe(df, const_num)
+    return _linear_impute_timeseries_dataframe_by_id(df, id_col, np.cumsum(first_row))
+
+
+def _linear_impute_timeseries_dataframe_by_id(df, id_col, group):
+    # linear interpolation of DataFrame.interpolate only applies to float columns,
+    # N/A before the first or after the last valid value of a group is filled by
+    # that valid value, the same as np.interp.
+    res_df = df.copy()
+    pos = np.arange(len(res_df), dtype=np.float64)
+    for col in res_df.columns:
+        if col == id_col or not is_float_dtype(res_df[col]):
+            continue
+        values = res_df[col].to_numpy(dtype=np.float64, copy=True)
+        invalid = np.isnan(values)
+        if not invalid.any():
+            continue
+        valid_pos = pd.Series(np.where(invalid, np.nan, pos)).groupby(group)
+        prev_pos = valid_pos.ffill().to_numpy()
+        next_pos = valid_pos.bfill().to_numpy()
+        prev_pos = np.where(np.isnan(prev_pos), next_pos, prev_pos)
+        next_pos = np.where(np.isnan(next_pos), prev_pos, next_pos)
+        fill = invalid & ~np.isnan(prev_pos)
+        prev_pos, next_pos = prev_pos[fill], next_pos[fill]
+        prev_val = values[prev_pos.astype(np.int64)]
+        next_val = values[next_pos.astype(np.int64)]
+        dist = next_pos - prev_pos
+        slope = np.where(dist > 0, next_val - prev_val, 0) / np.where(dist > 0, dist, 1)
+        values[fill] = slope * (pos[fill] - prev_pos) + prev_val
+        res_df[col] = values.astype(res_df[col].dtype, copy=False)
+    return res_df
@@ -14,6 +14,7 @@
 # limitations under the License.
 #
 
+import numpy as np
 import pandas as pd
 
 
@@ -32,7 +33,9 @@ def resample_timeseries_dataframe(df,
     :param interval: pandas offset aliases, indicating time interval of the output dataframe
     :param start_time: start time of the output dataframe
     :param end_time: end time of the output dataframe
-    :param id_col: name of id column, this column won't be resampled
+    :param id_col: name of id column, this column won't be resampled. Each time series
+        distinguished by id_col is resampled separately in one pass on the whole dataframe,
+        and the result is sorted by id_col.
     :param merge_mode: if current interval is smaller than output interval,
         we need to merge the values in a mode. "max", "min", "mean"
         or "sum" are supported for now.
@@ -48,11 +51,11 @@ def resample_timeseries_dataframe(df,
                           "merge_mode should be one of ['max', 'min', 'mean', 'sum'],"
                           " but found {merge_mode}.")
 
-    res_df = df.copy()
-    id_name = None
     if id_col:
-        id_name = res_df[id_col].iloc[0]
-        res_df.drop(id_col, axis=1)
+        return _resample_timeseries_dataframe_by_id(df, dt_col, interval, start_time,
+                                                    end_time, id_col, merge_mode, deploy_mode)
+
+    res_df = df.copy()
     res_df.set_index(dt_col, inplace=True)
     res_df = res_df.resample(pd.Timedelta(interval))
 
@@ -76,6 +79,62 @@ def resample_timeseries_dataframe(df,
     res_df = res_df.reindex(new_index)
     res_df.index.name = dt_col
     res_df = res_df.reset_index()
-    if id_col:
-        res_df[id_col] = id_name
+    return res_df
+
+
+def _group_ranges(group_ids, starts, ends, freq):
+    # (id, starts + k * freq) of each group while <= ends
+    num = np.maximum((ends - starts) // freq + 1, 0)
+    offsets = np.arange(num.sum()) - np.repeat(np.cumsum(num) - num, num)
+    return np.repeat(group_ids, num), np.repeat(starts, num) + offsets * freq
+
+
+def _to_datetime(values, tz, name=None):
+    # int64 nanoseconds since epoch to DatetimeIndex
+    index = pd.DatetimeIndex(values.astype("datetime64[ns]"), name=name)
+    return index.tz_localize("UTC").tz_convert(tz) if tz else index
+
+
+def _resample_timeseries_dataframe_by_id(df, dt_col, interval, start_time, end_time,
+                                         id_col, merge_mode, deploy_mode):
+    # Same as calling resample_timeseries_dataframe on each group of df.groupby(id_col),
+    # bins of each group start from the midnight of its first timestamp like
+    # DataFrame.resample, and all the groups are aggregated by one groupby.
+    from pandas.api.types import is_numeric_dtype
+    freq = pd.Timedelta(interval).value
+    ids = df[id_col].to_numpy()
+    dt = pd.DatetimeIndex(df[dt_col])
+    time = dt.asi8
+    first_time = pd.Series(time).groupby(ids).transform('min').to_numpy()
+    origin = _to_datetime(first_time, dt.tz).normalize().asi8
+    bins = time - (time - origin) % freq
+
+    # mean and sum drop non-numeric columns
+    value_cols = [col for col in df.columns if col != dt_col and
+                  (merge_mode in ["max", "min"] or is_numeric_dtype(df[col]))]
+    res_df = df[value_cols].groupby([ids, bins]).agg(merge_mode)
+    bin_range = pd.Series(res_df.index.get_level_values(1)) \
+        .groupby(res_df.index.get_level_values(0)).agg(['min', 'max'])
+    group_ids = bin_range.index.to_numpy()
+    first_bin = bin_range['min'].to_numpy()
+    last_bin = bin_range['max'].to_numpy()
+
+    if merge_mode == "sum":
+        # empty bins between the first and the last bin are summed to 0
+        res_df = res_df.reindex(pd.MultiIndex.from_arrays(
+            _group_ranges(group_ids, first_bin, last_bin, freq)), fill_value=0)
+
+    start = np.full_like(first_bin, pd.Timestamp(start_time).value) if start_time \
+        else first_bin
+    end = np.full_like(last_bin, pd.Timestamp(end_time).value) if end_time else last_bin
+    if not deploy_mode:
+        from bigdl.nano.utils.log4Error import invalidInputError
+        invalidInputError((start <= end).all(), "end time must be later than start time.")
+
+    start = start - (start - first_bin) % freq
+    new_ids, new_time = _group_ranges(group_ids, start, end, freq)
+    res_df = res_df.reindex(pd.MultiIndex.from_arrays([new_ids, new_time]))
+    res_df.index = _to_datetime(new_time, dt.tz, name=dt_col)
+    res_df = res_df.reset_index()
+    res_df[id_col] = new_ids
     return res_df
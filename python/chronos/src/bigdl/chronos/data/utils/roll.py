@@ -27,7 +27,8 @@ def roll_timeseries_dataframe(df,
                               id_col=None,
                               label_len=0,
                               contain_id=False,
-                              deploy_mode=False):
+                              deploy_mode=False,
+                              strided=False):
     """
     roll dataframe into numpy ndarray sequence samples.
 
@@ -48,6 +49,9 @@ def roll_timeseries_dataframe(df,
     :param deploy_mode: a bool indicates whether to use deploy mode, which will be used in
            production environment to reduce the latency of data processing. The value
            defaults to False.
+    :param strided: a bool indicates whether to return read-only strided views of the
+           data instead of copying each sample, a copy is still made if some samples
+           are dropped for N/A or roll_feature_df is appended. The value defaults to False.
     :return: x, y
         x: 3-d numpy array in format (no. of samples, lookback, feature_col length)
         y: 3-d numpy array in format (no. of samples, horizon, target_col length)
@@ -60,7 +64,8 @@ def roll_timeseries_dataframe(df,
                                                feature_col,
                                                target_col,
                                                id_col=id_col,
-                                               contain_id=contain_id)
+                                               contain_id=contain_id,
+                                               strided=strided)
 
     from bigdl.nano.utils.log4Error import invalidInputError
     invalidInputError(isinstance(df, pd.DataFrame), "df is expected to be pandas dataframe")
@@ -86,7 +91,8 @@ def roll_timeseries_dataframe(df,
                                                 target_col,
                                                 id_col=id_col,
                                                 label_len=label_len,
-                                                contain_id=contain_id)
+                                                contain_id=contain_id,
+                                                strided=strided)
     else:
         return _roll_timeseries_dataframe_test(df,
                                                roll_feature_df,
@@ -94,19 +100,19 @@ def roll_timeseries_dataframe(df,
                                                feature_col,
                                                target_col,
                                                id_col=id_col,
-                                               contain_id=contain_id)
+                                               contain_id=contain_id,
+                                               strided=strided)
 
 
 def _append_rolling_feature_df(rolling_result,
                                roll_feature_df):
     if roll_feature_df is None:
         return rolling_result
-    additional_rolling_result = np.zeros((rolling_result.shape[0],
-                                         rolling_result.shape[1],
-                                         len(roll_feature_df.columns)))
-    for idx in range(additional_rolling_result.shape[0]):
-        for col_idx in range(additional_rolling_result.shape[2]):
-            additional_rolling_result[idx, :, col_idx] = roll_feature_df.iloc[idx, col_idx]
+    # the feature of i-th sample is broadcast along its lookback
+    feature = roll_feature_df.values[:rolling_result.shape[0]].astype(np.float64)
+    additional_rolling_result = np.broadcast_to(
+        feature[:, np.newaxis, :],
+        (rolling_result.shape[0], rolling_result.shape[1], feature.shape[1]))
     rolling_result = np.concatenate([rolling_result, additional_rolling_result], axis=2)
     return rolling_result
 
@@ -117,13 +123,14 @@ def _roll_timeseries_dataframe_test(df,
                                     feature_col,
                                     target_col,
                                     id_col,
-                                    contain_id):
+                                    contain_id,
+                                    strided=False):
     x = df.loc[:, target_col+feature_col].values.astype(np.float32)
 
-    output_x, mask_x = _roll_timeseries_ndarray(x, lookback)
+    output_x, mask_x = _roll_timeseries_ndarray(x, lookback, strided)
     mask = (mask_x == 1)
 
-    x = _append_rolling_feature_df(output_x[mask], roll_feature_df)
+    x = _append_rolling_feature_df(_select(output_x, mask, strided), roll_feature_df)
 
     if contain_id:
         return x, None, df.loc[:, [id_col]].values
@@ -139,7 +146,8 @@ def _roll_timeseries_dataframe_train(df,
                                      target_col,
                                      id_col,
                                      label_len,
-                                     contain_id):
+                                     contain_id,
+                                     strided=False):
     from bigdl.nano.utils.log4Error import invalidInputError
     if label_len != 0 and isinstance(horizon, list):
         invalidInputError(False,
@@ -151,19 +159,27 @@ def _roll_timeseries_dataframe_train(df,
         x = df.loc[:, target_col+feature_col].values.astype(np.float32)
     y = df.iloc[lookback-label_len:].loc[:, target_col].values.astype(np.float32)
 
-    output_x, mask_x = _roll_timeseries_ndarray(x, lookback)
+    output_x, mask_x = _roll_timeseries_ndarray(x, lookback, strided)
     if isinstance(horizon, list):
-        output_y, mask_y = _roll_timeseries_ndarray(y, horizon)
+        output_y, mask_y = _roll_timeseries_ndarray(y, horizon, strided)
     else:
-        output_y, mask_y = _roll_timeseries_ndarray(y, horizon+label_len)
+        output_y, mask_y = _roll_timeseries_ndarray(y, horizon+label_len, strided)
     mask = (mask_x == 1) & (mask_y == 1)
 
-    x = _append_rolling_feature_df(output_x[mask], roll_feature_df)
+    x = _append_rolling_feature_df(_select(output_x, mask, strided), roll_feature_df)
+    y = _select(output_y, mask, strided)
 
     if contain_id:
-        return x, output_y[mask], df.loc[:, [id_col]].values
+        return x, y, df.loc[:, [id_col]].values
     else:
-        return x, output_y[mask]
+        return x, y
+
+
+def _select(roll_data, mask, strided):
+    # boolean indexing always copies, keep the view if no sample is dropped
+    if strided and mask.all():
+        return roll_data
+    return roll_data[mask]
 
 
 def _shift(arr, num, fill_value=np.nan):
@@ -181,15 +197,18 @@ def _shift(arr, num, fill_value=np.nan):
     return result
 
 
-def _roll_timeseries_ndarray(data, window):
+def _roll_timeseries_ndarray(data, window, strided=False):
     '''
     data should be a ndarray with num_dim = 2
     first dim is timestamp
     second dim is feature
+    if strided is True, samples are a read-only view of data when window is an int
     '''
     from bigdl.nano.utils.log4Error import invalidInputError
     invalidInputError(data.ndim == 2,
                       "data dim is expected to be 2")  # (num_timestep, num_feature)
+    if strided:
+        return _strided_roll_timeseries_ndarray(data, window)
     data = np.expand_dims(data, axis=1)  # (num_timestep, 1, num_feature)
 
     # window index and capacity
@@ -207,3 +226,31 @@ def _roll_timeseries_ndarray(data, window):
     mask = ~np.any(np.isnan(roll_data), axis=(1, 2))
 
     return roll_data, mask
+
+
+def _strided_roll_timeseries_ndarray(data, window):
+    # same output as _roll_timeseries_ndarray, sample i is data[i:i+window_size]
+    window_size = window if isinstance(window, int) else max(window)
+    num_sample = max(data.shape[0] - window_size + 1, 0)
+    roll_data = np.lib.stride_tricks.as_strided(
+        data, shape=(num_sample, window_size, data.shape[1]),
+        strides=(data.strides[0],) + data.strides, writeable=False)
+    # a sample is masked if any of its steps has N/A
+    row_nan = np.isnan(data).any(axis=1)
+    if isinstance(window, int):
+        nan_count = np.concatenate([[0], np.cumsum(row_nan)])
+        mask = nan_count[window_size:window_size + num_sample] == nan_count[:num_sample]
+    else:
+        window_idx = np.array(window) - 1
+        roll_data = roll_data[:, window_idx, :]
+        mask = ~row_nan[np.arange(num_sample)[:, np.newaxis] + window_idx].any(axis=1)
+    return roll_data, mask
+
+
+def _concat_roll_result(rolling_result, axis, strided=False):
+    # a single strided result is kept as a view
+    if not strided:
+        return np.concatenate(rolling_result, axis=axis).astype(np.float32)
+    if len(rolling_result) == 1 and rolling_result[0].dtype == np.float32:
+        return rolling_result[0]
+    return np.concatenate(rolling_result, axis=axis).astype(np.float32, copy=False)
@@ -31,7 +31,7 @@ def get_roll_start_idx(df, id_col, window_size):
         id_start_idxes = df.index[df[id_col] != df[id_col].shift(1)].tolist() + [len(df.index)]
     roll_start_idx_iter = ((range(id_start_idxes[i], id_start_idxes[i+1] - window_size + 1))
                            for i in range(len(id_start_idxes) - 1))
-    roll_start_idxes = np.fromiter(itertools.chain.from_iterable(roll_start_idx_iter), np.int)
+    roll_start_idxes = np.fromiter(itertools.chain.from_iterable(roll_start_idx_iter), np.int64)
     return roll_start_idxes
 
 
@@ -86,7 +86,8 @@ class RollDataset(Dataset):
         _check_cols_no_na(df, col_names=target_col + feature_col)
         cols = target_col + feature_col
         cols = cols[0] if len(cols) == 1 else cols
-        self.arr = df.loc[:, cols].to_numpy()
+        # cast once, so that samples are gathered without conversion
+        self.arr = df.loc[:, cols].to_numpy(dtype=np.float32)
         self.arr = np.expand_dims(self.arr, axis=1) if self.arr.ndim == 1 else self.arr
         max_horizon = horizon if isinstance(horizon, int) else max(horizon)
         window_size = lookback + max_horizon
@@ -108,39 +109,58 @@ class RollDataset(Dataset):
             else:
                 df_stamp.loc[:, dt_col] = list(df[dt_col].values)
             data_stamp = time_features(pd.to_datetime(df_stamp[dt_col].values), freq=freq)
-            self.data_stamp_arr = data_stamp.transpose(1, 0)
+            self.data_stamp_arr = data_stamp.transpose(1, 0).astype(np.float32)
 
     def __len__(self):
         return self.roll_start_idxes.size
 
     def __getitem__(self, idx):
-        start_idx = self.roll_start_idxes[idx]
+        """
+        :param idx: int, or a list of int, e.g. from a BatchSampler, to fetch a batch
+               of samples at once.
+        """
+        if np.ndim(idx) == 0:
+            return tuple(t[0] for t in self._get_batch([idx])) if self._num_outputs > 1 \
+                else self._get_batch([idx])[0]
+        return self._get_batch(idx)
+
+    def __getitems__(self, indices):
+        # used by DataLoader of torch>=2.0, which expects a list of samples
+        batch = self._get_batch(indices)
+        return list(zip(*batch)) if self._num_outputs > 1 else list(batch)
+
+    @property
+    def _num_outputs(self):
+        if self.time_enc:
+            return 4
+        return 1 if self.is_predict else 2
+
+    def _get_batch(self, indices):
+        # gather windows of all the samples with one fancy index for each output
+        start_idx = self.roll_start_idxes[np.asarray(indices, dtype=np.int64)][:, np.newaxis]
 
         # cal x
-        x = self.arr[start_idx: start_idx + self.lookback]
-        x = torch.from_numpy(x).float()
+        x = torch.from_numpy(self.arr[start_idx + np.arange(self.lookback)])
         if self.is_predict is True and not self.time_enc:
             return x
 
         # cal y
         arr_target_only = self.arr[:, :self.target_num]
         if isinstance(self.horizon, int):
-            y = arr_target_only[start_idx + self.lookback - self.label_len:
-                                start_idx + self.lookback + self.horizon]
+            y_idx = np.arange(self.lookback - self.label_len, self.lookback + self.horizon)
         else:
             # horizon is a list of int
-            horizons = np.array(self.horizon)
-            y = np.take(arr_target_only, horizons + start_idx + self.lookback - 1, axis=0)
-        y = torch.from_numpy(y).float()
+            y_idx = np.array(self.horizon) + self.lookback - 1
+        y = torch.from_numpy(arr_target_only[start_idx + y_idx])
 
         if self.time_enc:
             # cal x_enc
-            x_enc = self.data_stamp_arr[start_idx: start_idx + self.lookback]
-            x_enc = torch.from_numpy(x_enc).float()
+            x_enc = self.data_stamp_arr[start_idx + np.arange(self.lookback)]
+            x_enc = torch.from_numpy(x_enc)
             # cal y_enc
-            y_enc = self.data_stamp_arr[start_idx + self.lookback - self.label_len:
-                                        start_idx + self.lookback + self.horizon_time]
-            y_enc = torch.from_numpy(y_enc).float()
+            y_enc = self.data_stamp_arr[start_idx + np.arange(self.lookback - self.label_len,
+                                                              self.lookback + self.horizon_time)]
+            y_enc = torch.from_numpy(y_enc)
 
         if self.time_enc:
             return x, y, x_enc, y_enc
@@ -83,3 +83,75 @@ def _standard_scaler_scale_timeseries_numpy(data, scaler):
         value_scale = scaler.scale_[i] if scaler.with_std else 1
         data_scale[:, i] = (data[:, i] - value_mean) / value_scale
     return data_scale
+
+
+def _handle_zeros_in_scale(scale):
+    scale = np.array(scale, dtype=np.float64)
+    scale[scale == 0.0] = 1.0
+    return scale
+
+
+def _merge_standard_scaler(merged, scaler):
+    n_a, n_b = merged.n_samples_seen_, scaler.n_samples_seen_
+    n = n_a + n_b
+    if merged.with_mean or merged.with_std:
+        # parallel version of Welford's algorithm, proposed by Chan et al.
+        delta = scaler.mean_ - merged.mean_
+        mean = merged.mean_ + delta * n_b / n
+        if merged.with_std:
+            m2 = merged.var_ * n_a + scaler.var_ * n_b + delta ** 2 * n_a * n_b / n
+            merged.var_ = m2 / n
+            merged.scale_ = _handle_zeros_in_scale(np.sqrt(merged.var_))
+        merged.mean_ = mean
+    merged.n_samples_seen_ = n
+
+
+def _merge_minmax_scaler(merged, scaler):
+    merged.data_min_ = np.minimum(merged.data_min_, scaler.data_min_)
+    merged.data_max_ = np.maximum(merged.data_max_, scaler.data_max_)
+    merged.data_range_ = merged.data_max_ - merged.data_min_
+    feature_range = merged.feature_range
+    merged.scale_ = (feature_range[1] - feature_range[0]) / \
+        _handle_zeros_in_scale(merged.data_range_)
+    merged.min_ = feature_range[0] - merged.data_min_ * merged.scale_
+    merged.n_samples_seen_ = merged.n_samples_seen_ + scaler.n_samples_seen_
+
+
+def _merge_maxabs_scaler(merged, scaler):
+    merged.max_abs_ = np.maximum(merged.max_abs_, scaler.max_abs_)
+    merged.scale_ = _handle_zeros_in_scale(merged.max_abs_)
+    merged.n_samples_seen_ = merged.n_samples_seen_ + scaler.n_samples_seen_
+
+
+MERGE_HELPER_MAP = {StandardScaler: _merge_standard_scaler,
+                    MaxAbsScaler: _merge_maxabs_scaler,
+                    MinMaxScaler: _merge_minmax_scaler}
+
+
+def merge_scaler(scalers):
+    '''
+    Merge the states of scalers fitted on different parts of a dataset, the result
+    is the same as a scaler fitted on the whole dataset, so that partitions or new
+    chunks of data could be fitted separately.
+
+    :param scalers: a list of fitted scalers of the same type and parameters,
+           StandardScaler, MaxAbsScaler and MinMaxScaler are supported to merge
+           more than one scaler.
+
+    :return: a new fitted scaler, the input scalers are not changed.
+    '''
+    import copy
+    from bigdl.nano.utils.log4Error import invalidInputError
+    invalidInputError(len(scalers) > 0, "scalers should not be empty")
+    merged = copy.deepcopy(scalers[0])
+    if len(scalers) == 1:
+        return merged
+    invalidInputError(type(merged) in MERGE_HELPER_MAP,
+                      f"Only {', '.join(s.__name__ for s in MERGE_HELPER_MAP)} could be "
+                      f"merged, but found {type(merged).__name__}")
+    for scaler in scalers[1:]:
+        invalidInputError(type(scaler) is type(merged),
+                          f"Scalers to merge should be the same type, but found "
+                          f"{type(merged).__name__} and {type(scaler).__name__}")
+        MERGE_HELPER_MAP[type(merged)](merged, scaler)
+    return merged
@@ -15,7 +15,7 @@
 #
 
 from bigdl.chronos.detector.anomaly.abstract import AnomalyDetector
-from bigdl.chronos.detector.anomaly.util import roll_arr, scale_arr
+from bigdl.chronos.detector.anomaly.util import roll_arr, scale_arr, ArrayChunks
 import numpy as np
 
 
@@ -55,6 +55,8 @@ class AEDetector(AnomalyDetector):
             >>> ad.fit(y)
             >>> anomaly_scores = ad.score()
             >>> anomaly_indexes = ad.anomaly_indexes()
+            >>> # score new samples chunk by chunk
+            >>> new_scores = ad.score_update(y_new)
     """
 
     def __init__(self,
@@ -112,6 +114,14 @@ class AEDetector(AnomalyDetector):
         self.anomaly_scores_ = None
         self.backend = backend
         self.lr = lr
+        self.ae_model = None
+        self.scaler = None
+        # the last roll_len - 1 samples, prepended to the next chunk in score_update
+        self.buffer = None
+        # min and max of the aggregated errors of the input of fit
+        self.score_range = None
+        # scores of score_update not merged into anomaly_scores_ yet
+        self.score_chunks = ArrayChunks()
 
     def check_rolled(self, arr):
         if arr.size == 0:
@@ -132,17 +142,22 @@ class AEDetector(AnomalyDetector):
 
         :param y: the input time series. y must be 1-D numpy array.
         """
+        from sklearn.preprocessing import MinMaxScaler
         self.check_data(y)
-        self.anomaly_scores_ = np.zeros_like(y)
+        self.anomaly_scores_ = np.zeros(len(y))
+        self.score_range = None
+        self.score_chunks = ArrayChunks()
 
         if self.roll_len != 0:
+            self.buffer = y[len(y) - self.roll_len + 1:]
             # roll the time series to create sub sequences
             y = roll_arr(y, self.roll_len)
             self.check_rolled(y)
         else:
             y = y.reshape(1, -1)
             self.check_rolled(y)
-        y = scale_arr(y)
+        self.scaler = MinMaxScaler().fit(y)
+        y = self.scaler.transform(y).astype('float32')
 
         if self.backend == "keras":
             ae_model = create_tf_model(self.compress_rate, len(y[0]), lr=self.lr)
@@ -173,14 +188,14 @@ class AEDetector(AnomalyDetector):
                     loss = criterion(yhat, y_batch)
                     loss.backward()
                     optimizer.step()
-            y_pred_list = []
-            for x_batch, y_batch in train_loader:
-                y_pred_list.append(ae_model(x_batch).detach().numpy())
-            y_pred = np.concatenate(y_pred_list, axis=0)
+            with torch.no_grad():
+                y_pred = ae_model(y).numpy()
+            y = y.numpy()
         else:
             from bigdl.nano.utils.log4Error import invalidInputError
             invalidInputError(False,
                               "backend type can only be 'keras' or 'torch'")
+        self.ae_model = ae_model
         # calculate the recon err for each data point in rolled array
         self.recon_err = abs(y - y_pred)
         # calculate the (aggregated) recon err for each sub sequence
@@ -202,23 +217,73 @@ class AEDetector(AnomalyDetector):
             invalidInputError(False,
                               "please call fit before calling score")
 
+        if self.score_range is not None:
+            self.anomaly_scores_ = self.score_chunks.merge_into(self.anomaly_scores_)
+            return self.anomaly_scores_
+
         # if input is rolled
         if self.recon_err_subseq is not None:
-            # recon_err = MinMaxScaler().fit_transform(self.recon_err)
-            # recon_err_subseq = MinMaxscaler().fit_transform(self.recon_err_subseq.reshape(-1, 1))
-            for index, e in np.ndenumerate(self.recon_err):
-                agg_err = e + self.sub_scalef * self.recon_err_subseq[index[0]]
-                y_index = index[0] + index[1]
-                # only keep the largest err score for each ts sample
-                if agg_err > self.anomaly_scores_[y_index]:
-                    self.anomaly_scores_[y_index] = agg_err
+            # only keep the largest err score for each ts sample
+            self._aggregate_err(self.anomaly_scores_, self.recon_err, self.recon_err_subseq)
         else:
             self.anomaly_scores_ = self.recon_err
 
+        self.score_range = (self.anomaly_scores_.min(), self.anomaly_scores_.max())
         self.anomaly_scores_ = scale_arr(self.anomaly_scores_.reshape(-1, 1)).squeeze()
 
         return self.anomaly_scores_
 
+    def _aggregate_err(self, scores, recon_err, recon_err_subseq):
+        agg_err = recon_err + self.sub_scalef * recon_err_subseq[:, None]
+        # the j-th sample of the i-th sub sequence is the (i + j)-th sample
+        y_index = np.arange(len(recon_err))[:, None] + np.arange(recon_err.shape[1])
+        np.maximum.at(scores, y_index.ravel(), agg_err.ravel())
+
+    def score_update(self, y):
+        """
+        Gets the anomaly scores of new samples with the trained autoencoder, and appends
+        them to the scores of the previous input, so that streaming data could be detected
+        chunk by chunk. Only the sub sequences ending at the new samples are reconstructed,
+        with the last roll_len - 1 samples of the previous input kept in a buffer. The scores
+        are scaled by the range of the aggregated errors of the input of fit, so they may be
+        larger than 1 for anomalies. Only window mode is supported.
+
+        :param y: new samples of the time series. y must be 1-D numpy array.
+
+        :return: the anomaly scores of the new samples, in an array format with the same
+            size as y
+        """
+        from bigdl.nano.utils.log4Error import invalidInputError
+        if self.ae_model is None:
+            invalidInputError(False, "please call fit before calling score_update")
+        if self.roll_len == 0:
+            invalidInputError(False, "score_update is only supported in window mode")
+        self.check_data(y)
+        if self.score_range is None:
+            self.score()
+
+        series = np.concatenate([self.buffer, y])
+        x = self.scaler.transform(roll_arr(series, self.roll_len)).astype('float32')
+        if self.backend == "keras":
+            x_pred = self.ae_model.predict(x)
+        else:
+            import torch
+            with torch.no_grad():
+                x_pred = self.ae_model(torch.from_numpy(x)).numpy()
+        recon_err = abs(x - x_pred)
+        scores = np.zeros(len(series))
+        self._aggregate_err(scores, recon_err, np.linalg.norm(recon_err, axis=1))
+        scores = scores[len(self.buffer):]
+        score_min, score_max = self.score_range
+        if score_max > score_min:
+            scores = (scores - score_min) / (score_max - score_min)
+        else:
+            scores = scores - score_min
+
+        self.buffer = series[len(series) - self.roll_len + 1:]
+        self.score_chunks.append(scores)
+        return scores
+
     def anomaly_indexes(self):
         """
         Gets the indexes of N samples with the largest anomaly scores in y
@@ -226,7 +291,6 @@ class AEDetector(AnomalyDetector):
 
         :return: the indexes of N samples
         """
-        if self.anomaly_scores_ is None:
-            self.score()
-        num_anomalies = int(len(self.anomaly_scores_) * self.ratio)
-        return self.anomaly_scores_.argsort()[-num_anomalies:]
+        anomaly_scores = self.score()
+        num_anomalies = int(len(anomaly_scores) * self.ratio)
+        return anomaly_scores.argsort()[-num_anomalies:]
@@ -15,7 +15,7 @@
 #
 
 from bigdl.chronos.detector.anomaly.abstract import AnomalyDetector
-from bigdl.chronos.detector.anomaly.util import INTEL_EXT_DBSCAN
+from bigdl.chronos.detector.anomaly.util import INTEL_EXT_DBSCAN, ArrayChunks
 
 import numpy as np
 
@@ -29,6 +29,8 @@ class DBScanDetector(AnomalyDetector):
             >>> ad.fit(y)
             >>> anomaly_scores = ad.score()
             >>> anomaly_indexes = ad.anomaly_indexes()
+            >>> # detect new samples chunk by chunk
+            >>> new_scores = ad.score_update(y_new)
     """
 
     def __init__(self,
@@ -52,6 +54,11 @@ class DBScanDetector(AnomalyDetector):
         self.argv = argv
         self.anomaly_indexes_ = None
         self.anomaly_scores_ = None
+        # sorted values of the core samples found in fit
+        self.core_samples_ = None
+        # results of score_update not merged into anomaly_indexes_ and anomaly_scores_ yet
+        self.index_chunks = ArrayChunks()
+        self.score_chunks = ArrayChunks()
 
     def check_data(self, arr):
         if len(arr.shape) > 1:
@@ -75,9 +82,46 @@ class DBScanDetector(AnomalyDetector):
             clusters = DBSCAN(eps=self.eps, min_samples=self.min_samples)\
                 .fit(y.reshape(-1, 1), **self.argv)
         labels = clusters.labels_
+        self.core_samples_ = np.sort(y[clusters.core_sample_indices_])
         outlier_indexes = np.where(labels == -1)[0]
         self.anomaly_indexes_ = outlier_indexes
         self.anomaly_scores_[self.anomaly_indexes_] = 1
+        self.index_chunks, self.score_chunks = ArrayChunks(), ArrayChunks()
+
+    def score_update(self, y):
+        """
+        Gets the anomaly scores of new samples with the core samples found in fit, and
+        appends the anomalies to those of the previous input, so that streaming data
+        could be detected chunk by chunk without clustering the whole series again.
+        A new sample is an anomaly if there is no core sample within eps of it, i.e.
+        it would not be assigned to any cluster. Indexes of the new anomalies are offset
+        by the number of previous samples.
+
+        :param y: new samples of the time series. y must be 1-D numpy array.
+
+        :return: anomaly score for each new sample, in an array format with the same size as y
+        """
+        if self.core_samples_ is None:
+            from bigdl.nano.utils.log4Error import invalidInputError
+            invalidInputError(False,
+                              "Please call fit first")
+        self.check_data(y)
+        anomaly_scores = np.ones_like(y)
+        if len(self.core_samples_) > 0:
+            # distance to the nearest core sample
+            right = np.searchsorted(self.core_samples_, y).clip(1, len(self.core_samples_) - 1)
+            dist = np.minimum(abs(y - self.core_samples_[right - 1]),
+                              abs(y - self.core_samples_[right]))
+            anomaly_scores[dist <= self.eps] = 0
+        anomaly_indexes = np.where(anomaly_scores == 1)[0]
+        offset = len(self.anomaly_scores_) + self.score_chunks.size
+        self.index_chunks.append(anomaly_indexes + offset)
+        self.score_chunks.append(anomaly_scores)
+        return anomaly_scores
+
+    def _merge_updates(self):
+        self.anomaly_indexes_ = self.index_chunks.merge_into(self.anomaly_indexes_)
+        self.anomaly_scores_ = self.score_chunks.merge_into(self.anomaly_scores_)
 
     def score(self):
         """
@@ -90,6 +134,7 @@ class DBScanDetector(AnomalyDetector):
             from bigdl.nano.utils.log4Error import invalidInputError
             invalidInputError(False,
                               "Please call fit first")
+        self._merge_updates()
         return self.anomaly_scores_
 
     def anomaly_indexes(self):
@@ -102,4 +147,5 @@ class DBScanDetector(AnomalyDetector):
             from bigdl.nano.utils.log4Error import invalidInputError
             invalidInputError(False,
                               "Please call fit first")
+        self._merge_updates()
         return self.anomaly_indexes_
@@ -17,6 +17,7 @@
 import math
 import numpy as np
 from bigdl.chronos.detector.anomaly.abstract import AnomalyDetector
+from bigdl.chronos.detector.anomaly.util import ArrayChunks
 
 from abc import ABC, abstractmethod
 
@@ -37,6 +38,17 @@ class Distance(ABC):
         """
         pass
 
+    def abs_dist_batch(self, x, y):
+        """
+        Calculate the distance between each pair of samples in x and y, i.e. x[i] and y[i].
+        Subclasses could override it with a vectorized implementation.
+
+        :param x: the first tensor, the first dim is num_samples
+        :param y: the second tensor in the same shape as x
+        :return: 1-D array of the absolute distances in shape (num_samples,)
+        """
+        return np.array([self.abs_dist(m, n) for m, n in zip(x, y)])
+
 
 class EuclideanDistance(Distance):
     """
@@ -49,6 +61,10 @@ class EuclideanDistance(Distance):
     def abs_dist(self, x, y):
         return np.linalg.norm(x - y)
 
+    def abs_dist_batch(self, x, y):
+        diff = np.asarray(x - y)
+        return np.linalg.norm(diff.reshape(diff.shape[0], -1), axis=1)
+
 
 def estimate_th(y,
                 yhat,
@@ -69,7 +85,7 @@ def estimate_th(y,
     """
     from bigdl.nano.utils.log4Error import invalidInputError
     invalidInputError(y.shape == yhat.shape, "y shape doesn't match yhat shape")
-    diff = [dist_measure.abs_dist(m, n) for m, n in zip(y, yhat)]
+    diff = dist_measure.abs_dist_batch(y, yhat)
     if mode == "default":
         threshold = np.percentile(diff, (1 - ratio) * 100)
         return threshold
@@ -83,13 +99,10 @@ def estimate_th(y,
 
 
 def detect_all(y, yhat, th, dist_measure):
+    is_anomaly = dist_measure.abs_dist_batch(y, yhat) > th
     anomaly_scores = np.zeros_like(y)
-    anomaly_indexes = []
-    for i, (y_i, yhat_i) in enumerate(zip(y, yhat)):
-        if dist_measure.abs_dist(y_i, yhat_i) > th:
-            anomaly_indexes.append(i)
-            anomaly_scores[i] = 1
-    return anomaly_indexes, anomaly_scores
+    anomaly_scores[is_anomaly] = 1
+    return np.flatnonzero(is_anomaly), anomaly_scores
 
 
 def detect_range(y, th):
@@ -105,8 +118,9 @@ def detect_range_arr(y, th_arr):
     anomaly_indexes = np.logical_or(min_diff < 0, max_diff > 0)
     anomaly_scores = np.zeros_like(y)
     anomaly_scores[anomaly_indexes] = 1
-    # anomaly_index.update(np.where(max_diff > 0)[0])
-    return list(set(np.where(anomaly_scores > 0)[0])), anomaly_scores
+    # a sample is an anomaly if any of its dimensions is out of range
+    is_anomaly = anomaly_indexes.reshape(anomaly_indexes.shape[0], -1).any(axis=1)
+    return np.flatnonzero(is_anomaly), anomaly_scores
 
 
 def detect_anomaly(y,
@@ -127,7 +141,8 @@ def detect_anomaly(y,
         2. a tuple (min, max) - min and max are either int/float or tensors in same shape as y,
         yhat is ignored in this case
     :param dist_measure: measure of distance
-    :return: the anomaly values indexes in the samples, i.e. num_samples dimension.
+    :return: the sorted anomaly values indexes in the samples, i.e. num_samples dimension,
+        and the anomaly scores in the same shape as y.
     """
     from bigdl.nano.utils.log4Error import invalidInputError
     if isinstance(th, int) or isinstance(th, float):
@@ -170,6 +185,8 @@ class ThresholdDetector(AnomalyDetector):
             >>> td.fit(y_test, y_pred)
             >>> anomaly_scores = td.score()
             >>> anomaly_indexes = td.anomaly_indexes()
+            >>> # detect new data incrementally with the fitted threshold
+            >>> new_anomaly_scores = td.score_update(y_new, y_new_pred)
     """
 
     def __init__(self):
@@ -182,6 +199,9 @@ class ThresholdDetector(AnomalyDetector):
         self.mode = "default"
         self.anomaly_indexes_ = None
         self.anomaly_scores_ = None
+        # results of score_update not merged into anomaly_indexes_ and anomaly_scores_ yet
+        self.index_chunks = ArrayChunks()
+        self.score_chunks = ArrayChunks()
 
     def set_params(self,
                    mode="default",
@@ -227,6 +247,7 @@ class ThresholdDetector(AnomalyDetector):
         anomalies = detect_anomaly(y, y_pred, self.th, self.dist_measure)
         self.anomaly_indexes_ = anomalies[0]
         self.anomaly_scores_ = anomalies[1]
+        self.index_chunks, self.score_chunks = ArrayChunks(), ArrayChunks()
 
     def score(self, y=None, y_pred=None):
         """
@@ -243,6 +264,7 @@ class ThresholdDetector(AnomalyDetector):
         if y is None:
             if self.anomaly_scores_ is None:
                 invalidInputError(False, "please call fit before calling score")
+            self._merge_updates()
             return self.anomaly_scores_
         else:
             return detect_anomaly(y,
@@ -250,13 +272,39 @@ class ThresholdDetector(AnomalyDetector):
                                   self.th,
                                   self.dist_measure)[1]
 
+    def score_update(self, y, y_pred=None):
+        """
+        Gets the anomaly scores of new samples with the current threshold, and appends the
+        anomalies to those of the previous input, so that streaming data could be detected
+        chunk by chunk. Indexes of the new anomalies are offset by the number of previous
+        samples.
+
+        :param y: new samples to detect anomaly, in the same format as the input of fit.
+        :param y_pred: forecasts corresponding to y
+
+        :return: anomaly score for each new sample, in an array format with the same size as y
+        """
+        anomaly_indexes, anomaly_scores = detect_anomaly(y, y_pred, self.th, self.dist_measure)
+        if self.anomaly_scores_ is None:
+            self.anomaly_indexes_, self.anomaly_scores_ = anomaly_indexes, anomaly_scores
+        else:
+            offset = len(self.anomaly_scores_) + self.score_chunks.size
+            self.index_chunks.append(anomaly_indexes + offset)
+            self.score_chunks.append(anomaly_scores)
+        return anomaly_scores
+
+    def _merge_updates(self):
+        self.anomaly_indexes_ = self.index_chunks.merge_into(self.anomaly_indexes_)
+        self.anomaly_scores_ = self.score_chunks.merge_into(self.anomaly_scores_)
+
     def anomaly_indexes(self):
         """
         Gets the indexes of the anomalies.
 
-        :return: the indexes of the anomalies.
+        :return: the sorted indexes of the anomalies in a list.
         """
         from bigdl.nano.utils.log4Error import invalidInputError
         if self.anomaly_indexes_ is None:
             invalidInputError(False, "Please call fit first")
-        return self.anomaly_indexes_
+        self._merge_updates()
+        return self.anomaly_indexes_.tolist()
@@ -51,8 +51,40 @@ class INTEL_EXT_DBSCAN:
             unpatch_sklearn(self.algorithm_list)
 
 
+class ArrayChunks:
+    """
+    Chunks appended one by one to an array, e.g. the scores of a stream detected chunk by
+    chunk. The chunks are only concatenated when the whole array is read, so appending a
+    chunk doesn't copy all the previous samples.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        # total number of samples in the chunks
+        self.size = 0
+
+    def append(self, chunk):
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+
+    def merge_into(self, arr):
+        """
+        :return: arr followed by all the chunks, the chunks are cleared.
+        """
+        if self.chunks:
+            arr = np.concatenate([arr] + self.chunks)
+            self.chunks, self.size = [], 0
+        return arr
+
+
 def roll_arr(arr, stride):
-    return np.asarray([arr[i:i + stride] for i in range(len(arr) - stride + 1)])
+    """
+    :return: a read-only strided view of arr, the i-th row is arr[i:i + stride]
+    """
+    arr = np.asarray(arr)
+    return np.lib.stride_tricks.as_strided(
+        arr, shape=(max(len(arr) - stride + 1, 0), stride) + arr.shape[1:],
+        strides=(arr.strides[0],) + arr.strides, writeable=False)
 
 
 def scale_arr(arr, mode="minmax"):
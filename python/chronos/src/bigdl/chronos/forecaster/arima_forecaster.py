@@ -14,17 +14,24 @@
 # limitations under the License.
 #
 
+import pickle
+
 from bigdl.chronos.forecaster.abstract import Forecaster
+from bigdl.chronos.forecaster.utils_multi_series import MultiSeriesMixin, \
+    _is_multi_series_file
 from bigdl.chronos.model.arima import ARIMAModel
 
 
-class ARIMAForecaster(Forecaster):
+class ARIMAForecaster(MultiSeriesMixin, Forecaster):
     """
     Example:
         >>> #The dataset is split into data, validation_data
         >>> model = ARIMAForecaster(p=2, q=2, seasonality_mode=False)
         >>> model.fit(data, validation_data)
         >>> predict_result = model.predict(horizon=24)
+        >>> # fit one model for each id of a TSDataset in a process pool
+        >>> model.fit(tsdata_train, tsdata_val, num_workers=8)
+        >>> predict_result = model.predict(horizon=24)  # a dict of id to forecast
     """
 
     def __init__(self,
@@ -65,17 +72,34 @@ class ARIMAForecaster(Forecaster):
             "metric": metric,
         }
         self.internal = ARIMAModel()
+        self._init_multi_series()
 
         super().__init__()
 
-    def fit(self, data, validation_data):
+    def fit(self, data, validation_data=None, num_workers=None):
         """
         Fit(Train) the forecaster.
 
-        :param data: A 1-D numpy array as the training data
-        :param validation_data: A 1-D numpy array as the evaluation data
+        :param data: The data support following formats:
+
+               | 1. A 1-D numpy array as the training data
+               | 2. A bigdl.chronos.data.tsdataset.TSDataset or a
+               | bigdl.chronos.data.experimental.XShardsTSDataset instance with one target
+               | column, a model is fitted for each id, in a process pool for TSDataset or
+               | in the partitions of XShardsTSDataset. The ids failed to fit are recorded
+               | in failed_series instead of raising an error.
+
+        :param validation_data: A 1-D numpy array as the evaluation data, or a TSDataset
+               if data is a TSDataset. It is required for numpy array data.
+        :param num_workers: The number of processes to fit a TSDataset, defaults to None,
+               which means the number of cpus.
+
+        :return: the evaluation metric value, or a dict of id to it for TSDataset.
         """
+        if self._is_multi_series_data(data):
+            return self._fit_multi_series(data, validation_data, num_workers=num_workers)
         self._check_data(data, validation_data)
+        self.series_models = None
         data = data.reshape(-1, 1)
         # validation_data = validation_data.reshape(-1, 1)
         return self.internal.fit_eval(data=data,
@@ -87,38 +111,55 @@ class ARIMAForecaster(Forecaster):
         invalidInputError(data.ndim == 1,
                           "data should be an 1-D array),"
                           "Got data dimension of {}.".format(data.ndim))
+        invalidInputError(validation_data is not None,
+                          "validation_data is required for numpy array data.")
         invalidInputError(validation_data.ndim == 1,
                           "validation_data should be an 1-D array),"
                           "Got validation_data dimension of {}.".format(validation_data.ndim))
 
-    def predict(self, horizon, rolling=False):
+    def predict(self, horizon, rolling=False, num_workers=None):
         """
         Predict using a trained forecaster.
 
         :param horizon: the number of steps forward to predict
         :param rolling: whether to use rolling prediction
+        :param num_workers: The number of processes to predict the ids when the forecaster
+               is fitted on a TSDataset, defaults to None, which means the number of cpus.
 
-        :return: A list in length of horizon reflects the predict result.
+        :return: A list in length of horizon reflects the predict result, or a dict of id
+                 to it if the forecaster is fitted on a TSDataset, the ids failed to fit or
+                 predict are not included.
         """
+        if self.series_models is not None:
+            return self._predict_multi_series(num_workers=num_workers,
+                                              horizon=horizon, rolling=rolling)
         if self.internal.model is None:
             from bigdl.nano.utils.log4Error import invalidInputError
             invalidInputError(False,
                               "You must call fit or restore first before calling predict!")
         return self.internal.predict(horizon=horizon, rolling=rolling)
 
-    def evaluate(self, validation_data, metrics=['mse'], rolling=False):
+    def evaluate(self, validation_data, metrics=['mse'], rolling=False, num_workers=None):
         """
         Evaluate using a trained forecaster.
 
-        :param validation_data: A 1-D numpy array as the evaluation data
+        :param validation_data: A 1-D numpy array as the evaluation data, or a TSDataset
+               if the forecaster is fitted on a TSDataset.
         :param metrics: A list contains metrics for test/valid data.
+        :param rolling: whether to use rolling prediction
+        :param num_workers: The number of processes to evaluate a TSDataset, defaults to
+               None, which means the number of cpus.
 
-        :return: A list in length of len(metrics), where states the metrics in order.
+        :return: A list in length of len(metrics), where states the metrics in order,
+                 or a dict of id to it for TSDataset.
         """
         from bigdl.nano.utils.log4Error import invalidInputError
         if validation_data is None:
             invalidInputError(False,
                               "Input invalid validation_data of None")
+        if self.series_models is not None:
+            return self._evaluate_multi_series(validation_data, metrics,
+                                               num_workers=num_workers, rolling=rolling)
         if self.internal.model is None:
             invalidInputError(False,
                               "You must call fit or restore first before calling evaluate!")
@@ -128,8 +169,11 @@ class ARIMAForecaster(Forecaster):
         """
         Save the forecaster.
 
-        :param checkpoint_file: The location you want to save the forecaster.
+        :param checkpoint_file: The location you want to save the forecaster. The models
+               of all the ids are saved to this one compressed file for TSDataset.
         """
+        if self.series_models is not None:
+            return self._save_multi_series(checkpoint_file)
         if self.internal.model is None:
             from bigdl.nano.utils.log4Error import invalidInputError
             invalidInputError(False,
@@ -142,4 +186,26 @@ class ARIMAForecaster(Forecaster):
 
         :param checkpoint_file: The checkpoint file location you want to load the forecaster.
         """
+        if _is_multi_series_file(checkpoint_file):
+            return self._restore_multi_series(checkpoint_file)
+        self.series_models = None
         self.internal.restore(checkpoint_file)
+
+    @staticmethod
+    def _new_series_model():
+        return ARIMAModel()
+
+    @staticmethod
+    def _series_data(df, dt_col, target_col):
+        return df[target_col].values
+
+    @staticmethod
+    def _dumps_series_model(model):
+        return pickle.dumps(model.model, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _loads_series_model(data):
+        model = ARIMAModel()
+        model.model = pickle.loads(data)
+        model.model_init = True
+        return model
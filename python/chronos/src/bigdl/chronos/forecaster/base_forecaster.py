@@ -87,6 +87,9 @@ class BasePytorchForecaster(Forecaster):
 
             self.accelerated_model = None  # accelerated model obtained from various accelerators
             self.accelerate_method = None  # str indicates current accelerate method
+            # id -> [ring buffer of the last past_seq_len points, next position, count]
+            self._latest_buffers = {}
+            self._latest_input = None  # preallocated input of predict_latest
 
     def _build_automodel(self, data, validation_data=None, batch_size=32, epochs=1):
         """Build a Generic Model using config parameters."""
@@ -717,6 +720,113 @@ class BasePytorchForecaster(Forecaster):
                 yhat = np_to_xshard(yhat, self.workers_per_node, prefix="prediction")
             return yhat
 
+    def predict_latest(self, data, id=None, quantize=False, acceleration: bool = True):
+        """
+        Forecast the latest window of a time series with low latency, for online serving.
+        The last past_seq_len points of each id are kept in a ring buffer, new observations
+        are appended to it incrementally, and the latest window is copied to a preallocated
+        input to run the (accelerated) model, without building a dataloader.
+
+        :param data: The data support following formats:
+
+               | 1. a numpy ndarray with shape (num_points, input_feature_num), which is the
+               | new observations of id, in the same order of features and the same scaling
+               | as x used in fit. Before the first forecast of an id, at least past_seq_len
+               | points need to be appended in total.
+               |
+               | 2. A bigdl.chronos.data.tsdataset.TSDataset instance:
+               | the ring buffers of all the ids are reset by the last past_seq_len points of
+               | roll_target + roll_feature (or target_col + feature_col if it has not been
+               | rolled) of each id in the TSDataset, which should be scaled already.
+
+        :param id: the id of the time series when data is a numpy ndarray, defaults to None.
+        :param quantize: if use the quantized model to predict.
+        :param acceleration: bool variable indicates whether use original model.
+               Default to True means use accelerated_model to predict, same as predict.
+
+        :return: A numpy array with shape (horizon, target_dim) if data is a numpy ndarray,
+                 or with shape (num_ids, horizon, target_dim) for the ids in TSDataset.
+
+        Example:
+            >>> forecaster.predict_latest(tsdata_history)  # warm up the buffers
+            >>> yhat = forecaster.predict_latest(new_points, id="00")
+            >>> # {"p50": ..., "p90": ..., "p95": ..., "p99": ...}
+            >>> latency = Evaluator.get_latency(forecaster.predict_latest, new_points, id="00")
+        """
+        from bigdl.chronos.pytorch.utils import _pytorch_fashion_inference
+
+        if self.distributed:
+            invalidInputError(False,
+                              "predict_latest has not been supported for distributed "
+                              "forecaster. You can call .to_local() to transform the "
+                              "forecaster to a non-distributed version.")
+        if not self.fitted:
+            invalidInputError(False,
+                              "You must call fit or restore first before calling predict!")
+        if quantize:
+            if self.accelerate_method != "pytorch_int8":
+                invalidInputError(False,
+                                  "Can't find the quantized model, "
+                                  "please call .quantize() method first")
+            model = self.accelerated_model
+        elif acceleration is False or self.accelerated_model is None:
+            model = self.internal
+        else:
+            model = self.accelerated_model
+        model.eval()
+        past_seq_len = self.data_config['past_seq_len']
+        input_feature_num = self.data_config['input_feature_num']
+
+        if isinstance(data, TSDataset):
+            cols = data.roll_target + data.roll_feature if data.roll_target is not None \
+                else data.target_col + data.feature_col
+            invalidInputError(len(cols) == input_feature_num,
+                              f"Expect {input_feature_num} features, but found {len(cols)}.")
+            self._latest_buffers = {}
+            for id_, group in data.df.groupby(data.id_col):
+                self._append_latest(id_, group[cols].values[-past_seq_len:])
+            x = np.stack([self._latest_window(id_) for id_ in self._latest_buffers])
+            return _pytorch_fashion_inference(model=model, input_data=x)
+
+        data = np.asarray(data, dtype=np.float32)
+        invalidInputError(data.ndim == 2 and data.shape[1] == input_feature_num,
+                          f"Expect data with shape (num_points, {input_feature_num}), "
+                          f"but found {data.shape}.")
+        self._append_latest(id, data)
+        if self._latest_input is None:
+            self._latest_input = np.empty((1, past_seq_len, input_feature_num),
+                                          dtype=np.float32)
+        self._latest_window(id, out=self._latest_input[0])
+        return _pytorch_fashion_inference(model=model, input_data=self._latest_input)[0]
+
+    def _append_latest(self, id, points):
+        past_seq_len = self.data_config['past_seq_len']
+        if id not in self._latest_buffers:
+            self._latest_buffers[id] = [np.zeros((past_seq_len, points.shape[1]),
+                                                 dtype=np.float32), 0, 0]
+        buffer = self._latest_buffers[id]
+        points = points[-past_seq_len:]
+        # write the points at buffer[pos:], and wrap around to buffer[:rest]
+        pos, num = buffer[1], len(points)
+        first = min(num, past_seq_len - pos)
+        buffer[0][pos:pos + first] = points[:first]
+        buffer[0][:num - first] = points[first:]
+        buffer[1] = (pos + num) % past_seq_len
+        buffer[2] += num
+
+    def _latest_window(self, id, out=None):
+        past_seq_len = self.data_config['past_seq_len']
+        buffer, pos, count = self._latest_buffers[id]
+        invalidInputError(count >= past_seq_len,
+                          f"At least {past_seq_len} points of id {id} are needed to predict, "
+                          f"but only {count} points are appended.")
+        if out is None:
+            out = np.empty_like(buffer)
+        # the oldest point is at pos
+        out[:past_seq_len - pos] = buffer[pos:]
+        out[past_seq_len - pos:] = buffer[:pos]
+        return out
+
     def predict_with_onnx(self, data, batch_size=32, quantize=False):
         """
         Predict using a trained forecaster with onnxruntime. The method can only be
@@ -1405,6 +1515,8 @@ class BasePytorchForecaster(Forecaster):
         self.accelerated_model = None
         # str indicates current accelerate method
         self.accelerate_method = None
+        self._latest_buffers = {}
+        self._latest_input = None
         return self
 
     def get_model(self):
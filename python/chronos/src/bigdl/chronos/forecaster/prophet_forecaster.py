@@ -15,16 +15,21 @@
 #
 
 from bigdl.chronos.forecaster.abstract import Forecaster
+from bigdl.chronos.forecaster.utils_multi_series import MultiSeriesMixin, \
+    _is_multi_series_file
 from bigdl.chronos.model.prophet import ProphetModel
 
 
-class ProphetForecaster(Forecaster):
+class ProphetForecaster(MultiSeriesMixin, Forecaster):
     """
     Example:
         >>> #The dataset is split into data, validation_data
         >>> model = ProphetForecaster(changepoint_prior_scale=0.05, seasonality_mode='additive')
         >>> model.fit(data, validation_data)
         >>> predict_result = model.predict(horizon=24)
+        >>> # fit one model for each id of a TSDataset in a process pool
+        >>> model.fit(tsdata_train, tsdata_val, num_workers=8)
+        >>> predict_result = model.predict(horizon=24)  # a dict of id to forecast
     """
 
     def __init__(self,
@@ -67,21 +72,35 @@ class ProphetForecaster(Forecaster):
             "metric": metric
         }
         self.internal = ProphetModel()
+        self._init_multi_series()
 
         super().__init__()
 
-    def fit(self, data, validation_data=None):
+    def fit(self, data, validation_data=None, num_workers=None):
         """
         Fit(Train) the forecaster.
 
-        :param data: training data, a pandas dataframe with Td rows,
-            and 2 columns, with column 'ds' indicating date and column 'y' indicating value
-            and Td is the time dimension
+        :param data: The data support following formats:
+
+               | 1. training data, a pandas dataframe with Td rows,
+               | and 2 columns, with column 'ds' indicating date and column 'y' indicating
+               | value and Td is the time dimension
+               | 2. A bigdl.chronos.data.tsdataset.TSDataset or a
+               | bigdl.chronos.data.experimental.XShardsTSDataset instance with one target
+               | column, a model is fitted for each id, in a process pool for TSDataset or
+               | in the partitions of XShardsTSDataset. The ids failed to fit are recorded
+               | in failed_series instead of raising an error.
+
         :param validation_data: evaluation data, should be the same type as data
+        :param num_workers: The number of processes to fit a TSDataset, defaults to None,
+               which means the number of cpus.
 
-        :return: the evaluation metric value
+        :return: the evaluation metric value, or a dict of id to it for TSDataset.
         """
+        if self._is_multi_series_data(data):
+            return self._fit_multi_series(data, validation_data, num_workers=num_workers)
         self._check_data(data, validation_data)
+        self.series_models = None
         return self.internal.fit_eval(data=data,
                                       validation_data=validation_data,
                                       **self.model_config)
@@ -96,7 +115,7 @@ class ProphetForecaster(Forecaster):
                               "validation_data should be a dataframe that has at least"
                               " 2 columns 'ds' and 'y'.")
 
-    def predict(self, horizon=1, freq="D", ds_data=None):
+    def predict(self, horizon=1, freq="D", ds_data=None, num_workers=None):
         """
         Predict using a trained forecaster.
 
@@ -105,31 +124,49 @@ class ProphetForecaster(Forecaster):
                the frequency can be anything from the pandas list of frequency strings here:
                https://pandas.pydata.org/pandas-docs/stable/user_guide/timeseries.html#timeseries-offset-aliases
         :param ds_data: a dataframe that has 1 column 'ds' indicating date.
+               It is not supported if the forecaster is fitted on a TSDataset.
+        :param num_workers: The number of processes to predict the ids when the forecaster
+               is fitted on a TSDataset, defaults to None, which means the number of cpus.
 
         :return: A pandas DataFrame of length horizon,
                  including "trend" and "seasonality" and inference values, etc.
-                 where the "yhat" column is the inference value.
+                 where the "yhat" column is the inference value. A dict of id to it
+                 if the forecaster is fitted on a TSDataset, the ids failed to fit or
+                 predict are not included.
         """
+        if self.series_models is not None:
+            from bigdl.nano.utils.log4Error import invalidInputError
+            invalidInputError(ds_data is None,
+                              "ds_data is not supported for the forecaster fitted on "
+                              "a TSDataset.")
+            return self._predict_multi_series(num_workers=num_workers,
+                                              horizon=horizon, freq=freq)
         if self.internal.model is None:
             from bigdl.nano.utils.log4Error import invalidInputError
             invalidInputError(False,
                               "You must call fit or restore first before calling predict!")
         return self.internal.predict(horizon=horizon, freq=freq, ds_data=ds_data)
 
-    def evaluate(self, data, metrics=['mse']):
+    def evaluate(self, data, metrics=['mse'], num_workers=None):
         """
         Evaluate using a trained forecaster.
 
         :param data: evaluation data, a pandas dataframe with Td rows,
             and 2 columns, with column 'ds' indicating date and column 'y' indicating value
-            and Td is the time dimension
+            and Td is the time dimension, or a TSDataset if the forecaster is fitted on
+            a TSDataset.
         :param metrics: A list contains metrics for test/valid data.
+        :param num_workers: The number of processes to evaluate a TSDataset, defaults to
+               None, which means the number of cpus.
 
-        :return: A list of evaluation results. Calculation results for each metrics.
+        :return: A list of evaluation results. Calculation results for each metrics,
+                 or a dict of id to it for TSDataset.
         """
         from bigdl.nano.utils.log4Error import invalidInputError
         if data is None:
             invalidInputError(False, "Input invalid data of None")
+        if self.series_models is not None:
+            return self._evaluate_multi_series(data, metrics, num_workers=num_workers)
         if self.internal.model is None:
             invalidInputError(False,
                               "You must call fit or restore first before calling evaluate!")
@@ -140,8 +177,11 @@ class ProphetForecaster(Forecaster):
         """
         Save the forecaster.
 
-        :param checkpoint_file: The location you want to save the forecaster, should be a json file
+        :param checkpoint_file: The location you want to save the forecaster, should be a json file.
+               The models of all the ids are saved to this one compressed file for TSDataset.
         """
+        if self.series_models is not None:
+            return self._save_multi_series(checkpoint_file)
         if self.internal.model is None:
             from bigdl.nano.utils.log4Error import invalidInputError
             invalidInputError(False,
@@ -154,4 +194,31 @@ class ProphetForecaster(Forecaster):
 
         :param checkpoint_file: The checkpoint file location you want to load the forecaster.
         """
+        if _is_multi_series_file(checkpoint_file):
+            return self._restore_multi_series(checkpoint_file)
+        self.series_models = None
         self.internal.restore(checkpoint_file)
+
+    @staticmethod
+    def _new_series_model():
+        return ProphetModel()
+
+    @staticmethod
+    def _series_data(df, dt_col, target_col):
+        import pandas as pd
+        return pd.DataFrame({"ds": df[dt_col].values, "y": df[target_col].values})
+
+    @staticmethod
+    def _dumps_series_model(model):
+        import json
+        from prophet.serialize import model_to_json
+        return json.dumps(model_to_json(model.model))
+
+    @staticmethod
+    def _loads_series_model(data):
+        import json
+        from prophet.serialize import model_from_json
+        model = ProphetModel()
+        model.model = model_from_json(json.loads(data))
+        model.model_init = True
+        return model
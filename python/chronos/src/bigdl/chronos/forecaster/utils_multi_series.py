@@ -0,0 +1,167 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import gzip
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from bigdl.nano.utils.log4Error import invalidInputError
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _fit_series(task):
+    cls, config, id_, data, validation_data = task
+    try:
+        model = cls._new_series_model()
+        metric = model.fit_eval(data=data, validation_data=validation_data, **config)
+        return id_, cls._dumps_series_model(model), metric, None
+    except Exception as e:
+        return id_, None, None, repr(e)
+
+
+def _predict_series(task):
+    cls, id_, model, kwargs = task
+    try:
+        return id_, cls._loads_series_model(model).predict(**kwargs), None
+    except Exception as e:
+        return id_, None, repr(e)
+
+
+def _evaluate_series(task):
+    cls, id_, model, target, metrics, kwargs = task
+    try:
+        model = cls._loads_series_model(model)
+        return id_, model.evaluate(target=target, metrics=metrics, **kwargs), None
+    except Exception as e:
+        return id_, None, repr(e)
+
+
+def _map(func, tasks, num_workers=None):
+    num_workers = num_workers if num_workers else os.cpu_count()
+    num_workers = min(num_workers, len(tasks))
+    if num_workers <= 1:
+        return [func(task) for task in tasks]
+    chunksize = max(1, len(tasks) // (num_workers * 4))
+    with ProcessPoolExecutor(num_workers) as pool:
+        return list(pool.map(func, tasks, chunksize=chunksize))
+
+
+def _is_xshards_tsdataset(data):
+    try:
+        from bigdl.chronos.data.experimental import XShardsTSDataset
+        return isinstance(data, XShardsTSDataset)
+    except ImportError:
+        return False
+
+
+def _is_multi_series_file(checkpoint_file):
+    with open(checkpoint_file, 'rb') as f:
+        return f.read(2) == _GZIP_MAGIC
+
+
+class MultiSeriesMixin:
+    """
+    Fit, predict and evaluate one statistical model per id of a TSDataset in a
+    process pool, or per partition of a XShardsTSDataset. The fitted models are
+    kept serialized, and a series fails without aborting the others.
+
+    Subclasses implement _new_series_model, _series_data, _dumps_series_model
+    and _loads_series_model.
+    """
+
+    def _init_multi_series(self):
+        # id -> serialized fitted model, None if not in multi-series mode
+        self.series_models = None
+        # id -> error message of the series failed in fit, predict or evaluate
+        self.failed_series = {}
+
+    @staticmethod
+    def _is_multi_series_data(data):
+        from bigdl.chronos.data import TSDataset
+        return isinstance(data, TSDataset) or _is_xshards_tsdataset(data)
+
+    @classmethod
+    def _series_tasks(cls, data):
+        # list of (id, data of the id), the data of a id is converted by _series_data
+        invalidInputError(len(data.target_col) == 1,
+                          "Only univariate series are supported, "
+                          f"but found {len(data.target_col)} target columns.")
+        return [(id_, cls._series_data(group, data.dt_col, data.target_col[0]))
+                for id_, group in data.df.groupby(data.id_col, sort=False)]
+
+    def _fit_multi_series(self, data, validation_data=None, num_workers=None):
+        config = self.model_config
+        if _is_xshards_tsdataset(data):
+            cls, dt_col, target_col = type(self), data.dt_col, data.target_col[0]
+
+            def fit_partition(df, id_col):
+                return [_fit_series((cls, config, id_, cls._series_data(group, dt_col,
+                                                                        target_col), None))
+                        for id_, group in df.groupby(id_col, sort=False)]
+            invalidInputError(validation_data is None,
+                              "validation_data is not supported with XShardsTSDataset, "
+                              "please call evaluate after fit instead.")
+            results = [r for part in data.shards.transform_shard(fit_partition,
+                                                                 data.id_col).collect()
+                       for r in part]
+        else:
+            val = dict(self._series_tasks(validation_data)) \
+                if validation_data is not None else {}
+            tasks = [(type(self), config, id_, series, val.get(id_))
+                     for id_, series in self._series_tasks(data)]
+            results = _map(_fit_series, tasks, num_workers)
+        self.series_models, self.failed_series = {}, {}
+        metrics = {}
+        for id_, model, metric, error in results:
+            if error is None:
+                self.series_models[id_] = model
+                metrics[id_] = metric
+            else:
+                self.failed_series[id_] = error
+        return metrics
+
+    def _predict_multi_series(self, num_workers=None, **kwargs):
+        tasks = [(type(self), id_, model, kwargs) for id_, model in self.series_models.items()]
+        return self._collect(_map(_predict_series, tasks, num_workers))
+
+    def _evaluate_multi_series(self, validation_data, metrics, num_workers=None, **kwargs):
+        tasks = [(type(self), id_, self.series_models[id_], target, metrics, kwargs)
+                 for id_, target in self._series_tasks(validation_data)
+                 if id_ in self.series_models]
+        return self._collect(_map(_evaluate_series, tasks, num_workers))
+
+    def _collect(self, results):
+        output = {}
+        for id_, result, error in results:
+            if error is None:
+                output[id_] = result
+            else:
+                self.failed_series[id_] = error
+        return output
+
+    def _save_multi_series(self, checkpoint_file):
+        with gzip.open(checkpoint_file, 'wb') as f:
+            pickle.dump({"series_models": self.series_models,
+                         "failed_series": self.failed_series}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _restore_multi_series(self, checkpoint_file):
+        with gzip.open(checkpoint_file, 'rb') as f:
+            state = pickle.load(f)
+        self.series_models = state["series_models"]
+        self.failed_series = state["failed_series"]
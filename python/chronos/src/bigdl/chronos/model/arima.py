@@ -13,7 +13,7 @@
 # limitations under the License.
 #
 
-import os
+import copy
 import pickle
 from pmdarima.arima import ARIMA
 from pmdarima.arima import ndiffs
@@ -61,7 +61,8 @@ class ARIMAModel:
         """
         Fit on the training data from scratch.
         :param data: A 1-D numpy array as the training data
-        :param validation_data: A 1-D numpy array as the evaluation data
+        :param validation_data: A 1-D numpy array as the evaluation data, evaluation is
+               skipped if it is None
         :return: the evaluation metric value
         """
 
@@ -77,6 +78,8 @@ class ARIMAModel:
             self.model_init = True
 
         self.model.fit(data)
+        if validation_data is None:
+            return None
         if self.metric_func:
             val_metric = self.evaluate(x=None, target=validation_data,
                                        metrics=[self.metric_func])[0].item()
@@ -112,20 +115,17 @@ class ARIMAModel:
         if not update and not rolling:
             forecasts = self.model.predict(n_periods=horizon)
         elif rolling:
-            if not update:
-                self.save("tmp.pkl")
+            # update a copy in memory instead of saving and restoring the model through
+            # a file in working directory, which conflicts between parallel processes
+            model = self.model if update else copy.deepcopy(self.model)
 
             forecasts = []
             for step in range(horizon):
-                fc = self.model.predict(n_periods=1).item()
+                fc = model.predict(n_periods=1).item()
                 forecasts.append(fc)
 
                 # Updates the existing model with a small number of MLE steps for rolling prediction
-                self.model.update(fc)
-
-            if not update:
-                self.restore("tmp.pkl")
-                os.remove("tmp.pkl")
+                model.update(fc)
 
         return forecasts
 
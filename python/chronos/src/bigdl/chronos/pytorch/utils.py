@@ -13,7 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-import math
+import queue
+import threading
 import torch
 import numpy as np
 from torch.utils.data.dataloader import DataLoader
@@ -24,34 +25,123 @@ def _inference(model, input_sample_list, batch_size):
         # this branch is only to speed up the inferencing when batch_size is set to None.
         return model(*input_sample_list).numpy()
     else:
-        yhat_list = []
         sample_num = input_sample_list[0].shape[0]  # the first dim should be sample_num
-        batch_num = math.ceil(sample_num / batch_size)
-        for batch_id in range(batch_num):
-            yhat_list.append(model(
-                *tuple(map(lambda x: x[batch_id * batch_size: (batch_id + 1) * batch_size],
-                           input_sample_list))).numpy())
-        # this operation may cause performance degradation
-        yhat = np.concatenate(yhat_list, axis=0)
-        return yhat
+        batches = (tuple(map(lambda x: x[start: start + batch_size], input_sample_list))
+                   for start in range(0, sample_num, batch_size))
+        return _stream_inference(model, batches, sample_num)
 
 
-def _pytorch_fashion_inference(model, input_data, batch_size=None):
+def _stream_inference(model, batches, sample_num):
+    '''
+    Inference the batches one by one, the outputs are written into an array preallocated
+    by the output shape of the first batch, which grows if there are more than sample_num
+    samples.
+
+    :param model: The model to inference
+    :param batches: iterable of tuples of pytorch tensors, which are the inputs of model
+    :param sample_num: the expected total number of samples
+
+    :return: numpy ndarray
+    '''
+    yhat = None
+    offset = 0
+    for batch in batches:
+        output = model(*batch).numpy()
+        if yhat is None:
+            yhat = np.empty((max(sample_num, len(output)),) + output.shape[1:],
+                            dtype=output.dtype)
+        elif offset + len(output) > len(yhat):
+            yhat = np.concatenate([yhat, np.empty_like(yhat, shape=(max(len(yhat), len(output)),)
+                                                       + yhat.shape[1:])])
+        yhat[offset: offset + len(output)] = output
+        offset += len(output)
+    if yhat is None:
+        from bigdl.nano.utils.log4Error import invalidInputError
+        invalidInputError(False, "There is no data to inference.")
+    return yhat[:offset]
+
+
+def _prefetch(iterable, size):
+    '''
+    Iterate the iterable in a background thread, at most size items are fetched ahead,
+    so that loading the data is overlapped with the compute of the consumer.
+    '''
+    end = object()
+    items = queue.Queue(maxsize=size)
+    stop = threading.Event()
+
+    def _produce():
+        try:
+            for item in iterable:
+                while not stop.is_set():
+                    try:
+                        items.put((item, None), timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+                if stop.is_set():
+                    return
+            items.put((end, None))
+        except Exception as e:
+            items.put((end, e))
+
+    thread = threading.Thread(target=_produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if error is not None:
+                from bigdl.nano.utils.log4Error import invalidOperationError
+                invalidOperationError(False, str(error), cause=error)
+            if item is end:
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def _dataloader_sample_num(dataloader):
+    # the output array of _stream_inference grows if the number is not known
+    try:
+        if dataloader.batch_size is None:
+            # e.g. the sampler yields a list of indexes each time
+            return len(dataloader.dataset)
+        sample_num = len(dataloader.sampler)
+    except TypeError:
+        # e.g. IterableDataset without __len__
+        return 0
+    if dataloader.drop_last:
+        sample_num = sample_num // dataloader.batch_size * dataloader.batch_size
+    return sample_num
+
+
+def _pytorch_fashion_inference(model, input_data, batch_size=None, prefetch=0):
     '''
     This is an internal inference pattern for any models which can be used like:
     `model(x)  # x is a pytorch tensor`
 
     :param model: The model to inference
-    :param input_data: numpy ndarray
-    :param batch_size: batch size
+    :param input_data: numpy ndarray, list of numpy ndarray or a pytorch dataloader.
+           A dataloader is consumed batch by batch, without concatenating all the batches.
+    :param batch_size: batch size. For a dataloader, it only takes effect when it is
+           smaller than the batch size of the dataloader.
+    :param prefetch: the number of batches of a dataloader loaded ahead in a background
+           thread, 0 means loading in the current thread.
 
     :return: numpy ndarray
     '''
     with torch.no_grad():
+        if isinstance(input_data, DataLoader):
+            batches = (batch[0] for batch in input_data)
+            if prefetch > 0:
+                batches = _prefetch(batches, prefetch)
+            if batch_size is not None:
+                batches = (x[start: start + batch_size]
+                           for x in batches for start in range(0, x.shape[0], batch_size))
+            return _stream_inference(model, ((x,) for x in batches),
+                                     _dataloader_sample_num(input_data))
         if isinstance(input_data, list):
             input_sample_list = list(map(lambda x: torch.from_numpy(x), input_data))
-        elif isinstance(input_data, DataLoader):
-            input_sample_list = [torch.cat(tuple(batch[0] for batch in input_data), dim=0)]
         else:
             input_sample_list = [torch.from_numpy(input_data)]
         yhat = _inference(model, input_sample_list, batch_size=batch_size)
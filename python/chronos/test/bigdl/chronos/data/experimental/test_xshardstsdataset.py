@@ -255,6 +255,26 @@ class TestXShardsTSDataset(TestCase):
             df_train_unscale = get_local_df(tsdata)
             assert_frame_equal(df_train_unscale, df)
             
+    def test_xshardstsdataset_scale_incremental(self):
+        from sklearn.preprocessing import StandardScaler
+        df = pd.read_csv(os.path.join(self.resource_path, "multiple.csv"))
+        scaler = {0: StandardScaler(), 1: StandardScaler()}
+        for i in range(2):
+            shards_multiple = read_csv(os.path.join(self.resource_path, "multiple.csv"),
+                                       dtype={"id": np.int64})
+            tsdata = XShardsTSDataset.from_xshards(shards_multiple, dt_col="datetime",
+                                                   target_col="value",
+                                                   extra_feature_col=["extra feature"],
+                                                   id_col="id")
+            tsdata.scale(scaler, incremental=True)
+
+        # fitting the same data twice keeps the moments and doubles the count
+        for id, df_id in df.groupby("id"):
+            values = df_id[["value", "extra feature"]].values
+            assert scaler[id].n_samples_seen_ == 2 * len(values)
+            np.testing.assert_array_almost_equal(scaler[id].mean_, values.mean(axis=0))
+            np.testing.assert_array_almost_equal(scaler[id].var_, values.var(axis=0))
+
     def test_xshardstsdataset_unscale_numpy(self):
         from sklearn.preprocessing import  StandardScaler, MaxAbsScaler, MinMaxScaler, RobustScaler
         scalers = [{0: StandardScaler(), 1: StandardScaler()}, 
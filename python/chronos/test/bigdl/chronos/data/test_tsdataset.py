@@ -228,6 +228,51 @@ class TestTSDataset(TestCase):
         finally:
             shutil.rmtree(temp)
 
+    @op_torch
+    @op_diff_set_all
+    def test_tsdataset_from_parquet_filter_and_chunk(self):
+        df = get_multi_id_ts_df()
+        df["useless"] = 0
+        configs = dict(dt_col="datetime",
+                       target_col="value",
+                       extra_feature_col=["extra feature"],
+                       id_col="id")
+
+        temp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp, "test.parquet")
+            df.to_parquet(path, row_group_size=10)
+
+            tsdata = TSDataset.from_parquet(path, start_time="2019-01-05",
+                                            end_time="2019-01-20", ids=["01"], **configs)
+            expected = df[(df["id"] == "01") & (df["datetime"] >= "2019-01-05") &
+                          (df["datetime"] <= "2019-01-20")].drop(columns="useless")
+            expected = expected.reset_index(drop=True)
+            pd.testing.assert_frame_equal(tsdata.to_pandas(),
+                                          TSDataset.from_pandas(expected, **configs).to_pandas(),
+                                          check_like=True)
+
+            tsdatas = TSDataset.from_parquet(path, end_time="2019-01-10",
+                                             ids_per_chunk=1, **configs)
+            tsdatas = list(tsdatas)
+            assert len(tsdatas) == 2
+            for tsdata, id in zip(tsdatas, ["00", "01"]):
+                assert tsdata._id_list == [id]
+                assert len(tsdata.to_pandas()) == 10
+                assert "useless" not in tsdata.to_pandas().columns
+
+            tsdatas = TSDataset.from_parquet(path, ids_per_chunk=2, with_split=True,
+                                             val_ratio=0.1, test_ratio=0.1, **configs)
+            train, val, test = next(tsdatas)
+            assert train._id_list == ["00", "01"]
+            assert len(train.to_pandas()) == 80
+
+            with pytest.raises(RuntimeError):
+                TSDataset.from_parquet(path, dt_col="datetime", target_col="value",
+                                       ids=["00"])
+        finally:
+            shutil.rmtree(temp)
+
     @op_torch
     def test_tsdataset_initialization_multiple(self):
         df = get_multi_id_ts_df()
@@ -389,6 +434,34 @@ class TestTSDataset(TestCase):
 
         tsdata._check_basic_invariants()
 
+    @op_torch
+    def test_tsdataset_roll_strided(self):
+        horizon = random.randint(1, 10)
+        lookback = random.randint(1, 20)
+        for df in [get_ts_df(), get_multi_id_ts_df()]:
+            tsdata = TSDataset.from_pandas(df, dt_col="datetime", target_col="value",
+                                           extra_feature_col=["extra feature"],
+                                           id_col="id", repair=False)
+            for id_sensitive in [False, True]:
+                x, y = tsdata.roll(lookback=lookback, horizon=horizon,
+                                   id_sensitive=id_sensitive).to_numpy()
+                x_strided, y_strided = tsdata.roll(lookback=lookback, horizon=horizon,
+                                                   id_sensitive=id_sensitive,
+                                                   strided=True).to_numpy()
+                np.testing.assert_array_equal(x, x_strided)
+                np.testing.assert_array_equal(y, y_strided)
+                assert not x_strided.flags.writeable and not y_strided.flags.writeable
+                x_copy, y_copy = tsdata.to_numpy(copy=True)
+                assert x_copy.flags.writeable and y_copy.flags.writeable
+                np.testing.assert_array_equal(x, x_copy)
+
+        # single id without N/A is not copied
+        tsdata = TSDataset.from_pandas(get_ts_df(), dt_col="datetime", target_col="value",
+                                       extra_feature_col=["extra feature"], id_col="id")
+        x = tsdata.roll(lookback=lookback, horizon=0, strided=True).to_numpy()
+        assert not x.flags.owndata
+        tsdata._check_basic_invariants()
+
     @op_torch
     def test_tsdataset_roll_order(self):
         df = pd.DataFrame({"datetime": np.array(['1/1/2019', '1/1/2019', '1/2/2019', '1/2/2019']),
@@ -518,6 +591,34 @@ class TestTSDataset(TestCase):
         assert y_time.shape[1:] == (15, 3)
         assert x.shape[0] == y.shape[0] == x_time.shape[0] == y_time.shape[0] == len(df) - lookback + 1
 
+    @op_torch
+    def test_tsdataset_to_torch_loader_batch_fetch(self):
+        import torch
+        df = get_multi_id_ts_df()
+        horizon = random.randint(1, 10)
+        lookback = random.randint(1, 20)
+        tsdata = TSDataset.from_pandas(df, dt_col="datetime", target_col="value",
+                                       extra_feature_col=["extra feature"], id_col="id")
+        expected = None
+        for batch_fetch, num_workers in [(False, 0), (True, 0), (True, 2)]:
+            torch_loader = tsdata.to_torch_data_loader(batch_size=16,
+                                                       lookback=lookback,
+                                                       horizon=horizon,
+                                                       shuffle=False,
+                                                       num_workers=num_workers,
+                                                       batch_fetch=batch_fetch)
+            batches = list(torch_loader)
+            assert tuple(batches[0][0].size()) == (16, lookback, 2)
+            assert tuple(batches[0][1].size()) == (16, horizon, 1)
+            x = torch.cat([x_batch for x_batch, _ in batches]).numpy()
+            if expected is None:
+                expected = x
+            np.testing.assert_array_equal(x, expected)
+
+        torch_loader = tsdata.to_torch_data_loader(batch_size=16, lookback=lookback,
+                                                   horizon=0, batch_fetch=True)
+        assert tuple(next(iter(torch_loader)).size()) == (16, lookback, 2)
+
     @op_torch
     def test_tsdataset_to_torch_loader_roll(self):
         df_single_id = get_ts_df()
@@ -861,6 +962,31 @@ class TestTSDataset(TestCase):
 
         tsdata._check_basic_invariants()
 
+    @op_torch
+    def test_tsdataset_scale_incremental(self):
+        from sklearn.preprocessing import StandardScaler, MaxAbsScaler, MinMaxScaler, RobustScaler
+        df = get_ts_df()
+        for scaler_type in [StandardScaler, MaxAbsScaler, MinMaxScaler]:
+            expected = TSDataset.from_pandas(df, dt_col="datetime", target_col="value",
+                                             extra_feature_col=["extra feature"], id_col="id")
+            expected.scale(scaler_type())
+            scaler = scaler_type()
+            for chunk in [df[:60], df[60:]]:
+                tsdata = TSDataset.from_pandas(chunk, dt_col="datetime", target_col="value",
+                                               extra_feature_col=["extra feature"], id_col="id")
+                tsdata.scale(scaler, incremental=True)
+            # the scaler fitted on chunks is the same as on the whole data
+            assert scaler.n_samples_seen_ == len(df)
+            tsdata = TSDataset.from_pandas(df, dt_col="datetime", target_col="value",
+                                           extra_feature_col=["extra feature"], id_col="id")
+            tsdata.scale(scaler, fit=False)
+            assert_frame_equal(tsdata.to_pandas(), expected.to_pandas())
+
+        tsdata = TSDataset.from_pandas(df, dt_col="datetime", target_col="value",
+                                       extra_feature_col=["extra feature"], id_col="id")
+        with pytest.raises(RuntimeError):
+            tsdata.scale(RobustScaler(), incremental=True)
+
     @op_torch
     def test_tsdataset_unscale_numpy(self):
         df = get_multi_id_ts_df()
@@ -1203,6 +1329,32 @@ class TestTSDataset(TestCase):
         # not meaningful, but no error should be raised.
         tsdata.get_cycle_length(aggregate='min', top_k=3)
 
+    @op_torch
+    @op_diff_set_all
+    def test_cycle_length_cache_and_sample(self):
+        t = np.arange(100)
+        df = pd.DataFrame({"datetime": np.tile(pd.date_range('1/1/2019', periods=100), 10),
+                           "value": np.concatenate([np.sin(2 * np.pi * t / (5 + i % 2))
+                                                    for i in range(10)]),
+                           "id": np.repeat([f"{i:02d}" for i in range(10)], 100)})
+        tsdata = TSDataset.from_pandas(df, target_col='value', dt_col='datetime', id_col='id')
+        assert tsdata.get_cycle_length(aggregate='min') == 5
+        assert tsdata.get_cycle_length(aggregate='max') == 6
+        assert tsdata.get_cycle_length(aggregate='max', max_ids=1) in (5, 6)
+        assert len(tsdata._cycle_length_cache) == 3
+
+        # the cached result is used if the data is not changed
+        tsdata._cycle_length_cache[('mode', 3, None)] = 7
+        tsdata.roll(lookback='auto', horizon=1)
+        assert tsdata.lookback == 7
+        tsdata.impute()
+        assert len(tsdata._cycle_length_cache) == 0
+        tsdata.roll(lookback='auto', horizon=1)
+        assert tsdata.lookback in (5, 6)
+
+        with pytest.raises(RuntimeError):
+            tsdata.get_cycle_length(max_ids=0)
+
     @op_torch
     def test_lookback_equal_to_one(self):
         df = get_ts_df()
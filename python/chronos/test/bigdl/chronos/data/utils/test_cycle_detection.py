@@ -19,7 +19,8 @@ import pandas as pd
 import numpy as np
 
 from unittest import TestCase
-from bigdl.chronos.data.utils.cycle_detection import cycle_length_est
+from bigdl.chronos.data.utils.cycle_detection import cycle_length_est, \
+    cycle_length_est_batch
 
 from ... import op_torch, op_tf2, op_diff_set_all
 
@@ -37,3 +38,23 @@ class TestCycleDetectionTimeSeries(TestCase):
         data = np.random.randn(100)
         cycle_length = cycle_length_est(data)
         assert 1 <= cycle_length <= 100
+
+    @op_torch
+    @op_tf2
+    @op_diff_set_all
+    def test_cycle_detection_batch(self):
+        data = []
+        for length in [100, 101, 100, 300]:
+            t = np.arange(length)
+            data.append(np.sin(2 * np.pi * t / np.random.randint(3, 30)) +
+                        np.random.randn(length))
+        data.append(np.ones(100))
+        for top_k in [2, 3, 5]:
+            for adjust in [False, True]:
+                expected = [cycle_length_est(x, top_k, adjust) for x in data]
+                np.testing.assert_array_equal(cycle_length_est_batch(data, top_k, adjust),
+                                              expected)
+        np.testing.assert_array_equal(cycle_length_est_batch(np.stack(data[:1] * 2)),
+                                      [cycle_length_est(data[0])] * 2)
+        with pytest.raises(RuntimeError):
+            cycle_length_est_batch(data, top_k=50)
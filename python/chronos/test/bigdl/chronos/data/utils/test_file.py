@@ -16,7 +16,7 @@
 import os
 import shutil
 import tempfile
-from bigdl.chronos.data.utils.file import parquet2pd
+from bigdl.chronos.data.utils.file import parquet2pd, parquet_filters, iter_parquet2pd
 import pandas as pd
 import numpy as np
 from ... import op_torch, op_tf2, op_diff_set_all
@@ -46,3 +46,36 @@ class TestFile:
             pd.testing.assert_frame_equal(df, df_from_parquet)
         finally:
             shutil.rmtree(temp)
+
+    @op_diff_set_all
+    def test_parquet_filters(self):
+        assert parquet_filters("datetime", "id") is None
+        assert parquet_filters("datetime", "id", start_time="2019-01-02", ids=["00"]) == \
+            [("datetime", ">=", pd.Timestamp("2019-01-02")), ("id", "in", ["00"])]
+        assert parquet_filters("datetime", "id", ids=["00"], filters=[("value", ">", 0)]) == \
+            [("value", ">", 0), ("id", "in", ["00"])]
+        assert parquet_filters("datetime", "id", ids=["00"],
+                               filters=[[("value", ">", 0)], [("value", "<", -1)]]) == \
+            [[("value", ">", 0), ("id", "in", ["00"])],
+             [("value", "<", -1), ("id", "in", ["00"])]]
+
+    @op_diff_set_all
+    def test_iter_parquet2pd_local(self):
+        temp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp, "test.parquet")
+            df = get_ts_df()
+            df["id"] = np.arange(len(df)) % 3
+            df.to_parquet(path)
+            filters = parquet_filters("datetime", "id", end_time="2019-01-31")
+            dfs = list(iter_parquet2pd(path, "id", columns=["id", "value"], filters=filters,
+                                       ids_per_chunk=2))
+            assert len(dfs) == 2
+            assert list(dfs[0].columns) == ["id", "value"]
+            assert set(dfs[0]["id"]) == {0, 1} and set(dfs[1]["id"]) == {2}
+            expected = df[df["datetime"] <= "2019-01-31"]
+            assert sum(len(d) for d in dfs) == len(expected)
+            dfs = list(iter_parquet2pd(path, "id", ids=[2, 1], ids_per_chunk=1))
+            pd.testing.assert_frame_equal(dfs[0], df[df["id"] == 2].reset_index(drop=True))
+        finally:
+            shutil.rmtree(temp)
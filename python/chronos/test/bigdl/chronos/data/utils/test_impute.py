@@ -90,3 +90,18 @@ class TestImputeTimeSeries(TestCase):
         res_df = _linear_impute_timeseries_dataframe(df)
         assert res_df['data'][0] == 1
         assert res_df['data'][2] == 1.5
+
+    def test_impute_timeseries_dataframe_by_id(self):
+        df = pd.DataFrame({"data": [np.nan, 1, np.nan, np.nan, 2, np.nan, 4, np.nan],
+                           "id": ["b", "b", "a", "a", "b", "a", "a", "b"]})
+        df["datetime"] = pd.date_range('1/1/2019', periods=8)
+        res_df = impute_timeseries_dataframe(df, dt_col="datetime", mode="last", id_col="id")
+        assert list(res_df["id"]) == ["a"] * 4 + ["b"] * 4
+        np.testing.assert_array_equal(res_df["data"], [0, 0, 0, 4, 0, 1, 2, 2])
+        res_df = impute_timeseries_dataframe(df, dt_col="datetime", mode="linear", id_col="id")
+        np.testing.assert_array_equal(res_df["data"], [4, 4, 4, 4, 1, 1, 2, 2])
+        for mode in ["last", "const"]:
+            res_df = impute_timeseries_dataframe(self.df, dt_col="datetime", mode=mode)
+            res_by_id = impute_timeseries_dataframe(self.df.assign(id=0), dt_col="datetime",
+                                                    mode=mode, id_col="id")
+            pd.testing.assert_frame_equal(res_by_id.drop(columns="id"), res_df)
@@ -164,3 +164,35 @@ class TestResampleTimeSeries(TestCase):
             interval="2ms",
             merge_mode='max')
         assert len(res_df) == 3 and res_df['data'].isna().sum() == 0
+
+    def test_resample_timeseries_dataframe_by_id(self):
+        df = pd.DataFrame({"data": [1, 2, 3, 4, 5, 6],
+                           "id": ["b", "b", "a", "a", "b", "a"],
+                           "datetime": pd.to_datetime(["2020-11-09T08", "2020-11-09T09",
+                                                       "2020-11-09T10", "2020-11-09T13",
+                                                       "2020-11-09T11", "2020-11-09T14"])})
+        for merge_mode in ["max", "min", "mean", "sum"]:
+            res_df = resample_timeseries_dataframe(df, dt_col="datetime", interval="2H",
+                                                   id_col="id", merge_mode=merge_mode)
+            # resample each group without id_col, and attach the id afterwards
+            expect = []
+            for id_, group in df.groupby("id"):
+                group_df = resample_timeseries_dataframe(group, dt_col="datetime",
+                                                         interval="2H", merge_mode=merge_mode)
+                group_df["id"] = id_
+                expect.append(group_df)
+            expect = pd.concat(expect).reset_index(drop=True)
+            pd.testing.assert_frame_equal(res_df, expect)
+        assert list(res_df["id"]) == ["a"] * 3 + ["b"] * 2
+        np.testing.assert_array_equal(res_df["data"], [3, 4, 6, 3, 5])
+        res_df = resample_timeseries_dataframe(df, dt_col="datetime", interval="2H",
+                                               start_time="2020-11-09T07",
+                                               end_time="2020-11-09T11",
+                                               id_col="id", merge_mode="max")
+        assert len(res_df) == 6
+        assert np.isnan(res_df["data"][0]) and res_df["data"][4] == 2
+        with pytest.raises(RuntimeError):
+            resample_timeseries_dataframe(df, dt_col="datetime", interval="2H",
+                                          start_time="2020-11-09T12",
+                                          end_time="2020-11-09T11",
+                                          id_col="id", merge_mode="max")
@@ -92,3 +92,29 @@ class TestRollTimeSeries(TestCase):
                                          target_col=["B", "C"])
         assert x.shape == (6, 2, 3)
         assert y.shape == (6, 2, 2)
+
+    def test_roll_timeseries_dataframe_strided(self):
+        df = self.easy_data.copy()
+        for horizon in [0, [1, 3], 4]:
+            for label_len in [0, 1]:
+                if isinstance(horizon, list) and label_len > 0:
+                    continue
+                kwargs = dict(lookback=self.lookback, horizon=horizon, label_len=label_len,
+                              feature_col=["A", "C"], target_col=["B"])
+                x, y = roll_timeseries_dataframe(df, None, **kwargs)
+                x_strided, y_strided = roll_timeseries_dataframe(df, None, strided=True,
+                                                                 **kwargs)
+                np.testing.assert_array_equal(x, x_strided)
+                assert not x_strided.flags.writeable and not x_strided.flags.owndata
+                if y is not None:
+                    np.testing.assert_array_equal(y, y_strided)
+
+        df.loc[3, "A"] = np.nan
+        x, y = roll_timeseries_dataframe(df, None, lookback=2, horizon=1,
+                                         feature_col=["A", "C"], target_col=["B"])
+        x_strided, y_strided = roll_timeseries_dataframe(df, None, lookback=2, horizon=1,
+                                                         feature_col=["A", "C"],
+                                                         target_col=["B"], strided=True)
+        assert x_strided.shape == (6, 2, 3)
+        np.testing.assert_array_equal(x, x_strided)
+        np.testing.assert_array_equal(y, y_strided)
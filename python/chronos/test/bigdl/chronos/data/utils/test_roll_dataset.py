@@ -74,6 +74,13 @@ class TestRollDataset:
                                    id_col=tsdata.id_col)
 
         assert len(roll_dataset) == len(x)
+        # fetch all the samples at once
+        if horizon != 0:
+            roll_dataset_x, roll_dataset_y = roll_dataset[list(range(len(x)))]
+            np.testing.assert_array_almost_equal(y, roll_dataset_y.detach().numpy())
+        else:
+            roll_dataset_x = roll_dataset[list(range(len(x)))]
+        np.testing.assert_array_almost_equal(x, roll_dataset_x.detach().numpy())
         for i in range(len(x)):
             if horizon != 0:
                 # for train and y is not None.
@@ -19,8 +19,8 @@ import pandas as pd
 import numpy as np
 
 from unittest import TestCase
-from sklearn.preprocessing import StandardScaler
-from bigdl.chronos.data.utils.scale import _standard_scaler_scale_timeseries_numpy
+from sklearn.preprocessing import StandardScaler, MaxAbsScaler, MinMaxScaler, RobustScaler
+from bigdl.chronos.data.utils.scale import _standard_scaler_scale_timeseries_numpy, merge_scaler
 from numpy.testing import assert_array_almost_equal
 
 from ... import op_torch, op_tf2, op_diff_set_all
@@ -54,3 +54,40 @@ class TestScaleNumpy(TestCase):
         scaled_data_numpy = \
             _standard_scaler_scale_timeseries_numpy(df[col_list].values, scaler)
         assert_array_almost_equal(scaled_data_scaler, scaled_data_numpy)
+
+    @op_torch
+    @op_tf2
+    @op_diff_set_all
+    def test_merge_scaler(self):
+        df = get_ts_df()
+        col_list = ["value", "extra feature"]
+        df.loc[3, "value"] = 0
+        parts = [df[col_list][:50], df[col_list][50:51], df[col_list][51:]]
+        for scaler in [StandardScaler(), StandardScaler(with_mean=False),
+                       StandardScaler(with_std=False), MaxAbsScaler(),
+                       MinMaxScaler(feature_range=(-1, 2))]:
+            whole = scaler.fit(df[col_list])
+            expected = whole.transform(df[col_list])
+            part_scalers = [type(scaler)(**scaler.get_params()).fit(part) for part in parts]
+            merged = merge_scaler(part_scalers)
+            assert_array_almost_equal(merged.transform(df[col_list]), expected)
+            assert_array_almost_equal(merged.inverse_transform(expected), df[col_list].values)
+            assert merged.n_samples_seen_ == len(df)
+            # the input scalers are not changed
+            assert part_scalers[0].n_samples_seen_ == 50
+
+    @op_torch
+    @op_tf2
+    @op_diff_set_all
+    def test_merge_scaler_corner_cases(self):
+        df = get_ts_df()
+        col_list = ["value", "extra feature"]
+        robust = RobustScaler().fit(df[col_list])
+        assert_array_almost_equal(merge_scaler([robust]).center_, robust.center_)
+        with pytest.raises(RuntimeError):
+            merge_scaler([])
+        with pytest.raises(RuntimeError):
+            merge_scaler([robust, RobustScaler().fit(df[col_list])])
+        with pytest.raises(RuntimeError):
+            merge_scaler([StandardScaler().fit(df[col_list]),
+                          MinMaxScaler().fit(df[col_list])])
@@ -57,6 +57,32 @@ class TestAEDetector(TestCase):
         anomaly_indexes = ad.anomaly_indexes()
         assert len(anomaly_indexes) == int(ad.ratio * len(y))
 
+    @op_torch
+    def test_ae_score_update_pytorch(self):
+        y = self.create_data()
+        ad = AEDetector(roll_len=314, backend="torch", epochs=20)
+        ad.fit(y[:2000])
+        train_scores = ad.score()
+        assert len(train_scores) == 2000
+        new_scores = [ad.score_update(y[i:i + 100]) for i in range(2000, len(y), 100)]
+        assert all(len(s) == 100 for s in new_scores[:-1])
+        scores = ad.score()
+        assert len(scores) == len(y)
+        np.testing.assert_array_equal(scores[:2000], train_scores)
+        np.testing.assert_array_equal(scores[2000:], np.concatenate(new_scores))
+        np.testing.assert_array_equal(ad.buffer, y[-313:])
+        # the last chunk gets the same scores as if all new samples were in one chunk,
+        # as all the windows covering them end in the last chunk
+        ad2 = AEDetector(roll_len=314, backend="torch")
+        ad2.ae_model, ad2.scaler = ad.ae_model, ad.scaler
+        ad2.anomaly_scores_, ad2.score_range = np.zeros(0), ad.score_range
+        ad2.buffer = y[:313]
+        scores = ad2.score_update(y[313:])
+        last = len(new_scores[-1])
+        np.testing.assert_allclose(scores[-last:], new_scores[-1], rtol=1e-5)
+        with pytest.raises(RuntimeError):
+            AEDetector(roll_len=314, backend="torch").score_update(y)
+
     @op_tf2
     def test_ae_fit_score_unrolled(self):
         y = self.create_data()
@@ -53,12 +53,31 @@ class TestDBScanDetector(TestCase):
         # so the detected anomalies is probably more than the actual ones
         assert len(anomaly_indexes) >= 4
 
+    def test_dbscan_score_update(self):
+        y = self.create_data()
+        ad = DBScanDetector(eps=0.1, min_samples=6)
+        ad.fit(y)
+        fit_scores = ad.score().copy()
+        fit_indexes = ad.anomaly_indexes().copy()
+        # samples of fit are noise iff there is no core sample within eps
+        new_scores = ad.score_update(y[:10])
+        np.testing.assert_array_equal(new_scores, fit_scores[:10])
+        new_scores = ad.score_update(np.array([0.0, 20.0]))
+        np.testing.assert_array_equal(new_scores, [0, 1])
+        assert len(ad.score()) == len(y) + 12
+        np.testing.assert_array_equal(ad.anomaly_indexes(),
+                                      np.concatenate([fit_indexes,
+                                                      fit_indexes[fit_indexes < 10] + len(y),
+                                                      [len(y) + 11]]))
+
     def test_corner_cases(self):
         ad = DBScanDetector(eps=0.1, min_samples=6)
         with pytest.raises(RuntimeError):
             ad.score()
         with pytest.raises(RuntimeError):
             ad.anomaly_indexes()
+        with pytest.raises(RuntimeError):
+            ad.score_update(np.zeros(3))
         y = self.create_data()
         y = y[:-1].reshape(2, -1)
         with pytest.raises(RuntimeError):
@@ -155,6 +155,41 @@ class TestThresholdDetector(TestCase):
         from scipy.stats import norm
         assert abs(td.th - (norm.ppf(1 - ratio) * sigma + mu)) < 0.04
 
+    def test_abs_dist_batch(self):
+        from bigdl.chronos.detector.anomaly.th_detector import Distance, EuclideanDistance
+
+        class ManhattanDistance(Distance):
+            def abs_dist(self, x, y):
+                return np.sum(np.abs(x - y))
+
+        y = np.random.randn(100, 3, 2)
+        y_pred = np.random.randn(100, 3, 2)
+        for dist_measure in [EuclideanDistance(), ManhattanDistance()]:
+            dist = dist_measure.abs_dist_batch(y, y_pred)
+            assert dist.shape == (100,)
+            np.testing.assert_allclose(dist, [dist_measure.abs_dist(m, n)
+                                              for m, n in zip(y, y_pred)])
+
+    def test_score_update(self):
+        y = np.random.randn(200, 3)
+        y_pred = y + np.random.randn(200, 3) * 0.1
+        y[[10, 150]] += 10
+
+        td = ThresholdDetector()
+        td.set_params(threshold=3)
+        td.fit(y[:100], y_pred[:100])
+        new_scores = td.score_update(y[100:], y_pred[100:])
+        assert new_scores.shape == (100, 3)
+        np.testing.assert_array_equal(td.anomaly_indexes(), [10, 150])
+        assert td.score().shape == (200, 3)
+
+        td = ThresholdDetector()
+        td.set_params(threshold=(-5, 5))
+        for i in range(0, 200, 50):
+            td.score_update(y[i:i + 50])
+        assert td.anomaly_indexes() == [10, 150]
+        np.testing.assert_array_equal(td.score(), td.score(y))
+
     def test_corner_cases(self):
         td = ThresholdDetector()
         with pytest.raises(RuntimeError):
@@ -119,3 +119,33 @@ class TestChronosModelARIMAForecaster(TestCase):
 
         with pytest.raises(RuntimeError):
             forecaster.fit(data, validation_data.reshape(-1, 1))
+
+    def test_arima_forecaster_multi_series(self):
+        from bigdl.chronos.data import TSDataset
+        import pandas as pd
+        df = pd.DataFrame({"datetime": np.tile(pd.date_range('20130101', periods=100), 3),
+                           "value": np.random.rand(300),
+                           "id": np.repeat(["00", "01", "02"], 100)})
+        # a series of missing values fails to fit
+        df = pd.concat([df, pd.DataFrame({"datetime": pd.date_range('20130101', periods=20),
+                                          "value": np.nan, "id": "03"})])
+        train, _, test = TSDataset.from_pandas(df, dt_col="datetime", target_col="value",
+                                               id_col="id", with_split=True, test_ratio=0.1)
+        forecaster = ARIMAForecaster(p=2, q=2, seasonality_mode=False)
+        train_loss = forecaster.fit(train, test, num_workers=2)
+        assert set(train_loss) | set(forecaster.failed_series) == {"00", "01", "02", "03"}
+        assert "03" in forecaster.failed_series
+        pred = forecaster.predict(10, num_workers=2)
+        assert set(pred) == set(train_loss)
+        assert all(len(v) == 10 for v in pred.values())
+        test_mse = forecaster.evaluate(test, num_workers=1)
+        assert set(test_mse) == set(train_loss)
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            ckpt_name = os.path.join(tmp_dir_name, "pkl")
+            forecaster.save(ckpt_name)
+            restored = ARIMAForecaster()
+            restored.restore(ckpt_name)
+        pred_restore = restored.predict(10, num_workers=1)
+        for id_ in pred:
+            np.testing.assert_almost_equal(pred[id_], pred_restore[id_])
@@ -60,6 +60,39 @@ class TestChronosModelProphetForecaster(TestCase):
             assert test_pred.shape[0] == validation_data.shape[0]
             test_mse = forecaster.evaluate(validation_data)
 
+    def test_prophet_forecaster_multi_series(self):
+        from bigdl.chronos.data import TSDataset
+        df = pd.DataFrame({"datetime": np.tile(pd.date_range('20130101', periods=100), 3),
+                           "value": np.random.rand(300),
+                           "id": np.repeat(["00", "01", "02"], 100)})
+        # a series of 1 point fails to fit
+        df = pd.concat([df, pd.DataFrame({"datetime": pd.date_range('20130101', periods=1),
+                                          "value": [1.0], "id": "03"})])
+        forecaster = ProphetForecaster()
+        train_loss = forecaster.fit(TSDataset.from_pandas(df, dt_col="datetime",
+                                                          target_col="value", id_col="id"),
+                                    num_workers=2)
+        assert set(train_loss) == {"00", "01", "02"}
+        assert set(forecaster.failed_series) == {"03"}
+        pred = forecaster.predict(horizon=5, num_workers=2)
+        assert set(pred) == {"00", "01", "02"}
+        assert all(v.shape[0] == 5 for v in pred.values())
+        test_df = pd.DataFrame({"datetime": np.tile(pd.date_range('20130411', periods=5), 3),
+                                "value": np.random.rand(15),
+                                "id": np.repeat(["00", "01", "02"], 5)})
+        test_mse = forecaster.evaluate(TSDataset.from_pandas(test_df, dt_col="datetime",
+                                                             target_col="value", id_col="id"))
+        assert set(test_mse) == {"00", "01", "02"}
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            ckpt_name = os.path.join(tmp_dir_name, "json")
+            forecaster.save(ckpt_name)
+            restored = ProphetForecaster()
+            restored.restore(ckpt_name)
+        pred_restore = restored.predict(horizon=5, num_workers=1)
+        for id_ in pred:
+            np.testing.assert_almost_equal(pred[id_].yhat.values, pred_restore[id_].yhat.values)
+
     def test_prophet_forecaster_save_restore(self):
         data, validation_data = create_data()
         forecaster = ProphetForecaster(changepoint_prior_scale=0.05,
@@ -135,6 +135,42 @@ class TestChronosModelTCNForecaster(TestCase):
         test_mse = forecaster.evaluate(test_data, acceleration=False)
         assert test_mse[0].shape == test_data[1].shape[1:]
 
+    def test_tcn_forecaster_predict_latest(self):
+        train_data, _, _ = create_data()
+        forecaster = TCNForecaster(past_seq_len=24,
+                                   future_seq_len=5,
+                                   input_feature_num=1,
+                                   output_feature_num=1,
+                                   kernel_size=4,
+                                   num_channels=[16, 16],
+                                   lr=0.01)
+        forecaster.fit(train_data, epochs=1)
+        series = np.random.rand(60, 1).astype(np.float32)
+        with pytest.raises(RuntimeError):
+            forecaster.predict_latest(series[:10], id="a")
+        end = 10
+        for num in [20, 1, 3, 26]:
+            yhat = forecaster.predict_latest(series[end: end + num], id="a")
+            end += num
+            expected = forecaster.predict(series[None, end - 24: end], acceleration=False)
+            np.testing.assert_allclose(yhat, expected[0], rtol=1e-5, atol=1e-6)
+        with pytest.raises(RuntimeError):
+            forecaster.predict_latest(series[:, :0], id="a")
+
+        train, test = create_tsdataset(roll=False)
+        forecaster = TCNForecaster.from_tsdataset(train, past_seq_len=24, future_seq_len=5,
+                                                  num_channels=[16]*3)
+        forecaster.fit(train, epochs=1)
+        yhat = forecaster.predict_latest(test)
+        x = test.df[test.target_col].values[None, -24:].astype(np.float32)
+        np.testing.assert_allclose(yhat, forecaster.predict(x, acceleration=False),
+                                   rtol=1e-5, atol=1e-6)
+        new_points = np.random.rand(1, 2).astype(np.float32)
+        yhat = forecaster.predict_latest(new_points, id="0")
+        x = np.concatenate([x[:, 1:], new_points[None]], axis=1)
+        np.testing.assert_allclose(yhat, forecaster.predict(x, acceleration=False)[0],
+                                   rtol=1e-5, atol=1e-6)
+
     @op_diff_set_all
     @op_inference
     def test_tcn_forecaster_fit_loader(self):
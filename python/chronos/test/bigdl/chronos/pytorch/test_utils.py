@@ -0,0 +1,109 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from bigdl.chronos.utils import LazyImport
+torch = LazyImport('torch')
+utils = LazyImport('bigdl.chronos.pytorch.utils')
+
+import numpy as np
+import pytest
+from unittest import TestCase
+
+from .. import op_torch
+
+
+class CountingModel:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, x):
+        self.batch_sizes.append(x.shape[0])
+        return x.sum(dim=-1, keepdim=True) * 2
+
+
+@op_torch
+class TestPytorchUtils(TestCase):
+    def setUp(self):
+        self.x = np.random.randn(105, 7, 3).astype(np.float32)
+        self.y = self.x.sum(axis=-1, keepdims=True) * 2
+
+    def tearDown(self):
+        pass
+
+    def test_inference_numpy(self):
+        for batch_size in [None, 10, 105, 200]:
+            model = CountingModel()
+            yhat = utils._pytorch_fashion_inference(model, self.x, batch_size=batch_size)
+            np.testing.assert_allclose(yhat, self.y, rtol=1e-5)
+            assert sum(model.batch_sizes) == 105
+        assert model.batch_sizes == [105]
+
+    def test_inference_dataloader(self):
+        from torch.utils.data import DataLoader, TensorDataset
+        dataset = TensorDataset(torch.from_numpy(self.x), torch.from_numpy(self.y))
+        for prefetch in [0, 2]:
+            for batch_size in [None, 16, 40]:
+                model = CountingModel()
+                loader = DataLoader(dataset, batch_size=32)
+                yhat = utils._pytorch_fashion_inference(model, loader, batch_size=batch_size,
+                                                        prefetch=prefetch)
+                np.testing.assert_allclose(yhat, self.y, rtol=1e-5)
+                # the loader is consumed batch by batch
+                assert max(model.batch_sizes) == min(32, batch_size or 32)
+
+        # the number of samples is less than len(dataset)
+        loader = DataLoader(dataset, batch_size=32, drop_last=True)
+        yhat = utils._pytorch_fashion_inference(CountingModel(), loader)
+        np.testing.assert_allclose(yhat, self.y[:96], rtol=1e-5)
+        # the number of samples is more than len(dataset)
+        from torch.utils.data import RandomSampler
+        loader = DataLoader(dataset, batch_size=None,
+                            sampler=torch.utils.data.BatchSampler(
+                                RandomSampler(dataset, replacement=True, num_samples=300),
+                                batch_size=32, drop_last=False))
+        assert len(utils._pytorch_fashion_inference(CountingModel(), loader)) == 300
+
+    def test_inference_iterable_dataloader(self):
+        from torch.utils.data import DataLoader, IterableDataset
+        x, y = torch.from_numpy(self.x), torch.from_numpy(self.y)
+
+        class Samples(IterableDataset):
+            def __init__(self, batch_size=None):
+                self.batch_size = batch_size
+
+            def __iter__(self):
+                if self.batch_size is None:
+                    return zip(x, y)
+                # already batched samples
+                return ((x[i: i + self.batch_size], y[i: i + self.batch_size])
+                        for i in range(0, len(x), self.batch_size))
+
+        # the number of samples is unknown
+        for loader in [DataLoader(Samples(), batch_size=32),
+                       DataLoader(Samples(batch_size=32), batch_size=None)]:
+            for prefetch in [0, 2]:
+                yhat = utils._pytorch_fashion_inference(CountingModel(), loader,
+                                                        prefetch=prefetch)
+                np.testing.assert_allclose(yhat, self.y, rtol=1e-5)
+
+    def test_prefetch_error(self):
+        def batches():
+            yield torch.ones(2, 1)
+            raise ValueError("bad batch")
+
+        with pytest.raises(ValueError):
+            list(utils._prefetch(batches(), 2))
+        assert list(utils._prefetch(range(10), 1)) == list(range(10))
@@ -15,6 +15,11 @@
 #
 
 
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future
 from typing import Union, List
 
 import torch
@@ -22,42 +27,372 @@ from torch.utils.data.dataloader import DataLoader
 
 from bigdl.nano.utils.log4Error import invalidInputError, invalidOperationError
 
+_ALIGNMENT = 64
+# number of batches which could be in flight on a process at a time
+_NUM_SLOTS = 2
+_STOP = object()
+# seconds between checks of dead processes
+_CHECK_INTERVAL = 1
+
+
+class _SharedTensor:
+    """Reference to a tensor packed in a shared memory buffer."""
+    __slots__ = ("offset", "nbytes", "shape", "dtype")
+
+    def __init__(self, offset, nbytes, shape, dtype):
+        self.offset = offset
+        self.nbytes = nbytes
+        self.shape = shape
+        self.dtype = dtype
+
+
+def _packed_size(data):
+    """
+    :return: bytes needed to pack data, a tensor or a tuple/list of tensors,
+             None if data could not be packed.
+    """
+    tensors = data if isinstance(data, (tuple, list)) else (data,)
+    size = 0
+    for t in tensors:
+        if not isinstance(t, torch.Tensor) or t.device.type != "cpu":
+            return None
+        size += -(-t.numel() * t.element_size() // _ALIGNMENT) * _ALIGNMENT
+    return size
+
+
+def _pack(data, buffer):
+    """
+    Copy the tensors of data to a uint8 shared memory buffer.
+
+    :return: data with tensors replaced by _SharedTensor.
+    """
+    def pack(t, offset):
+        nbytes = t.numel() * t.element_size()
+        buffer[offset:offset + nbytes].view(t.dtype).view(t.shape).copy_(t)
+        return _SharedTensor(offset, nbytes, tuple(t.shape), t.dtype), \
+            offset + -(-nbytes // _ALIGNMENT) * _ALIGNMENT
+
+    if isinstance(data, (tuple, list)):
+        packed, offset = [], 0
+        for t in data:
+            ref, offset = pack(t, offset)
+            packed.append(ref)
+        return type(data)(packed)
+    return pack(data, 0)[0]
+
+
+def _unpack(data, buffer, copy=False):
+    """
+    :return: data with _SharedTensor replaced by tensors viewed from buffer, or
+             copied from buffer if copy is True.
+    """
+    def unpack(ref):
+        if not isinstance(ref, _SharedTensor):
+            return ref
+        t = buffer[ref.offset:ref.offset + ref.nbytes].view(ref.dtype).view(ref.shape)
+        return t.clone() if copy else t
+
+    if isinstance(data, (tuple, list)):
+        return type(data)(unpack(ref) for ref in data)
+    return unpack(data)
+
+
+def _split(output, sizes):
+    """Split output of a merged batch to the outputs of requests by sizes of dim 0."""
+    if len(sizes) == 1:
+        return [output]
+    if isinstance(output, torch.Tensor):
+        return list(torch.split(output, sizes))
+    if isinstance(output, (tuple, list)) and all(isinstance(o, torch.Tensor) for o in output):
+        return [type(output)(o) for o in zip(*(torch.split(o, sizes) for o in output))]
+    invalidOperationError(False, f"Can't split output of type {type(output)} to requests, "
+                                 "please set max_batch_size to 1.")
+
+
+class _Request:
+    __slots__ = ("args", "future", "mergeable")
+
+    def __init__(self, args, future, mergeable):
+        self.args = args
+        self.future = future
+        self.mergeable = mergeable
+
 
 class _MultiInstanceModel(torch.nn.Module):
-    def __init__(self, model, ps, send_queues, recv_queues):
+    def __init__(self, model, ps, send_queues, recv_queue, max_batch_size=1, max_wait=0.01):
+        """
+        Serve a model in multiple processes. Samples submitted are merged into batches
+        of at most max_batch_size samples, a batch is dispatched to the process with
+        the fewest batches in flight, and tensors are transferred by shared memory
+        buffers reused across batches.
+
+        :param model: The model served.
+        :param ps: The processes running _multi_instance_helper.
+        :param send_queues: The queue of requests of each process.
+        :param recv_queue: The queue of outputs of all the processes.
+        :param max_batch_size: The max number of samples merged into a batch.
+        :param max_wait: The max seconds to wait for more samples to merge.
+        """
         super().__init__()
         self.model = model
         self.ps = ps
         self.p_num = len(ps)
         self.send_queues = send_queues
-        self.recv_queues = recv_queues
+        self.recv_queue = recv_queue
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self._requests = queue.Queue()
+        self._lock = threading.Condition()
+        self._batch_ids = itertools.count()
+        # batch id -> (process index, slot, requests, sizes of requests)
+        self._pending = {}
+        # free slots of each process, a slot holds the shared buffers of a batch
+        self._free_slots = [list(range(_NUM_SLOTS)) for _ in range(self.p_num)]
+        self._in_buffers = [[None] * _NUM_SLOTS for _ in range(self.p_num)]
+        self._out_buffers = [[None] * _NUM_SLOTS for _ in range(self.p_num)]
+        self._out_sizes = [[0] * _NUM_SLOTS for _ in range(self.p_num)]
+        self._closed = False
+
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+        self._collector = threading.Thread(target=self._collect_loop, daemon=True)
+        self._dispatcher.start()
+        self._collector.start()
 
     def forward(self, input_data: Union[DataLoader, List]) -> List:
-        if isinstance(input_data, (DataLoader, list)):
-            length = len(input_data)
-        else:
+        if not isinstance(input_data, (DataLoader, list)):
             invalidInputError(False, "The input should be a DataLoader or a list of input batchs")
 
-        for idx, batch in enumerate(input_data):
-            self.send_queues[idx % self.p_num].put(batch)
-
+        futures = [self._submit(batch, mergeable=False) for batch in input_data]
         outputs = []
-        for idx in range(length):
-            output = self.recv_queues[idx % self.p_num].get()
-            invalidOperationError(not isinstance(output, Exception), f"{output}")
-            outputs.append(output)
+        for future in futures:
+            exception = future.exception()
+            invalidOperationError(exception is None, f"{exception}")
+            outputs.append(future.result())
         return outputs
 
+    def submit(self, sample) -> Future:
+        """
+        Submit a sample to predict asynchronously, samples submitted at about the same
+        time are merged into a batch along dim 0.
+
+        :param sample: A tensor, or a tuple of tensors for a model with multiple inputs,
+               with batch dim, e.g. of shape (1, ...).
+        :return: A concurrent.futures.Future of the output of the sample.
+        """
+        args = sample if isinstance(sample, tuple) else (sample,)
+        mergeable = all(isinstance(t, torch.Tensor) and t.dim() > 0 for t in args)
+        return self._submit(sample, mergeable=mergeable)
+
+    def _submit(self, args, mergeable):
+        invalidOperationError(not self._closed, "The multi-instance model is shut down.")
+        future = Future()
+        self._requests.put(_Request(args, future, mergeable))
+        return future
+
+    def _dispatch_loop(self):
+        # the request which could not be merged into last batch
+        carry = None
+        while True:
+            request = carry if carry is not None else self._requests.get()
+            carry = None
+            if request is _STOP:
+                break
+            batch = [request]
+            if request.mergeable:
+                size = _sample_num(request.args)
+                deadline = time.monotonic() + self.max_wait
+                while size < self.max_batch_size:
+                    try:
+                        request = self._requests.get(timeout=max(deadline - time.monotonic(),
+                                                                 0))
+                    except queue.Empty:
+                        break
+                    if request is _STOP or not request.mergeable or \
+                            size + _sample_num(request.args) > self.max_batch_size:
+                        carry = request
+                        break
+                    batch.append(request)
+                    size += _sample_num(request.args)
+            self._dispatch_merged(batch)
+
+    def _dispatch_merged(self, batch):
+        if len(batch) == 1:
+            return self._dispatch(batch[0].args, batch, [_sample_num(batch[0].args)]
+                                  if batch[0].mergeable else None)
+        sizes = [_sample_num(r.args) for r in batch]
+        try:
+            if isinstance(batch[0].args, tuple):
+                args = tuple(torch.cat(ts) for ts in zip(*(r.args for r in batch)))
+            else:
+                args = torch.cat([r.args for r in batch])
+        except Exception:
+            # samples could not be merged, e.g. of different shapes
+            for r, size in zip(batch, sizes):
+                self._dispatch(r.args, [r], [size])
+            return
+        self._dispatch(args, batch, sizes)
+
+    def _dispatch(self, args, requests, sizes):
+        with self._lock:
+            # least loaded process with a free slot
+            while True:
+                alive = [i for i in range(self.p_num) if self.ps[i].is_alive()]
+                if not alive:
+                    for r in requests:
+                        r.future.set_exception(RuntimeError("All the processes exited."))
+                    return
+                idx = max(alive, key=lambda i: len(self._free_slots[i]))
+                if self._free_slots[idx]:
+                    break
+                self._lock.wait(1)
+            slot = self._free_slots[idx].pop()
+            batch_id = next(self._batch_ids)
+            self._pending[batch_id] = (idx, slot, requests, sizes)
+
+        new_buffers = None
+        needed = _packed_size(args)
+        in_buffer, out_buffer = self._in_buffers[idx][slot], self._out_buffers[idx][slot]
+        # buffers grow as needed, and are sent to the process only when replaced
+        if in_buffer is None or len(in_buffer) < (needed or 0):
+            in_buffer = torch.empty(needed or 0, dtype=torch.uint8).share_memory_()
+            self._in_buffers[idx][slot] = in_buffer
+            new_buffers = (in_buffer, out_buffer)
+        out_size = max(self._out_sizes[idx][slot], len(in_buffer))
+        if out_buffer is None or len(out_buffer) < out_size:
+            out_buffer = torch.empty(out_size, dtype=torch.uint8).share_memory_()
+            self._out_buffers[idx][slot] = out_buffer
+            new_buffers = (in_buffer, out_buffer)
+        if needed is not None:
+            args = _pack(args, in_buffer)
+        self.send_queues[idx].put((batch_id, slot, new_buffers, args))
+
+    def _collect_loop(self):
+        last_check = time.monotonic()
+        while True:
+            # check on a time basis, as live processes may keep the queue busy
+            if time.monotonic() - last_check >= _CHECK_INTERVAL:
+                self._check_processes()
+                last_check = time.monotonic()
+            try:
+                message = self.recv_queue.get(timeout=_CHECK_INTERVAL)
+            except queue.Empty:
+                continue
+            if message is None:
+                break
+            batch_id, output, out_size = message
+            with self._lock:
+                if batch_id not in self._pending:
+                    # failed by _check_processes already
+                    continue
+                idx, slot, requests, sizes = self._pending.pop(batch_id)
+            if not isinstance(output, Exception):
+                output = _unpack(output, self._out_buffers[idx][slot], copy=True)
+            with self._lock:
+                self._out_sizes[idx][slot] = max(self._out_sizes[idx][slot], out_size)
+                self._free_slots[idx].append(slot)
+                self._lock.notify_all()
+            _set_results(requests, sizes, output)
+
+    def _check_processes(self):
+        with self._lock:
+            dead = [batch_id for batch_id, (idx, _, _, _) in self._pending.items()
+                    if not self.ps[idx].is_alive()]
+            failed = [self._pending.pop(batch_id) for batch_id in dead]
+            self._lock.notify_all()
+        for idx, _, requests, _ in failed:
+            for r in requests:
+                r.future.set_exception(RuntimeError(f"Process {idx} exited unexpectedly "
+                                                    f"with code {self.ps[idx].exitcode}"))
+
+    def shutdown(self, wait=True, timeout=None):
+        """
+        Stop serving, and join the processes.
+
+        :param wait: Whether to wait for the submitted samples to finish before stopping
+               the processes.
+        :param timeout: The max seconds to wait for the processes to exit, the processes
+               are terminated after timeout.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if not wait:
+            while True:
+                try:
+                    request = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                request.future.set_exception(RuntimeError("The multi-instance model is "
+                                                          "shut down."))
+        self._requests.put(_STOP)
+        if wait:
+            self._dispatcher.join()
+            with self._lock:
+                # batches of dead processes are removed by _check_processes
+                while self._pending:
+                    self._lock.wait(1)
+        for q in self.send_queues:
+            q.put(None)
+        for p in self.ps:
+            p.join(timeout)
+            if p.is_alive():
+                p.terminate()
+                p.join()
+        self.recv_queue.put(None)
+        self._collector.join()
+        with self._lock:
+            pending, self._pending = list(self._pending.values()), {}
+        for _, _, requests, _ in pending:
+            for r in requests:
+                if not r.future.done():
+                    r.future.set_exception(RuntimeError("The multi-instance model is shut down."))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+
+def _sample_num(args):
+    return (args[0] if isinstance(args, tuple) else args).shape[0]
+
+
+def _set_results(requests, sizes, output):
+    if not isinstance(output, Exception) and sizes is not None:
+        try:
+            output = _split(output, sizes)
+        except Exception as e:
+            output = e
+    for i, r in enumerate(requests):
+        if isinstance(output, Exception):
+            r.future.set_exception(output)
+        else:
+            r.future.set_result(output[i] if sizes is not None else output)
+
 
 def _multi_instance_helper(model, recv_queue, send_queue):
+    # slot -> (input buffer, output buffer) shared with the main process
+    buffers = {}
     with torch.no_grad():
         while True:
+            message = recv_queue.get()
+            if message is None:
+                break
+            batch_id, slot, new_buffers, args = message
+            if new_buffers is not None:
+                buffers[slot] = new_buffers
+            in_buffer, out_buffer = buffers[slot]
             try:
-                args = recv_queue.get()
+                args = _unpack(args, in_buffer)
                 if isinstance(args, tuple):
                     output = model(*args)
                 else:
                     output = model(args)
-                send_queue.put(output)
+                out_size = _packed_size(output)
+                if out_size is not None and out_size <= len(out_buffer):
+                    output = _pack(output, out_buffer)
+                send_queue.put((batch_id, output, out_size or 0))
             except Exception as e:
-                send_queue.put(e)
+                send_queue.put((batch_id, e, 0))
@@ -14,6 +14,7 @@
 # limitations under the License.
 #
 
+import numpy as np
 import torch
 from torch import nn
 import time
@@ -25,6 +26,7 @@ from bigdl.nano.utils.inference.common.checker import available_acceleration_com
 from bigdl.nano.utils.inference.common.utils import AccelerationOption,\
     throughput_calculate_helper, format_optimize_result
 from bigdl.nano.utils.inference.common.base_optimizer import BaseInferenceOptimizer
+from bigdl.nano.utils.inference.common.cache import OptimizeResultCache, cpu_signature, digest
 from bigdl.nano.utils.log4Error import invalidInputError
 from bigdl.nano.pytorch.amp import BF16Model
 from bigdl.nano.deps.openvino.openvino_api import PytorchOpenVINOModel
@@ -32,7 +34,8 @@ from bigdl.nano.deps.ipex.ipex_api import PytorchIPEXJITModel, PytorchIPEXJITBF1
 from bigdl.nano.deps.onnxruntime.onnxruntime_api import PytorchONNXRuntimeModel
 from bigdl.nano.deps.neural_compressor.inc_api import quantize as inc_quantize
 from bigdl.nano.utils.inference.pytorch.model import AcceleratedLightningModule
-from bigdl.nano.utils.inference.pytorch.model_utils import get_forward_args, get_input_example
+from bigdl.nano.utils.inference.pytorch.model_utils import get_forward_args, get_input_example, \
+    get_model_signature, get_input_signature, get_weights_digest
 from bigdl.nano.utils.inference.pytorch.metrics import NanoMetric
 from bigdl.nano.utils.inference.pytorch.dataset import RepeatDataset, remove_batch_dim_fn
 from bigdl.nano.utils.inference.pytorch.dataloader import\
@@ -154,7 +157,9 @@ class InferenceOptimizer(BaseInferenceOptimizer):
                  logging: bool = False,
                  latency_sample_num: int = 100,
                  includes: Optional[List[str]] = None,
-                 excludes: Optional[List[str]] = None) -> None:
+                 excludes: Optional[List[str]] = None,
+                 cache_dir: Optional[str] = None,
+                 cache_model: bool = False) -> None:
         '''
         This function will give all available inference acceleration methods a try
         and record the latency, accuracy and model instance inside the Optimizer for
@@ -252,6 +257,17 @@ class InferenceOptimizer(BaseInferenceOptimizer):
                will be automatically add to includes.
         :param excludes: (optional) a list of acceleration methods that will be excluded from the
                search. "original" will be ignored in the excludes.
+        :param cache_dir: (optional) a directory to cache the latency/accuracy results.
+               The results are keyed by the model architecture, input shapes and dtypes,
+               thread_num, cpu model and instruction set flags, torch version and the search
+               options. If the same search was cached with the same weights, the results are
+               loaded instead of searching again, and the model of a method is only built when
+               it is obtained by get_model/get_best_model. Note that the metric and
+               validation_data are assumed to be the same as the cached search.
+               Default to None meaning no cache.
+        :param cache_model: whether to also save the model with minimum latency into
+               cache_dir, so that it is loaded instead of being built again from cache.
+               Default: False.
         '''
 
         # check if model is a nn.Module or inherited from a nn.Module
@@ -293,6 +309,7 @@ class InferenceOptimizer(BaseInferenceOptimizer):
                                                all_methods=self.ALL_INFERENCE_ACCELERATION_METHOD)
 
         self._direction: str = direction  # save direction as attr
+        self._model_builder = None
         # record whether calculate accuracy in optimize by this attr
         if validation_data is None and metric is None:
             self._calculate_accuracy = False
@@ -346,6 +363,26 @@ class InferenceOptimizer(BaseInferenceOptimizer):
         model.context_manager = generate_context_manager(accelerator=None, precision="fp32",
                                                          thread_num=thread_num)
 
+        def build_model(method):
+            option: AccelerationOption = self.ALL_INFERENCE_ACCELERATION_METHOD[method]
+            return option.optimize(model, training_data=training_data,
+                                   input_sample=input_sample,
+                                   thread_num=thread_num,
+                                   logging=logging,
+                                   sample_size_for_pot=sample_size_for_pot)
+
+        if cache_dir is not None:
+            cache = OptimizeResultCache(cache_dir)
+            cache_key = digest(get_model_signature(model), get_input_signature(input_sample),
+                               thread_num, cpu_signature(), torch.__version__, available_dict,
+                               direction, self._calculate_accuracy, _callable_name(metric),
+                               latency_sample_num)
+            weights_digest = get_weights_digest(model)
+            entry = cache.load(cache_key)
+            if entry is not None and entry["weights"] == weights_digest:
+                self._load_cached_result(cache, cache_key, entry, model, build_model)
+                return
+
         print("==========================Start Optimization==========================")
         start_time = time.perf_counter()
         for idx, (method, available) in enumerate(available_dict.items()):
@@ -358,11 +395,7 @@ class InferenceOptimizer(BaseInferenceOptimizer):
                 option: AccelerationOption = self.ALL_INFERENCE_ACCELERATION_METHOD[method]
                 precision = option.get_precision()
                 try:
-                    acce_model = option.optimize(model, training_data=training_data,
-                                                 input_sample=input_sample,
-                                                 thread_num=thread_num,
-                                                 logging=logging,
-                                                 sample_size_for_pot=sample_size_for_pot)
+                    acce_model = build_model(method)
                 except Exception:
                     traceback.print_exc()
                     result_map[method]["status"] = "fail to convert"
@@ -446,6 +479,67 @@ class InferenceOptimizer(BaseInferenceOptimizer):
         print(self._optimize_result)
         print("===========================Stop Optimization===========================")
 
+        if cache_dir is not None:
+            self._save_cached_result(cache, cache_key, weights_digest, cache_model)
+
+    def _save_cached_result(self, cache, cache_key, weights_digest, cache_model):
+        result = {}
+        for method, method_result in self.optimized_model_dict.items():
+            result[method] = {}
+            for key, value in method_result.items():
+                if key == "model":
+                    continue
+                # accuracy may be a tensor or a numpy scalar
+                result[method][key] = value.item() \
+                    if isinstance(value, (torch.Tensor, np.ndarray, np.generic)) else value
+        entry = {"weights": weights_digest, "calculate_accuracy": self._calculate_accuracy,
+                 "result": result, "model_method": None}
+        cache.remove_model(cache_key)
+        if cache_model:
+            successful = [(r["latency"], m) for m, r in self.optimized_model_dict.items()
+                          if r["status"] == "successful"]
+            best_method = min(successful)[1] if successful else "original"
+            # the original model is built without cost
+            if best_method != "original":
+                try:
+                    save_model(self.optimized_model_dict[best_method]["model"],
+                               cache.model_path(cache_key))
+                    entry["model_method"] = best_method
+                except Exception:
+                    traceback.print_exc()
+                    warnings.warn(f"Failed to save {best_method} model to cache.")
+                    cache.remove_model(cache_key)
+        try:
+            cache.save(cache_key, entry)
+        except Exception:
+            traceback.print_exc()
+            warnings.warn("Failed to save optimization results to cache.")
+            cache.remove_model(cache_key)
+
+    def _load_cached_result(self, cache, cache_key, entry, model, build_model):
+        self.optimized_model_dict = {method: dict(result)
+                                     for method, result in entry["result"].items()}
+        self._calculate_accuracy = entry["calculate_accuracy"]
+
+        def model_builder(method):
+            if method == entry["model_method"]:
+                option: AccelerationOption = self.ALL_INFERENCE_ACCELERATION_METHOD[method]
+                try:
+                    return load_model(cache.model_path(cache_key),
+                                      None if option.onnxruntime or option.openvino else model)
+                except Exception:
+                    traceback.print_exc()
+                    warnings.warn(f"Failed to load cached {method} model, build it again.")
+            return build_model(method)
+        self._model_builder = model_builder
+
+        print("==========================Optimization Results==========================")
+        self._optimize_result = format_optimize_result(self.optimized_model_dict,
+                                                       self._calculate_accuracy)
+        self._optimize_result += f"Optimization results are loaded from {cache.cache_dir}."
+        print(self._optimize_result)
+        print("===========================Stop Optimization===========================")
+
     @staticmethod
     def quantize(model: nn.Module,
                  precision: str = 'int8',
@@ -822,16 +916,33 @@ class InferenceOptimizer(BaseInferenceOptimizer):
         return load_model(path, model, inplace=inplace)
 
     @staticmethod
-    def to_multi_instance(model: nn.Module, num_processes: int) -> _MultiInstanceModel:
+    def to_multi_instance(model: nn.Module, num_processes: int,
+                          max_batch_size: int = 1,
+                          max_wait: float = 0.01) -> _MultiInstanceModel:
         """
         Transform a model to multi-instance inference model.
+
+        The returned model predicts a list or DataLoader of batches by calling it,
+        or serves samples submitted by ``submit``, which are merged into batches
+        dynamically. Call ``shutdown`` to stop the processes when it is not used.
+
         :param model: The model to transform.
         :param num_processes: The number of processes which will be used.
+        :param max_batch_size: The max number of samples submitted by ``submit`` which
+               are merged into a batch. Default: ``1``, which means no merging.
+        :param max_wait: The max seconds to wait for more samples to merge into a
+               batch. Default: ``0.01``.
         :return: Model with multi-instance inference acceleration.
+
+        Example:
+            >>> with InferenceOptimizer.to_multi_instance(model, num_processes=4,
+            >>>                                           max_batch_size=16) as server:
+            >>>     futures = [server.submit(x[None]) for x in samples]
+            >>>     outputs = [f.result() for f in futures]
         """
         p_num = num_processes
         send_queues = [mp.Queue() for _ in range(p_num)]
-        recv_queues = [mp.Queue() for _ in range(p_num)]
+        recv_queue = mp.Queue()
 
         KMP_AFFINITY = os.environ.get("KMP_AFFINITY", "")
         OMP_NUM_THREADS = os.environ.get("OMP_NUM_THREADS", "")
@@ -842,13 +953,14 @@ class InferenceOptimizer(BaseInferenceOptimizer):
             os.environ["OMP_NUM_THREADS"] = envs[i]['OMP_NUM_THREADS']
 
             p = mp.Process(target=_multi_instance_helper,
-                           args=(model, send_queues[i], recv_queues[i]), daemon=True)
+                           args=(model, send_queues[i], recv_queue), daemon=True)
             p.start()
             ps.append(p)
         os.environ["KMP_AFFINITY"] = KMP_AFFINITY
         os.environ["OMP_NUM_THREADS"] = OMP_NUM_THREADS
 
-        return _MultiInstanceModel(model, ps, send_queues, recv_queues)
+        return _MultiInstanceModel(model, ps, send_queues, recv_queue,
+                                   max_batch_size=max_batch_size, max_wait=max_wait)
 
 
 def _signature_check(function):
@@ -867,6 +979,15 @@ def _signature_check(function):
     return False
 
 
+def _callable_name(function):
+    '''
+    A quick helper to get the name of a metric function or object for cache key.
+    '''
+    if function is None:
+        return None
+    return getattr(function, "__qualname__", type(function).__qualname__)
+
+
 def _accuracy_calculate_helper(model, metric, data):
     '''
     A quick helper to calculate accuracy
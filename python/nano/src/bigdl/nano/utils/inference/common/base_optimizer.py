@@ -35,6 +35,8 @@ class BaseInferenceOptimizer:
         # in {"method_name": {"latency": ..., "accuracy": ..., "model": ...}}
         self.optimized_model_dict = {}
         self._optimize_result = None
+        # builds the model of a method on demand when the results are loaded from cache
+        self._model_builder = None
 
     @abstractmethod
     def optimize(self, *args, **kwargs):
@@ -68,10 +70,21 @@ class BaseInferenceOptimizer:
                           f"The model name you passed does not exist in the existing method "
                           f"list{list(self.ALL_INFERENCE_ACCELERATION_METHOD.keys())}, "
                           f"please re-enter the model name again.")
-        invalidInputError("model" in self.optimized_model_dict[method_name],
+        result = self.optimized_model_dict[method_name]
+        # a model loaded from cache is built when obtained
+        has_model = "model" in result
+        buildable = self._model_builder is not None
+        buildable = buildable and result["status"] in ("successful", "early stopped")
+        invalidInputError(has_model or buildable,
                           "Unable to get the specified model as it doesn't exist in "
                           "optimized_model_dict.")
-        return self.optimized_model_dict[method_name]["model"]
+        return self._model_of(method_name)
+
+    def _model_of(self, method_name: str):
+        result = self.optimized_model_dict[method_name]
+        if "model" not in result and self._model_builder is not None:
+            result["model"] = self._model_builder(method_name)
+        return result["model"]
 
     def get_best_model(self,
                        accelerator: Optional[str] = None,
@@ -105,7 +118,6 @@ class BaseInferenceOptimizer:
             invalidInputError(False, "If you want to specify accuracy_criterion, you need "
                               "to set metric and validation_data when call 'optimize'.")
 
-        best_model = self.optimized_model_dict["original"]["model"]
         best_metric = CompareMetric("original",
                                     self.optimized_model_dict["original"]["latency"],
                                     self.optimized_model_dict["original"]["accuracy"])
@@ -146,7 +158,6 @@ class BaseInferenceOptimizer:
 
             # After the above conditions are met, the latency comparison is performed
             if result["latency"] < best_metric.latency:
-                best_model = result["model"]
                 if result["accuracy"] != "not recomputed":
                     accuracy = result["accuracy"]
                 else:
@@ -157,5 +168,7 @@ class BaseInferenceOptimizer:
             invalidInputError(False,
                               "Don't find related model in optimize's results.")
 
+        # only the best model is built if the results are loaded from cache
+        best_model = self._model_of(best_metric.method_name)
         return best_model, format_acceleration_option(best_metric.method_name,
                                                       self.ALL_INFERENCE_ACCELERATION_METHOD)
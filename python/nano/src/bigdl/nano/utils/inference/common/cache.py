@@ -0,0 +1,94 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import hashlib
+import json
+import os
+import platform
+import shutil
+from functools import lru_cache
+from typing import Dict, Optional
+
+
+@lru_cache(maxsize=None)
+def cpu_signature() -> str:
+    '''
+    Get a string identifying the cpu model and its instruction set extensions,
+    which decide the latency of the acceleration methods.
+    '''
+    info = {}
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                # all processors are the same, only the first one is read
+                info.setdefault(key.strip(), value.strip())
+    except OSError:
+        pass
+    model_name = info.get("model name", platform.processor())
+    flags = " ".join(sorted(info.get("flags", "").split()))
+    return f"{platform.machine()}|{model_name}|{os.cpu_count()}|{flags}"
+
+
+def digest(*parts) -> str:
+    '''
+    Get a sha256 hex digest of the json representation of parts.
+    '''
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str)
+                          .encode("utf-8")).hexdigest()
+
+
+class OptimizeResultCache:
+    '''
+    On-disk cache of the results of InferenceOptimizer.optimize. Each entry is a json
+    file of the latency/accuracy table under cache_dir, with an optional directory of
+    the saved best model.
+    '''
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = os.path.expanduser(cache_dir)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def model_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}_model")
+
+    def load(self, key: str) -> Optional[Dict]:
+        '''
+        :return: the cached entry, None if not cached or the cache file is broken.
+        '''
+        try:
+            with open(self._entry_path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, key: str, entry: Dict):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._entry_path(key)
+        # write to a temp file first, so concurrent readers never see a partial entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(entry, f, indent=2)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def remove_model(self, key: str):
+        shutil.rmtree(self.model_path(key), ignore_errors=True)
@@ -116,3 +116,39 @@ def export_to_onnx(model, input_sample=None, onnx_path="model.onnx", dynamic_axe
                                 }
     default_onnx_export_args.update(kwargs)
     torch.onnx.export(model, input_sample, onnx_path, **default_onnx_export_args)
+
+
+def get_model_signature(model):
+    '''
+    Get a json serializable signature of the architecture of model, which does not
+    depend on the weights.
+    '''
+    return [f"{type(model).__module__}.{type(model).__qualname__}", str(model),
+            [(name, list(t.shape), str(t.dtype)) for name, t in model.state_dict().items()]]
+
+
+def get_input_signature(input_sample):
+    '''
+    Get a json serializable signature of the shapes and dtypes of input_sample.
+    '''
+    if isinstance(input_sample, torch.Tensor):
+        return [list(input_sample.shape), str(input_sample.dtype)]
+    if isinstance(input_sample, dict):
+        return {str(k): get_input_signature(v) for k, v in input_sample.items()}
+    if isinstance(input_sample, (tuple, list)):
+        return [get_input_signature(v) for v in input_sample]
+    return repr(input_sample)
+
+
+def get_weights_digest(model):
+    '''
+    Get a sha256 hex digest of the weights of model.
+    '''
+    import hashlib
+    sha256 = hashlib.sha256()
+    for name, t in model.state_dict().items():
+        sha256.update(name.encode("utf-8"))
+        if isinstance(t, torch.Tensor):
+            sha256.update(t.detach().cpu().contiguous().reshape(-1)
+                          .view(torch.uint8).numpy().tobytes())
+    return sha256.hexdigest()
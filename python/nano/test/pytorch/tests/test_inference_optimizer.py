@@ -15,6 +15,10 @@
 #
 
 import os
+import signal
+import tempfile
+import threading
+import time
 import numpy as np
 from torch import nn
 import torch
@@ -78,6 +82,12 @@ class MultipleInputWithKwargsNet(nn.Module):
         return self.dense1(x1) + self.dense2(x2) + x3
 
 
+class SlowNet(nn.Module):
+    def forward(self, x):
+        time.sleep(0.2)
+        return x * 2
+
+
 class TestInferencePipeline(TestCase):
     num_workers = 0
     data_dir = os.path.join(os.path.dirname(__file__), "data")
@@ -160,6 +170,67 @@ class TestInferencePipeline(TestCase):
         assert "fp32_ipex" in inference_opt.optimized_model_dict
         assert len(inference_opt.optimized_model_dict) == 2
 
+    def test_pipeline_with_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            inference_opt = InferenceOptimizer()
+            inference_opt.optimize(model=self.model,
+                                   training_data=self.train_loader,
+                                   validation_data=self.test_loader,
+                                   metric=self.metric,
+                                   direction="max",
+                                   thread_num=1,
+                                   cache_dir=cache_dir,
+                                   cache_model=True)
+            _, option = inference_opt.get_best_model()
+
+            cached_opt = InferenceOptimizer()
+            cached_opt.optimize(model=self.model,
+                                training_data=self.train_loader,
+                                validation_data=self.test_loader,
+                                metric=self.metric,
+                                direction="max",
+                                thread_num=1,
+                                cache_dir=cache_dir)
+            # models are built only when obtained
+            assert all("model" not in result
+                       for result in cached_opt.optimized_model_dict.values())
+            for method, result in inference_opt.optimized_model_dict.items():
+                assert cached_opt.optimized_model_dict[method]["status"] == result["status"]
+                assert cached_opt.optimized_model_dict[method].get("latency") == \
+                    result.get("latency")
+            acc_model, cached_option = cached_opt.get_best_model()
+            assert cached_option == option
+            acc_model(next(iter(self.train_loader))[0])
+            acc_model, _ = cached_opt.get_best_model(accuracy_criterion=0.1)
+
+            # different thread_num is searched again
+            other_opt = InferenceOptimizer()
+            other_opt.optimize(model=self.model,
+                               training_data=self.train_loader,
+                               thread_num=2,
+                               cache_dir=cache_dir,
+                               includes=["original"])
+            assert "model" in other_opt.optimized_model_dict["original"]
+
+    def test_cache_unserializable_result(self):
+        from bigdl.nano.utils.inference.common.cache import OptimizeResultCache
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = OptimizeResultCache(cache_dir)
+            inference_opt = InferenceOptimizer()
+            inference_opt._calculate_accuracy = True
+            inference_opt.optimized_model_dict = {
+                "original": {"latency": np.float32(1.5), "accuracy": np.float64(0.5),
+                             "status": "successful"}}
+            inference_opt._save_cached_result(cache, "key", "weights", cache_model=False)
+            assert cache.load("key")["result"]["original"] == \
+                {"latency": 1.5, "accuracy": 0.5, "status": "successful"}
+            # failing to save the cache does not fail optimize
+            inference_opt.optimized_model_dict["original"]["accuracy"] = object()
+            with pytest.warns(UserWarning):
+                inference_opt._save_cached_result(cache, "other", "weights", cache_model=False)
+            assert cache.load("other") is None
+            assert os.listdir(cache_dir) == ["key.json"]
+
     def test_summary(self):
         inference_opt = InferenceOptimizer()
         with pytest.raises(RuntimeError) as e:
@@ -382,6 +453,60 @@ class TestInferencePipeline(TestCase):
             np.testing.assert_allclose(pred1, pred2, atol=1e-4,
                                         err_msg=f"\npred1: {pred1}\npred2: {pred2}\n")
 
+    def test_multi_instance_submit(self):
+        model = Net()
+        model.eval()
+        inference_opt = InferenceOptimizer()
+        multi_instance_model = inference_opt.to_multi_instance(model, num_processes=2,
+                                                               max_batch_size=8,
+                                                               max_wait=0.01)
+
+        test_loader = create_data_loader(self.data_dir, 1, self.num_workers, data_transform,
+                                         subset=50, shuffle=False)
+        input_data = list(map(lambda b: b[0], test_loader))
+
+        with multi_instance_model:
+            futures = [multi_instance_model.submit(b) for b in input_data]
+            preds1 = [f.result() for f in futures]
+            with torch.no_grad():
+                preds2 = [model(b) for b in input_data]
+            # calling the model still predicts a list of batches
+            preds3 = multi_instance_model(input_data)
+
+        for (pred1, pred2, pred3) in zip(preds1, preds2, preds3):
+            np.testing.assert_allclose(pred1, pred2, atol=1e-4)
+            np.testing.assert_allclose(pred3, pred2, atol=1e-4)
+        assert all(not p.is_alive() for p in multi_instance_model.ps)
+        with pytest.raises(RuntimeError):
+            multi_instance_model.submit(input_data[0])
+
+    def test_multi_instance_kill_worker(self):
+        import concurrent.futures
+        multi_instance_model = InferenceOptimizer.to_multi_instance(SlowNet(), num_processes=2)
+        stop = threading.Event()
+
+        def submit_loop():
+            while not stop.is_set():
+                multi_instance_model.submit(torch.ones(1, 4))
+                time.sleep(0.5)
+
+        # keep the live process producing results
+        submitters = [threading.Thread(target=submit_loop) for _ in range(8)]
+        for t in submitters:
+            t.start()
+        time.sleep(0.5)
+        with multi_instance_model._lock:
+            futures = [r.future for idx, _, requests, _ in
+                       multi_instance_model._pending.values() if idx == 0 for r in requests]
+        os.kill(multi_instance_model.ps[0].pid, signal.SIGKILL)
+        _, not_done = concurrent.futures.wait(futures, timeout=5)
+        stop.set()
+        for t in submitters:
+            t.join()
+        multi_instance_model.shutdown(timeout=1)
+        assert futures and not not_done
+        assert all(isinstance(f.exception(), RuntimeError) for f in futures)
+
     def test_grid_search_model_with_accelerator(self):
         inference_opt = InferenceOptimizer()
 
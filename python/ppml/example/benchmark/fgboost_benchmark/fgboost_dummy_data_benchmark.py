@@ -43,6 +43,16 @@ if __name__ == '__main__':
                         type=bool,
                         default=True,
                         help='If this client has label in data, default True.')
+    parser.add_argument('--predict',
+                        type=str,
+                        default=None,
+                        help='Predict method to benchmark after training, one of '
+                             'predict, jtensor, file. jtensor and file use predict_bulk '
+                             'with the transfer. Default None, do not predict.')
+    parser.add_argument('--predict_batch_size',
+                        type=int,
+                        default=256,
+                        help='Number of records per predict request of predict_bulk.')
     args = parser.parse_args()
     x = np.random.rand(args.data_size, args.data_dim)
     y = np.random.rand(args.data_size)
@@ -56,12 +66,16 @@ if __name__ == '__main__':
     else:
         fgboost_regression.fit(x, num_round=args.num_round)
     te = time.time()
-    # result = fgboost_regression.predict(x)
-    # pe = time.time()
-    # result = list(map(lambda x: math.exp(x), result))
-
     train_time = round(te - ts, 3)
-    # predict_time = round(pe - te, 3)
     print (f"data: [{args.data_size}, {args.data_dim}], boost_round: {args.num_round}")
-    # print (f"training time: {train_time}, predict time: {predict_time}")
-    # result
+    print (f"training time: {train_time}")
+    if args.predict is not None:
+        if args.predict == "predict":
+            result = fgboost_regression.predict(x)
+        else:
+            result = fgboost_regression.predict_bulk(x, batchsize=args.predict_batch_size,
+                                                     transfer=args.predict)
+        pe = time.time()
+        predict_time = round(pe - te, 3)
+        print (f"predict: {args.predict}, predict time: {predict_time}, "
+               f"throughput: {round(args.data_size / (pe - te), 1)} records/s")
@@ -0,0 +1,140 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import argparse
+import threading
+import time
+from concurrent import futures
+from typing import List
+
+import grpc
+import numpy as np
+import torch
+from torch import Tensor, nn
+from bigdl.ppml.fl.nn.fl_context import init_fl_context
+from bigdl.ppml.fl.nn.fl_server import FLServer
+from bigdl.ppml.fl.nn.nn_client import NNClient
+from bigdl.ppml.fl.nn.pytorch.estimator import PytorchEstimator
+
+
+class LatencyInterceptor(grpc.ServerInterceptor):
+    """
+    Delays each unary call in the server worker thread to simulate network round trip
+    """
+    def __init__(self, latency) -> None:
+        self.latency = latency
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+
+        def delayed(request, context):
+            time.sleep(self.latency)
+            return handler.unary_unary(request, context)
+        return grpc.unary_unary_rpc_method_handler(
+            delayed,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer)
+
+
+class ClientModel(nn.Module):
+    def __init__(self, num_feature, hidden_size) -> None:
+        super().__init__()
+        self.dense1 = nn.Linear(num_feature, hidden_size)
+        self.relu = nn.ReLU()
+        self.dense2 = nn.Linear(hidden_size, 1)
+
+    def forward(self, x):
+        return self.dense2(self.relu(self.dense1(x)))
+
+
+class ServerModel(nn.Module):
+    def __init__(self) -> None:
+        super().__init__()
+        self.sigmoid = nn.Sigmoid()
+
+    def forward(self, x: List[Tensor]):
+        x = torch.stack(x)
+        x = torch.sum(x, dim=0)
+        return self.sigmoid(x)
+
+
+def train(estimator, x, y, batch_size, staleness, results, client_id):
+    ts = time.time()
+    estimator.fit(x, y, batch_size=batch_size, staleness=staleness)
+    results[client_id] = time.time() - ts
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        prog='PPML NN Pipelined Training Benchmark',
+        description='Train a two party vertical FL model with in-process FLServer')
+    parser.add_argument('--data_size', type=int, default=20000,
+                        help='Number of samples.')
+    parser.add_argument('--num_feature', type=int, default=100,
+                        help='Number of features of each party.')
+    parser.add_argument('--hidden_size', type=int, default=512,
+                        help='Hidden size of client models.')
+    parser.add_argument('--batch_size', type=int, default=64,
+                        help='Batch size.')
+    parser.add_argument('--latency', type=float, default=0.01,
+                        help='Seconds of simulated network latency of each request.')
+    parser.add_argument('--staleness', type=str, default="0,1,2,4",
+                        help='Comma separated staleness of fit, 0 means not pipelined.')
+    parser.add_argument('--port', type=int, default=8980,
+                        help='Port of FLServer.')
+    args = parser.parse_args()
+    staleness_list = [int(i) for i in args.staleness.split(",")]
+
+    fl_server = FLServer(client_num=2, max_staleness=max(staleness_list))
+    fl_server.set_port(args.port)
+    # each client holds up to staleness + 1 server threads, waiting for the other client
+    fl_server.server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=2 * (max(staleness_list) + 1) + 4),
+        interceptors=[LatencyInterceptor(args.latency)])
+    fl_server.build()
+    fl_server.start()
+
+    init_fl_context(1, f"localhost:{args.port}")
+    x = [np.random.rand(args.data_size, args.num_feature).astype("float32") for _ in range(2)]
+    y = np.random.randint(0, 2, (args.data_size, 1)).astype("float32")
+    estimators = []
+    for client_id in [1, 2]:
+        fl_client = NNClient(aggregator='pt')
+        fl_client.client_uuid = client_id
+        estimators.append(PytorchEstimator(
+            model=ClientModel(args.num_feature, args.hidden_size),
+            loss_fn=nn.BCELoss(),
+            optimizer_cls=torch.optim.SGD,
+            optimizer_args={'lr': 1e-3},
+            fl_client=fl_client,
+            server_model=ServerModel() if client_id == 1 else None))
+
+    for staleness in staleness_list:
+        results = {}
+        threads = [threading.Thread(target=train,
+                                    args=(estimators[i], x[i], y if i == 0 else None,
+                                          args.batch_size, staleness, results, i))
+                   for i in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = max(results.values())
+        print(f"staleness: {staleness}, time: {round(elapsed, 3)} s, "
+              f"throughput: {round(args.data_size / elapsed, 1)} samples/s")
+    fl_server.stop()
@@ -0,0 +1,64 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import argparse
+import time
+from uuid import uuid4
+from bigdl.ppml.fl.psi.utils import to_hex_string, iter_hex_string
+
+
+def gen_ids(data_size):
+    return ("User_" + str(i) for i in range(data_size))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        prog='PPML PSI Hashing Benchmark',
+        description='Hash dummy ids of PSI with salt')
+    parser.add_argument('--data_size',
+                        type=str,
+                        default="1000000,10000000,50000000",
+                        help='Comma separated numbers of ids to hash.')
+    parser.add_argument('--num_workers',
+                        type=int,
+                        default=None,
+                        help='Number of hashing processes, default number of cpus.')
+    parser.add_argument('--chunk_size',
+                        type=int,
+                        default=100000,
+                        help='Number of ids hashed per task.')
+    parser.add_argument('--single_process',
+                        type=bool,
+                        default=False,
+                        help='If also run single process to_hex_string, default False.')
+    args = parser.parse_args()
+    salt = str(uuid4())
+
+    for data_size in [int(i) for i in args.data_size.split(",")]:
+        if args.single_process:
+            ts = time.time()
+            to_hex_string(list(gen_ids(data_size)), salt)
+            te = time.time()
+            print(f"ids: {data_size}, single process time: {round(te - ts, 3)} s")
+        ts = time.time()
+        count = 0
+        # consume the stream without keeping the hashed ids
+        for _ in iter_hex_string(gen_ids(data_size), salt,
+                                 num_workers=args.num_workers, chunk_size=args.chunk_size):
+            count += 1
+        te = time.time()
+        print(f"ids: {count}, streaming process pool time: {round(te - ts, 3)} s, "
+              f"throughput: {round(count / (te - ts))} ids/s")
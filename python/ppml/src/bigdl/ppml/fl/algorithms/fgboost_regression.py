@@ -15,12 +15,16 @@
 #
 
 
+import os
+import shutil
+import tempfile
 from time import time
 from bigdl.dllib.utils.common import JavaValue
+from bigdl.dllib.utils.log4Error import invalidInputError
 from bigdl.ppml.fl.data_utils import *
 
 from bigdl.ppml.fl import *
-from bigdl.ppml.fl.fgboost.utils import add_data
+from bigdl.ppml.fl.fgboost.utils import add_data, get_chunk_size
 import logging
 
 
@@ -61,6 +65,45 @@ class FGBoostRegression(FLClientClosable):
         flat_result = [x for xs in result for x in xs]
         return np.array(flat_result)
 
+    def predict_bulk(self, x, batchsize=256, transfer="jtensor", tmp_dir=None, **kargs):
+        """
+        Predict large data with one JVM call per chunk, chunks are sized by bytes and
+        split to batches of batchsize records in JVM for FLServer
+        :param x: DataFrame or ndarray
+        :param batchsize: number of records per predict request to FLServer, all the
+        clients should use the same batchsize
+        :param transfer: "jtensor" to transfer chunks by Py4J, or "file" to transfer by
+        temp files of raw float32
+        :param tmp_dir: directory of temp files if transfer is "file"
+        :return: ndarray of predict result
+        """
+        invalidInputError(transfer in ["jtensor", "file"],
+                          f"transfer should be jtensor or file, got {transfer}")
+        x = convert_to_numpy(x, kargs.get("feature_columns"))
+        result = np.empty(len(x), dtype=np.float32)
+        # chunks are aligned to batchsize, so batches are the same on all the clients
+        chunk_size = get_chunk_size(x, align=batchsize)
+        work_dir = tempfile.mkdtemp(dir=tmp_dir) if transfer == "file" else None
+        try:
+            for start in range(0, len(x), chunk_size):
+                end = min(start + chunk_size, len(x))
+                x_chunk = np.ascontiguousarray(x[start:end], dtype="<f4")
+                if transfer == "file":
+                    feature_path = os.path.join(work_dir, "feature")
+                    result_path = os.path.join(work_dir, "result")
+                    x_chunk.tofile(feature_path)
+                    callBigDlFunc(self.bigdl_type, "fgBoostPredictFile", self.value,
+                                  feature_path, x_chunk.shape[1], result_path, batchsize)
+                    result[start:end] = np.fromfile(result_path, dtype="<f4")
+                else:
+                    x_chunk, _ = convert_to_jtensor(x_chunk)
+                    result[start:end] = callBigDlFunc(self.bigdl_type, "fgBoostPredictInBatch",
+                                                      self.value, x_chunk, batchsize).to_ndarray()
+        finally:
+            if work_dir is not None:
+                shutil.rmtree(work_dir, ignore_errors=True)
+        return result
+
     def save_model(self, dest):
         callBigDlFunc(self.bigdl_type, "fgBoostRegressionSave", self.value, dest)
 
@@ -40,3 +40,14 @@ def add_data(data: np.ndarray, jvalue, func_add, bigdl_type="float"):
         te_add = time.time()
         logging.info(f"call add data time: {te_add - te_convert}")
 
+
+def get_chunk_size(data: np.ndarray, align=1, itemsize=4):
+    """
+    :param data: 2D ndarray
+    :param align: chunk size is a multiple of align
+    :param itemsize: bytes of each element when transferred
+    :return: max number of rows per chunk within MAX_MSG_SIZE
+    """
+    row_size = max(data.shape[1] * itemsize, 1) if data.ndim > 1 else itemsize
+    rows = MAX_MSG_SIZE // row_size
+    return max(rows // align, 1) * align
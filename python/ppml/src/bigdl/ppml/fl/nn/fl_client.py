@@ -31,6 +31,10 @@ class FLClient(object):
     target = "localhost:8980"
     secure = False
     creds = None
+    # downcast dtype of floating tensors sent to server, float16 or bfloat16
+    tensor_dtype = None
+    # whether to send tensors as raw bytes, the server should be of the same version
+    tensor_bytes = False
 
     @staticmethod
     def set_client_id(client_id):
@@ -58,6 +62,10 @@ class FLClient(object):
                     FLClient.secure = True
                     with open(conf['privateKeyFilePath'], 'rb') as f:
                         FLClient.creds = grpc.ssl_channel_credentials(f.read())
+                if 'tensorDtype' in conf:
+                    FLClient.tensor_dtype = conf['tensorDtype']
+                if 'tensorBytes' in conf:
+                    FLClient.tensor_bytes = conf['tensorBytes']
         except yaml.YAMLError as e:
             logging.warn('Loading config failed, using default config ')
         except Exception as e:
@@ -29,8 +29,7 @@ from bigdl.ppml.fl.nn.generated.psi_service_pb2_grpc import *
 # logging.basicConfig(format=fmt, level=logging.DEBUG)
 
 class FLServer(object):    
-    def __init__(self, client_num=None):
-        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=5))
+    def __init__(self, client_num=None, max_staleness=None):
         self.port = 8980
         self.client_num = client_num
         self.secure = False
@@ -38,6 +37,13 @@ class FLServer(object):
         # a chance to overwrite client num
         if client_num is not None:
             self.conf['clientNum'] = client_num
+        if max_staleness is not None:
+            self.conf['maxStaleness'] = max_staleness
+        # each pipelined client could hold up to maxStaleness + 1 workers waiting for
+        # the other clients, fewer workers would deadlock the training
+        max_workers = max(self.conf['serverMaxWorkers'],
+                          int(self.conf['clientNum']) * (self.conf['maxStaleness'] + 1))
+        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
 
     def set_port(self, port):
         self.port = port
@@ -83,6 +89,10 @@ class FLServer(object):
         # set default parameters if not specified in config
         if 'clientNum' not in conf.keys():
             self.conf['clientNum'] = 1
+        if 'serverMaxWorkers' not in conf.keys():
+            self.conf['serverMaxWorkers'] = 5
+        if 'maxStaleness' not in conf.keys():
+            self.conf['maxStaleness'] = 4
 
     def wait_for_termination(self):
         self.server.wait_for_termination()
@@ -15,7 +15,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rfl_base.proto\";\n\x0b\x46loatTensor\x12\r\n\x05shape\x18\x01 \x03(\x05\x12\x0e\n\x06tensor\x18\x02 \x03(\x02\x12\r\n\x05\x64type\x18\x03 \x01(\t\"\x96\x01\n\tTensorMap\x12\x1b\n\x08metaData\x18\x01 \x01(\x0b\x32\t.MetaData\x12,\n\ttensorMap\x18\x02 \x03(\x0b\x32\x19.TensorMap.TensorMapEntry\x1a>\n\x0eTensorMapEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x1b\n\x05value\x18\x02 \x01(\x0b\x32\x0c.FloatTensor:\x02\x38\x01\")\n\x08MetaData\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\x05*H\n\x06SIGNAL\x12\x0b\n\x07SUCCESS\x10\x00\x12\x08\n\x04WAIT\x10\x01\x12\x0b\n\x07TIMEOUT\x10\x02\x12\x0f\n\x0b\x45MPTY_INPUT\x10\x03\x12\t\n\x05\x45RROR\x10\x04\x42:\n+com.intel.analytics.bigdl.ppml.fl.generatedB\x0b\x46lBaseProtob\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rfl_base.proto\"]\n\x0b\x46loatTensor\x12\r\n\x05shape\x18\x01 \x03(\x05\x12\x0e\n\x06tensor\x18\x02 \x03(\x02\x12\r\n\x05\x64type\x18\x03 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x04 \x01(\x0c\x12\x12\n\ndata_dtype\x18\x05 \x01(\t\"\x96\x01\n\tTensorMap\x12\x1b\n\x08metaData\x18\x01 \x01(\x0b\x32\t.MetaData\x12,\n\ttensorMap\x18\x02 \x03(\x0b\x32\x19.TensorMap.TensorMapEntry\x1a>\n\x0eTensorMapEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x1b\n\x05value\x18\x02 \x01(\x0b\x32\x0c.FloatTensor:\x02\x38\x01\")\n\x08MetaData\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\x05*H\n\x06SIGNAL\x12\x0b\n\x07SUCCESS\x10\x00\x12\x08\n\x04WAIT\x10\x01\x12\x0b\n\x07TIMEOUT\x10\x02\x12\x0f\n\x0b\x45MPTY_INPUT\x10\x03\x12\t\n\x05\x45RROR\x10\x04\x42:\n+com.intel.analytics.bigdl.ppml.fl.generatedB\x0b\x46lBaseProtob\x06proto3')
 
 _SIGNAL = DESCRIPTOR.enum_types_by_name['SIGNAL']
 SIGNAL = enum_type_wrapper.EnumTypeWrapper(_SIGNAL)
@@ -65,14 +65,14 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   DESCRIPTOR._serialized_options = b'\n+com.intel.analytics.bigdl.ppml.fl.generatedB\013FlBaseProto'
   _TENSORMAP_TENSORMAPENTRY._options = None
   _TENSORMAP_TENSORMAPENTRY._serialized_options = b'8\001'
-  _SIGNAL._serialized_start=274
-  _SIGNAL._serialized_end=346
+  _SIGNAL._serialized_start=308
+  _SIGNAL._serialized_end=380
   _FLOATTENSOR._serialized_start=17
-  _FLOATTENSOR._serialized_end=76
-  _TENSORMAP._serialized_start=79
-  _TENSORMAP._serialized_end=229
-  _TENSORMAP_TENSORMAPENTRY._serialized_start=167
-  _TENSORMAP_TENSORMAPENTRY._serialized_end=229
-  _METADATA._serialized_start=231
-  _METADATA._serialized_end=272
+  _FLOATTENSOR._serialized_end=110
+  _TENSORMAP._serialized_start=113
+  _TENSORMAP._serialized_end=263
+  _TENSORMAP_TENSORMAPENTRY._serialized_start=201
+  _TENSORMAP_TENSORMAPENTRY._serialized_end=263
+  _METADATA._serialized_start=265
+  _METADATA._serialized_end=306
 # @@protoc_insertion_point(module_scope)
@@ -38,21 +38,37 @@ class NNClient(object):
         self.nn_stub = NNServiceStub(FLClient.channel)
         self.client_uuid = FLClient.client_id
         self.aggregator = aggregator
+        self.tensor_dtype = FLClient.tensor_dtype
+        self.tensor_bytes = FLClient.tensor_bytes
+        # sequence number of train requests, server aggregates them in order
+        self.train_version = 0
     
     def train(self, x):
-        tensor_map = ndarray_map_to_tensor_map(x)
-        train_request = TrainRequest(clientuuid=self.client_uuid,
-                                     data=tensor_map,
-                                     algorithm=self.aggregator)
-        
-        response = self.nn_stub.train(train_request)
+        response = self.nn_stub.train(self.train_request(x))
         if response.code == 1:
             invalidInputError(False,
                               response.response)
         return response
 
+    def train_async(self, x):
+        """
+        Send train request without waiting for the response
+        :param x: ndarray map to send
+        :return: TrainFuture of the response
+        """
+        return TrainFuture(self.nn_stub.train.future(self.train_request(x)))
+
+    def train_request(self, x):
+        tensor_map = ndarray_map_to_tensor_map(x, self.tensor_bytes, self.tensor_dtype)
+        with NNClient._lock:
+            self.train_version += 1
+            tensor_map.metaData.version = self.train_version
+        return TrainRequest(clientuuid=self.client_uuid,
+                            data=tensor_map,
+                            algorithm=self.aggregator)
+
     def predict(self, x):
-        tensor_map = ndarray_map_to_tensor_map(x)
+        tensor_map = ndarray_map_to_tensor_map(x, self.tensor_bytes, self.tensor_dtype)
         predict_request = PredictRequest(clientuuid=self.client_uuid,
                                      data=tensor_map,
                                      algorithm=self.aggregator)
@@ -72,3 +88,18 @@ class NNClient(object):
                                     optimizer=optimizer,
                                     aggregator=self.aggregator)
         return self.nn_stub.upload_meta(request)
+
+
+class TrainFuture(object):
+    def __init__(self, future) -> None:
+        self.future = future
+
+    def result(self):
+        """
+        Wait for the response, raise if training failed on server
+        """
+        response = self.future.result()
+        if response.code == 1:
+            invalidInputError(False,
+                              response.response)
+        return response
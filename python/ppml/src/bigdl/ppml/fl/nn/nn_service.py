@@ -45,6 +45,13 @@ class NNServiceImpl(NNServiceServicer):
         self.client_num = int(self.client_num)
         self.condition = Condition()
         self._lock = threading.Lock()
+        # a pipelined client could have up to max_staleness + 1 train requests in flight
+        self.max_staleness = int(conf['maxStaleness'])
+        self.train_in_flight = {}
+        # clients with rejected train requests, their later requests would wait forever
+        # for the rejected one in aggregator, so they are rejected as well, until all
+        # their requests return and the client could restart the training
+        self.rejected_clients = set()
 
     def train(self, request: TrainRequest, context):
         tensor_map = request.data.tensorMap
@@ -52,15 +59,43 @@ class NNServiceImpl(NNServiceServicer):
         self.validate_client_id(client_id)
         ndarray_map = tensor_map_to_ndarray_map(tensor_map)
         aggregator = self.aggregator_map[request.algorithm]
+        data = None
+        with self._lock:
+            in_flight = self.train_in_flight.get(client_id, 0) + 1
+            self.train_in_flight[client_id] = in_flight
+            # reject instead of blocking a worker, the server pool is only sized for
+            # maxStaleness and would deadlock
+            newly_rejected = in_flight > self.max_staleness + 1 and \
+                client_id not in self.rejected_clients
+            if newly_rejected:
+                self.rejected_clients.add(client_id)
+            rejected = client_id in self.rejected_clients
+        if newly_rejected:
+            # the requests waiting for the rejected one in aggregator fail as well
+            aggregator.drop_client(client_id, 'train')
         try:
-            aggregator.put_client_data(client_id, ndarray_map, 'train')            
+            invalidInputError(not rejected,
+                              f"client {client_id} has more than {self.max_staleness + 1} "
+                              f"train requests in flight, staleness of fit should not be "
+                              f"larger than maxStaleness {self.max_staleness} of FLServer, "
+                              f"please restart the training")
+            data = aggregator.put_client_data(client_id, ndarray_map, 'train',
+                                              request.data.metaData.version)
             msg = f'[client {client_id} batch trained]'
             code = 0
         except Exception as e:
             msg = traceback.format_exc()
             logging.error(msg)
             code = 1
-        return TrainResponse(response=msg, data=aggregator.server_data['train'][client_id], code=code)
+        finally:
+            with self._lock:
+                self.train_in_flight[client_id] -= 1
+                if self.train_in_flight[client_id] == 0 and \
+                        client_id in self.rejected_clients:
+                    # no stale request is left, the client could restart the training
+                    self.rejected_clients.discard(client_id)
+                    aggregator.restore_client(client_id, 'train')
+        return TrainResponse(response=msg, data=data, code=code)
 
     def evaluate(self, request, context):
         return super().evaluate(request, context)
@@ -71,15 +106,16 @@ class NNServiceImpl(NNServiceServicer):
         self.validate_client_id(client_id)
         ndarray_map = tensor_map_to_ndarray_map(tensor_map)
         aggregator = self.aggregator_map[request.algorithm]
+        data = None
         try:
-            aggregator.put_client_data(client_id, ndarray_map, 'pred')            
+            data = aggregator.put_client_data(client_id, ndarray_map, 'pred')
             msg = f'[client {client_id} batch predicted]'
             code = 0
         except Exception as e:
             msg = traceback.format_exc()
             logging.error(msg)
             code = 1
-        return PredictResponse(response=msg, data=aggregator.server_data['pred'][client_id], code=code)
+        return PredictResponse(response=msg, data=data, code=code)
         
     def upload_meta(self, request, context):
         try:
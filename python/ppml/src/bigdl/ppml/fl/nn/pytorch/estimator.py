@@ -15,6 +15,7 @@
 #
 
 import logging
+from collections import deque
 from numpy import ndarray
 import torch
 from torch import nn
@@ -113,7 +114,18 @@ class PytorchEstimator:
         self.optimizer.step()
         return response_map['loss']
 
-    def fit(self, x, y=None, epoch=1, batch_size=4):
+    def fit(self, x, y=None, epoch=1, batch_size=4, staleness=0):
+        """
+        :param staleness: max number of batches sent to server without applying their
+        gradients. If 0, each batch waits for the server response before the next one.
+        If > 0, forward of next batches are computed while responses are in flight, and
+        gradient of a batch is applied to the client model up to staleness steps newer
+        than the one computing its forward. Each client holds up to staleness + 1 server
+        workers, staleness should not be larger than maxStaleness of FLServer, or the
+        train requests are rejected.
+        """
+        if staleness > 0:
+            return self.__fit_pipelined(x, y, epoch, batch_size, staleness)
         for e in range(epoch):
             self.model.train()
             if isinstance(x, DataLoader):
@@ -147,6 +159,53 @@ class PytorchEstimator:
                 torch.save(self.model, self.client_model_path)
             
 
+    def __fit_pipelined(self, x, y, epoch, batch_size, staleness):
+        for e in range(epoch):
+            self.model.train()
+            in_flight = deque()
+            for batch, (X, Y) in enumerate(self.__batches(x, y, batch_size)):
+                # graph of this forward is not kept, model would be updated in place by
+                # earlier batches before the response of this batch arrives
+                with torch.no_grad():
+                    y_pred_local = self.model(X)
+                data_map = {'input': y_pred_local.numpy()}
+                if Y is not None:
+                    data_map['target'] = Y.detach().numpy()
+                in_flight.append((batch, X, self.fl_client.train_async(data_map)))
+                if len(in_flight) > staleness:
+                    self.__apply_response(e, epoch, *in_flight.popleft())
+            while in_flight:
+                self.__apply_response(e, epoch, *in_flight.popleft())
+            if self.server_model_path is not None:
+                self.save_server_model(self.server_model_path)
+            if self.client_model_path is not None:
+                torch.save(self.model, self.client_model_path)
+
+    def __apply_response(self, e, epoch, batch, X, future):
+        response_map = tensor_map_to_ndarray_map(future.result().data.tensorMap)
+        # recompute forward with current model to backward the server gradient
+        y_pred_local = self.model(X)
+        self.optimizer.zero_grad()
+        y_pred_local.backward(gradient=torch.tensor(response_map['grad']))
+        self.optimizer.step()
+        loss = response_map['loss']
+        if batch % 100 == 0:
+            logging.info(f"loss: {loss:>7f}  [batch {batch:>5d}]  epoch {e}/{epoch}")
+            self.loss_history.append(loss)
+
+    def __batches(self, x, y, batch_size):
+        if isinstance(x, DataLoader):
+            for X, Y in x:
+                yield X, Y
+        elif isinstance(x, ndarray):
+            for i in range(0, len(x), batch_size):
+                X = torch.from_numpy(x[i:i + batch_size])
+                Y = torch.from_numpy(y[i:i + batch_size]) if y is not None else None
+                yield X, Y
+        else:
+            invalidInputError(False,
+                              f'got unsupported data input type: {type(x)}')
+
     def predict(self, x):
         if isinstance(x, DataLoader):
             pass
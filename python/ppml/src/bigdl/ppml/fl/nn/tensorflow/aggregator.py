@@ -31,6 +31,10 @@ class Aggregator(object):
         self.model = None
         self.client_data = {'train':{}, 'eval':{}, 'pred':{}}
         self.server_data = {'train':{}, 'eval':{}, 'pred':{}}
+        self.unread_clients = {'train':set(), 'eval':set(), 'pred':set()}
+        self.client_version = {'train':{}, 'eval':{}, 'pred':{}}
+        # clients whose data after version 1 are dropped, until they are restored
+        self.dropped_clients = {'train':set(), 'eval':set(), 'pred':set()}
         self.client_num = conf['clientNum']
         self.condition = Condition()
         self._lock = threading.Lock()
@@ -38,6 +42,8 @@ class Aggregator(object):
         self.optimizer_args = None
         self.secret_key = conf['secretKey'] if 'secretKey' in conf.keys() else None
         self.salt = conf['salt'] if 'salt' in conf.keys() else None
+        self.tensor_dtype = conf['tensorDtype'] if 'tensorDtype' in conf.keys() else None
+        self.tensor_bytes = conf['tensorBytes'] if 'tensorBytes' in conf.keys() else False
         logging.info(f"Initialized Tensorflow aggregator [client_num: {self.client_num}]")
 
 
@@ -59,22 +65,59 @@ class Aggregator(object):
         self.optimizer = optimizer_cls(**optimizer_args)
 
 
-    def put_client_data(self, client_id, data, phase):
-        self.condition.acquire()
-        self.client_data[phase][client_id] = data
-        logging.debug(f'server receive data [{client_id}], \
+    def put_client_data(self, client_id, data, phase, version=0):
+        """
+        :param version: sequence number of the data of this client starting from 1, if set,
+        data of a client are aggregated in order, 0 means no order
+        :return: server data of this client, after data of all clients are aggregated
+        """
+        def is_next():
+            if version > 1 and client_id in self.dropped_clients[phase]:
+                return True
+            # a pipelined client could send next batch before getting result of last batch
+            if client_id in self.client_data[phase] or client_id in self.unread_clients[phase]:
+                return False
+            return version <= 1 or version == self.client_version[phase].get(client_id, 0) + 1
+
+        with self.condition:
+            self.condition.wait_for(is_next)
+            invalidOperationError(version <= 1 or client_id not in self.dropped_clients[phase],
+                                  f"data of client {client_id} with version {version} is "
+                                  f"dropped, please restart the training")
+            self.client_version[phase][client_id] = version
+            self.client_data[phase][client_id] = data
+            logging.debug(f'server receive data [{client_id}], \
 got {len(self.client_data[phase])}/{self.client_num}')
-        
-        if len(self.client_data[phase]) == self.client_num:            
-            logging.debug('server received all client data, start aggregate')
-            self.aggregate(phase)
-            logging.debug('clearing client data')
-            self.client_data[phase] = {}
-            self.condition.notify_all()            
-        else:
-            logging.debug(f'[{client_id}] waiting')
-            self.condition.wait()
-        self.condition.release()
+
+            if len(self.client_data[phase]) == self.client_num:
+                logging.debug('server received all client data, start aggregate')
+                self.aggregate(phase)
+                logging.debug('clearing client data')
+                self.unread_clients[phase] = set(self.client_data[phase].keys())
+                self.client_data[phase] = {}
+            else:
+                logging.debug(f'[{client_id}] waiting')
+                self.condition.wait_for(lambda: client_id not in self.client_data[phase])
+            self.unread_clients[phase].discard(client_id)
+            self.condition.notify_all()
+            return self.server_data[phase].get(client_id)
+
+    def drop_client(self, client_id, phase):
+        """
+        Drop the pending data of a client, e.g. its previous data is rejected. Its data
+        after version 1 raise instead of waiting for the previous ones, until restored.
+        """
+        with self.condition:
+            self.dropped_clients[phase].add(client_id)
+            self.client_version[phase].pop(client_id, None)
+            self.condition.notify_all()
+
+    def restore_client(self, client_id, phase):
+        """
+        Accept the data of a dropped client again, which should start from version 1.
+        """
+        with self.condition:
+            self.dropped_clients[phase].discard(client_id)
 
 
     def aggregate(self, phase):
@@ -86,7 +129,9 @@ got {len(self.client_data[phase])}/{self.client_num}')
                 elif k == 'target':
                     target = tf.convert_to_tensor(v)
                 else:
-                    invalidInputError(False, f'Invalid type of tensor map key: {k}, should be input/target')
+                    invalidInputError(False,
+                                      f'Invalid type of tensor map key: {k},'
+                                      f' should be input/target')
         # TODO: to be consistent with Pytorch, custom API
         
         def sort_by_key(kv_tuple):
@@ -111,7 +156,8 @@ got {len(self.client_data[phase])}/{self.client_num}')
             for cid, input_tensor in input:
                 x_grad = tape.gradient(loss, input_tensor)
                 grad_map = {'grad': x_grad.numpy(), 'loss': np.array(loss.numpy())}
-                self.server_data['train'][cid] = ndarray_map_to_tensor_map(grad_map)
+                self.server_data['train'][cid] = ndarray_map_to_tensor_map(
+                    grad_map, self.tensor_bytes, self.tensor_dtype)
             
             del tape # manually delete the persistent GradientTape
         elif phase == 'eval':
@@ -120,7 +166,8 @@ got {len(self.client_data[phase])}/{self.client_num}')
             pred = self.model(tensor_list)
             for cid, input_tensor in input:
                 pred_map = {'pred': pred.numpy()}
-                self.server_data['pred'][cid] = ndarray_map_to_tensor_map(pred_map)
+                self.server_data['pred'][cid] = ndarray_map_to_tensor_map(
+                    pred_map, self.tensor_bytes, self.tensor_dtype)
         else:
             invalidInputError(False,
                               f'Invalid phase: {phase}, should be train/eval/pred')
@@ -39,13 +39,80 @@ import numpy as np
 from bigdl.dllib.utils.log4Error import invalidInputError
 from bigdl.ppml.fl.nn.generated.fl_base_pb2 import FloatTensor, TensorMap
 
-def ndarray_map_to_tensor_map(array_map: dict):
+def float32_to_bfloat16(v):
+    """
+    :param v: float ndarray
+    :return: uint16 ndarray of bfloat16 bits, rounded to nearest even
+    """
+    bits = np.ascontiguousarray(v, dtype=np.float32).view(np.uint32)
+    rounded = (bits + 0x7FFF + ((bits >> 16) & 1)) >> 16
+    # keep NaN as NaN, rounding could carry into the exponent
+    return np.where(np.isnan(v), (bits >> 16) | 0x40, rounded).astype(np.uint16)
+
+
+def bfloat16_to_float32(v):
+    """
+    :param v: uint16 ndarray of bfloat16 bits
+    :return: float32 ndarray
+    """
+    return (v.astype(np.uint32) << 16).view(np.float32)
+
+
+def ndarray_to_float_tensor(v, use_bytes=False, tensor_dtype=None):
+    """
+    :param v: numpy ndarray
+    :param use_bytes: whether to put the raw buffer of v to data of FloatTensor, otherwise
+    each element is put to the repeated float field tensor. Peers of previous versions
+    could only decode the repeated float field, so it is opt-in.
+    :param tensor_dtype: None, float16 or bfloat16, if set, floating ndarray is downcast
+    to tensor_dtype in data, and cast back to its dtype when decoded, implies use_bytes
+    :return: FloatTensor
+    """
+    if not use_bytes and tensor_dtype is None:
+        return FloatTensor(tensor=v.flatten().tolist(), shape=v.shape, dtype=str(v.dtype))
+    data, data_dtype = v, ""
+    if tensor_dtype is not None and np.issubdtype(v.dtype, np.floating):
+        if tensor_dtype == "float16":
+            data = v.astype(np.float16)
+        elif tensor_dtype == "bfloat16":
+            data = float32_to_bfloat16(v)
+        else:
+            invalidInputError(False,
+                              f"tensor_dtype should be float16 or bfloat16, got {tensor_dtype}")
+        data_dtype = tensor_dtype
+    return FloatTensor(data=np.ascontiguousarray(data).tobytes(), shape=v.shape,
+                       dtype=str(v.dtype), data_dtype=data_dtype)
+
+
+def float_tensor_to_ndarray(v):
+    """
+    :param v: FloatTensor, encoded by data or tensor
+    :return: numpy ndarray
+    """
+    dtype = "float32" if not v.dtype else v.dtype
+    if len(v.data) == 0:
+        return np.array(v.tensor, dtype=dtype).reshape(v.shape)
+    if v.data_dtype == "bfloat16":
+        array = bfloat16_to_float32(np.frombuffer(v.data, dtype=np.uint16))
+    else:
+        array = np.frombuffer(v.data, dtype=v.data_dtype if v.data_dtype else dtype)
+    # frombuffer is a read-only view of the message, copy to a writable ndarray
+    return array.astype(dtype).reshape(v.shape)
+
+
+def ndarray_map_to_tensor_map(array_map: dict, use_bytes=False, tensor_dtype=None):
+    """
+    :param array_map: dict of name to numpy ndarray
+    :param use_bytes: see ndarray_to_float_tensor
+    :param tensor_dtype: see ndarray_to_float_tensor
+    :return: TensorMap
+    """
     tensor_map = {}
     for (k, v) in array_map.items():
         if not isinstance(v, np.ndarray):
             invalidInputError(False,
                               "ndarray map element should be Numpy ndarray")
-        tensor_map[k] = FloatTensor(tensor=v.flatten().tolist(), shape=v.shape, dtype=str(v.dtype))
+        tensor_map[k] = ndarray_to_float_tensor(v, use_bytes, tensor_dtype)
     return TensorMap(tensorMap=tensor_map)
 
 
@@ -55,8 +122,7 @@ def tensor_map_to_ndarray_map(tensor_map: TensorMap):
         if not isinstance(v, FloatTensor):
             invalidInputError(False,
                               "tensor map element should be protobuf type FloatTensor")
-        dtype = "float32" if v.dtype is None else v.dtype
-        ndarray_map[k] = np.array(v.tensor, dtype=dtype).reshape(v.shape)
+        ndarray_map[k] = float_tensor_to_ndarray(v)
     return ndarray_map
 
 def file_chunk_generate(file_path):
@@ -15,6 +15,7 @@
 #
 
 import logging
+import math
 import time
 
 from bigdl.dllib.utils.log4Error import invalidOperationError
@@ -22,6 +23,7 @@ from bigdl.ppml.fl.psi.utils import to_hex_string
 from ..nn.fl_client import FLClient
 from bigdl.ppml.fl.nn.generated.psi_service_pb2_grpc import *
 from ..nn.generated.psi_service_pb2 import DownloadIntersectionRequest, SaltRequest, UploadSetRequest
+from ..nn.generated.fl_base_pb2 import SIGNAL
 
 class PSI(object):
     def __init__(self) -> None:
@@ -31,27 +33,46 @@ class PSI(object):
     def get_salt(self, secure_code=""):
         return self.stub.getSalt(SaltRequest(secure_code=secure_code)).salt_reply
     
-    def upload_set(self, ids, salt=""):
-        # TODO: add hashing
+    def upload_set(self, ids, salt="", split_size=30000):
+        """
+        :param ids: list of string ids
+        :param salt: salt from PSI server
+        :param split_size: number of hashed ids per request, to keep messages
+        under gRPC size limit
+        """
         hashed_ids = to_hex_string(ids, salt)
         self.hashed_ids_to_ids = dict(zip(hashed_ids, ids))
 
-        return self.stub.uploadSet(
-            UploadSetRequest(client_id=FLClient.client_id, hashedID=hashed_ids))
+        total_length = len(hashed_ids)
+        num_split = max(math.ceil(total_length / split_size), 1)
+        for split in range(num_split):
+            split_ids = hashed_ids[split * split_size:(split + 1) * split_size]
+            response = self.stub.uploadSet(
+                UploadSetRequest(client_id=FLClient.client_id,
+                                 split=split,
+                                 num_split=num_split,
+                                 split_length=split_size,
+                                 total_length=total_length,
+                                 hashedID=split_ids))
+        return response
 
     def download_intersection(self, max_try=100, retry=3):
         for i in range(max_try):
-            intersection = self.stub.downloadIntersection(
-                DownloadIntersectionRequest()).intersection
-            if intersection is not None and len(intersection) != 0:
-                hashed_intersection = list(intersection)
-                logging.info(f"Intersection completed, size {len(intersection)}")
-                intersection = [self.hashed_ids_to_ids[i] for i in hashed_intersection]
-                return intersection
-            else:
-                logging.info(f"Got empty intersection, will retry in {retry} s... {i}/{max_try}")
-                time.sleep(retry)
-        invalidOperationError(False, "Max retry reached, could not get intersection, exiting.")
+            response = self.stub.downloadIntersection(DownloadIntersectionRequest(split=0))
+            if response.status == SIGNAL.SUCCESS:
+                break
+            logging.info(f"Intersection not ready, will retry in {retry} s... {i}/{max_try}")
+            time.sleep(retry)
+        else:
+            invalidOperationError(False,
+                                  "Max retry reached, could not get intersection, exiting.")
+        hashed_intersection = set(response.intersection)
+        for split in range(1, response.num_split):
+            response = self.stub.downloadIntersection(DownloadIntersectionRequest(split=split))
+            hashed_intersection.update(response.intersection)
+        logging.info(f"Intersection completed, size {len(hashed_intersection)}")
+        # keep the order of uploaded ids
+        return [v for k, v in self.hashed_ids_to_ids.items() if k in hashed_intersection]
 
     def get_intersection(self, ids, secure_code="", max_try=100, retry=3):
         salt = self.get_salt(secure_code)
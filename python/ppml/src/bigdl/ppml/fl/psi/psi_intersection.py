@@ -16,39 +16,199 @@
 
 
 import logging
+import os
+import shutil
+import tempfile
 import threading
 
+import numpy as np
+
 from bigdl.ppml.utils.log4Error import invalidOperationError
 
 
+class PartitionStore(object):
+    """
+    Stores numpy arrays appended under a key, in memory, or in .npy files under
+    spill_dir so that only the partition being processed is loaded in memory.
+    Small appends are buffered in memory until spill_threshold rows per key.
+    """
+    def __init__(self, spill_dir=None, spill_threshold=1000000) -> None:
+        self.spill_dir = tempfile.mkdtemp(dir=spill_dir) if spill_dir is not None else None
+        self.spill_threshold = spill_threshold
+        self._arrays = {}
+        self._buffer = {}
+        self._count = 0
+
+    def append(self, key, array):
+        if self.spill_dir is None:
+            self._arrays.setdefault(key, []).append(array)
+            return
+        buffer = self._buffer.setdefault(key, [])
+        buffer.append(array)
+        if sum(len(a) for a in buffer) >= self.spill_threshold:
+            self._spill(key)
+
+    def _spill(self, key):
+        buffer = self._buffer.pop(key, [])
+        if not buffer:
+            return
+        path = os.path.join(self.spill_dir, f"{self._count}.npy")
+        self._count += 1
+        np.save(path, np.concatenate(buffer))
+        self._arrays.setdefault(key, []).append(path)
+
+    def get(self, key):
+        arrays = [np.load(a) if isinstance(a, str) else a for a in self._arrays.get(key, [])]
+        arrays += self._buffer.get(key, [])
+        return np.concatenate(arrays) if arrays else None
+
+    def put(self, key, array):
+        self.remove(key)
+        self.append(key, array)
+        if self.spill_dir is not None:
+            self._spill(key)
+
+    def remove(self, key):
+        self._buffer.pop(key, None)
+        for a in self._arrays.pop(key, []):
+            if isinstance(a, str):
+                os.remove(a)
+
+    def close(self):
+        self._arrays.clear()
+        self._buffer.clear()
+        if self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+
 class PsiIntersection(object):
-    def __init__(self, max_collection=1) -> None:
+    def __init__(self, max_collection=1, num_partitions=16, spill_dir=None) -> None:
+        """
+        Hashed ids are stored as fixed width numpy bytes arrays, hash partitioned
+        when added, and intersected partition by partition with sorted arrays, so
+        peak memory is about one partition of all collections
+        :param max_collection: the number of clients
+        :param num_partitions: the number of hash partitions
+        :param spill_dir: if set, partitions are spilled to a temp directory under it
+        """
         self.intersection = []
         self._thread_intersection = []
 
         self.max_collection = int(max_collection)
+        self.num_partitions = int(num_partitions)
         self.condition = threading.Condition()
         self._lock = threading.Lock()
 
-        self.collection = []
-        
+        # client_id -> number of received splits
+        self.collection = {}
+        self._completed = set()
+        self._store = PartitionStore(spill_dir)
+        # size of each intersection partition, None if not ready
+        self._intersection_sizes = None
+
     def find_intersection(self, a, b):
-        return list(set(a) & set(b))
+        return np.intersect1d(a, b)
+
+    def partition(self, ids):
+        """
+        :param ids: numpy bytes array of hex strings
+        :return: partition index of each id
+        """
+        # hashed ids are at least 32 hex chars with leading zeros stripped, so the 1st
+        # char is never 0, while the values of the 2nd to 5th hex digits are uniformly
+        # distributed and same for same id on all clients
+        chars = ids.view(np.uint8).reshape(len(ids), ids.itemsize)[:, 1:5].astype(np.int64)
+        # ascii of 0-9, a-f and A-F to digit value
+        digits = np.where(chars <= ord('9'), chars - ord('0'), (chars | 0x20) - ord('a') + 10)
+        value = ((digits[:, 0] * 16 + digits[:, 1]) * 16 + digits[:, 2]) * 16 + digits[:, 3]
+        return value % self.num_partitions
+
+    def add_split(self, client_id, ids, split=0, num_split=1):
+        """
+        Add a split of the collection of a client, the intersection is computed
+        when all the splits of all the clients are added
+        :param client_id: id of the client
+        :param ids: list of hashed id strings of this split
+        :param split: index of this split, splits could arrive in any order
+        :param num_split: total number of splits of this client
+        """
+        ids = np.asarray(list(ids), dtype=np.bytes_) if len(ids) > 0 \
+            else np.array([], dtype="S1")
+        parts = self.partition(ids) if len(ids) > 0 else np.array([], dtype=np.int64)
+        with self._lock:
+            invalidOperationError(client_id not in self._completed,
+                f"PSI collection of client {client_id} is already completed")
+            invalidOperationError(client_id in self.collection or
+                                  len(self.collection) + len(self._completed)
+                                  < self.max_collection,
+                f"PSI collection is full, got: {len(self._completed)}/{self.max_collection}")
+            for p in range(self.num_partitions):
+                self._store.append((client_id, p), ids[parts == p])
+            self.collection[client_id] = self.collection.get(client_id, 0) + 1
+            if self.collection[client_id] < max(num_split, 1):
+                return
+            self.collection.pop(client_id)
+            self._completed.add(client_id)
+            logging.debug(f"PSI got collection {len(self._completed)}/{self.max_collection}")
+            if len(self._completed) == self.max_collection:
+                self._intersect()
 
     def add_collection(self, collection):
         with self._lock:
-            invalidOperationError(len(self.collection) < self.max_collection,
-                f"PSI collection is full, got: {len(self.collection)}/{self.max_collection}")
-            self.collection.append(collection)
-            logging.debug(f"PSI got collection {len(self.collection)}/{self.max_collection}")
-            if len(self.collection) == self.max_collection:
-                current_intersection = self.collection[0]
-                for i in range(1, len(self.collection)):
-                    current_intersection = \
-                        self.find_intersection(current_intersection, self.collection[i])
-                self.intersection = current_intersection
-                self.collection.clear()
+            client_id = len(self.collection) + len(self._completed)
+        self.add_split(client_id, collection)
 
-    def get_intersection(self):
+    def _intersect(self):
+        clients = sorted(self._completed)
+        sizes = []
+        for p in range(self.num_partitions):
+            current_intersection = self._store.get((clients[0], p))
+            self._store.remove((clients[0], p))
+            current_intersection = np.unique(current_intersection)
+            for client_id in clients[1:]:
+                current_intersection = self.find_intersection(
+                    current_intersection, self._store.get((client_id, p)))
+                self._store.remove((client_id, p))
+            self._store.put(("intersection", p), current_intersection)
+            sizes.append(len(current_intersection))
+        self._completed.clear()
+        self._intersection_sizes = sizes
+        logging.info(f"PSI intersection completed, size {sum(sizes)}")
+
+    def intersection_size(self):
+        """
+        :return: size of intersection, None if not ready
+        """
         with self._lock:
+            return sum(self._intersection_sizes) \
+                if self._intersection_sizes is not None else None
+
+    def get_intersection_split(self, split, split_size):
+        """
+        :param split: index of split
+        :param split_size: number of ids per split
+        :return: list of hashed id strings of this split, None if not ready
+        """
+        with self._lock:
+            if self._intersection_sizes is None:
+                return None
+            start, end = split * split_size, (split + 1) * split_size
+            result = []
+            offset = 0
+            for p, size in enumerate(self._intersection_sizes):
+                if offset < end and offset + size > start and size > 0:
+                    array = self._store.get(("intersection", p))
+                    result.append(array[max(start - offset, 0):min(end - offset, size)])
+                offset += size
+            if not result:
+                return []
+            return np.char.decode(np.concatenate(result), 'utf-8').tolist()
+
+    def get_intersection(self):
+        size = self.intersection_size()
+        if size is None:
             return self.intersection
+        return self.get_intersection_split(0, size) if size > 0 else []
+
+    def close(self):
+        self._store.close()
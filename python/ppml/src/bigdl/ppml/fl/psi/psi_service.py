@@ -15,11 +15,13 @@
 #
 
 import logging
+import math
 from random import randint
 from uuid import uuid4
 from bigdl.ppml.fl.psi.psi_intersection import PsiIntersection
 from bigdl.ppml.fl.nn.generated.psi_service_pb2_grpc import *
 from bigdl.ppml.fl.nn.generated.psi_service_pb2 import *
+from bigdl.ppml.fl.nn.generated.fl_base_pb2 import SIGNAL
 
 
 
@@ -29,7 +31,11 @@ class PSIServiceImpl(PSIServiceServicer):
         self.client_secret = None
         self.client_shuffle_seed = 0
         # self.psi_collections = {}
-        self.psi_intersection = PsiIntersection(conf['clientNum'])
+        # intersection is downloaded in splits to keep messages under gRPC size limit
+        self.split_size = conf.get('psiSplitSize', 30000)
+        self.psi_intersection = PsiIntersection(conf['clientNum'],
+                                                conf.get('psiNumPartitions', 16),
+                                                conf.get('psiSpillDir', None))
 
     def getSalt(self, request, context):
         if self.client_salt is not None:
@@ -50,11 +56,20 @@ class PSIServiceImpl(PSIServiceServicer):
     def uploadSet(self, request, context):
         client_id = request.client_id
         ids = request.hashedID
-        self.psi_intersection.add_collection(ids)
-        logging.info(f"{len(self.psi_intersection.collection)}-th collection added")
+        self.psi_intersection.add_split(client_id, ids, request.split, request.num_split)
+        logging.info(f"client {client_id} split {request.split}/{request.num_split} added")
         return UploadSetResponse(status=1)
         
 
     def downloadIntersection(self, request, context):
-        intersection = self.psi_intersection.get_intersection()
-        return DownloadIntersectionResponse(intersection=intersection)
+        total_length = self.psi_intersection.intersection_size()
+        if total_length is None:
+            return DownloadIntersectionResponse(status=SIGNAL.EMPTY_INPUT)
+        intersection = self.psi_intersection.get_intersection_split(request.split,
+                                                                    self.split_size)
+        return DownloadIntersectionResponse(status=SIGNAL.SUCCESS,
+                                            split=request.split,
+                                            num_split=math.ceil(total_length / self.split_size),
+                                            split_length=self.split_size,
+                                            total_length=total_length,
+                                            intersection=intersection)
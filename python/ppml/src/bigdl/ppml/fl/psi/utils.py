@@ -16,14 +16,77 @@
 
 
 import hashlib
+import itertools
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 
 def to_hex_string(ids, salt, padding_size=32):
-    hashing = hashlib.sha384()
-    hex_string = []
-    for ch in ids:
-        hashing.update(bytearray(ch, 'utf-8') + bytearray(salt, 'utf-8'))
-        ch = hashing.hexdigest()
-        while len(ch) < padding_size:
-            ch.insert(0, '0')
-        hex_string.append(ch)
-    return hex_string
\ No newline at end of file
+    """
+    Hash each id with salt by SHA-384, every id is hashed by its own digest, so the
+    output of an id does not depend on other ids. The hex string is the same as
+    HashingUtils.toHexString of Scala, leading zeros are stripped and then padded
+    to padding_size.
+    :param ids: list of string ids
+    :param salt: string salt from PSI server
+    :param padding_size: min length of the hex string
+    :return: list of hex string
+    """
+    salt = salt.encode('utf-8')
+    sha384 = hashlib.sha384
+    return [sha384(i.encode('utf-8') + salt).hexdigest().lstrip('0').rjust(padding_size, '0')
+            for i in ids]
+
+
+def _to_hex_string_chunk(args):
+    ids, salt, padding_size = args
+    return to_hex_string(ids, salt, padding_size)
+
+
+def iter_hex_string(ids, salt, padding_size=32, num_workers=None, chunk_size=100000):
+    """
+    Streaming version of to_hex_string, ids are read and hashed chunk by chunk
+    in a process pool, at most 2 * num_workers chunks are in memory at a time
+    :param ids: iterable of string ids, e.g. a generator or an opened file
+    :param salt: string salt from PSI server
+    :param padding_size: min length of the hex string
+    :param num_workers: number of processes, None means number of cpus, 0 means
+    hashing in current process
+    :param chunk_size: number of ids hashed per task
+    :return: generator of hex string, in the same order of ids
+    """
+    it = iter(ids)
+    chunks = iter(lambda: list(itertools.islice(it, chunk_size)), [])
+    if num_workers == 0:
+        for chunk in chunks:
+            yield from to_hex_string(chunk, salt, padding_size)
+        return
+    num_workers = num_workers if num_workers else os.cpu_count()
+    with ProcessPoolExecutor(num_workers) as pool:
+        max_pending = 2 * num_workers
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_to_hex_string_chunk, (chunk, salt, padding_size)))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def parallel_to_hex_string(ids, salt, padding_size=32, num_workers=None, chunk_size=100000):
+    """
+    Same as to_hex_string, but hashing in a process pool
+    :return: list of hex string
+    """
+    return list(iter_hex_string(ids, salt, padding_size, num_workers, chunk_size))
+
+
+def file_to_hex_string(path, salt, padding_size=32, num_workers=None, chunk_size=100000):
+    """
+    Hash ids in a text file of one id per line without loading the whole file
+    :return: generator of hex string, in the same order of lines
+    """
+    with open(path) as f:
+        yield from iter_hex_string((line.rstrip('\n') for line in f),
+                                   salt, padding_size, num_workers, chunk_size)
@@ -0,0 +1,91 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import time
+import unittest
+import threading
+import numpy as np
+import torch
+from torch import nn
+
+from bigdl.ppml.fl.nn.generated.nn_service_pb2 import TrainRequest
+from bigdl.ppml.fl.nn.nn_service import NNServiceImpl
+from bigdl.ppml.fl.nn.utils import ndarray_map_to_tensor_map
+
+
+class SumModel(nn.Module):
+    def forward(self, x):
+        return torch.stack(x).sum(dim=0)
+
+
+class TestNNService(unittest.TestCase):
+    def setUp(self) -> None:
+        self.service = NNServiceImpl({'clientNum': 2, 'maxStaleness': 1})
+        aggregator = self.service.aggregator_map['pt']
+        aggregator.model = SumModel()
+        aggregator.set_loss_fn(nn.MSELoss())
+        aggregator.optimizer = None
+
+    def train_request(self, client_id, version):
+        array_map = {"input": np.ones((4, 1), dtype="float32")}
+        if client_id == 1:
+            array_map["target"] = np.zeros((4, 1), dtype="float32")
+        tensor_map = ndarray_map_to_tensor_map(array_map)
+        tensor_map.metaData.version = version
+        return TrainRequest(clientuuid=client_id, data=tensor_map, algorithm='pt')
+
+    def train_async(self, client_id, version):
+        responses = []
+        thread = threading.Thread(target=lambda: responses.append(
+            self.service.train(self.train_request(client_id, version), None)), daemon=True)
+        thread.start()
+        return thread, responses
+
+    def wait_in_flight(self, client_id, num):
+        for _ in range(100):
+            if self.service.train_in_flight.get(client_id) == num:
+                return
+            time.sleep(0.1)
+        self.fail(f"client {client_id} does not have {num} train requests in flight")
+
+    def test_reject_and_restart(self):
+        thread1, responses1 = self.train_async(1, 1)
+        thread2, responses2 = self.train_async(1, 2)
+        self.wait_in_flight(1, 2)
+        # more than maxStaleness + 1 requests in flight
+        response = self.service.train(self.train_request(1, 3), None)
+        self.assertEqual(response.code, 1)
+        # the request waiting for the rejected one fails instead of hanging
+        thread2.join(10)
+        self.assertFalse(thread2.is_alive())
+        self.assertEqual(responses2[0].code, 1)
+        # the request already received by aggregator is still aggregated
+        response = self.service.train(self.train_request(2, 1), None)
+        self.assertEqual(response.code, 0)
+        thread1.join(10)
+        self.assertEqual(responses1[0].code, 0)
+        self.assertNotIn(1, self.service.rejected_clients)
+
+        # the restarted client starts from version 1 again
+        thread1, responses1 = self.train_async(1, 1)
+        response = self.service.train(self.train_request(2, 2), None)
+        thread1.join(10)
+        self.assertEqual(response.code, 0)
+        self.assertEqual(responses1[0].code, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
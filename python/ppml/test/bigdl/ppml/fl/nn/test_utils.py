@@ -0,0 +1,61 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import unittest
+import numpy as np
+
+from bigdl.ppml.fl.nn.utils import ndarray_map_to_tensor_map, tensor_map_to_ndarray_map
+
+
+class TestTensorMap(unittest.TestCase):
+    def setUp(self) -> None:
+        self.array_map = {"input": np.random.randn(4, 3, 2).astype("float32"),
+                          "target": np.arange(4, dtype="int64"),
+                          "loss": np.array(0.5)}
+
+    def round_trip(self, **kwargs):
+        tensor_map = ndarray_map_to_tensor_map(self.array_map, **kwargs)
+        # through the wire
+        tensor_map = type(tensor_map).FromString(tensor_map.SerializeToString())
+        return tensor_map_to_ndarray_map(tensor_map.tensorMap)
+
+    def test_bytes(self):
+        result = self.round_trip(use_bytes=True)
+        for k, v in self.array_map.items():
+            self.assertEqual(result[k].dtype, v.dtype)
+            np.testing.assert_array_equal(result[k], v)
+        self.assertTrue(result["input"].flags.writeable)
+
+    def test_legacy_float_tensor(self):
+        # the default encoding could be decoded by peers of previous versions
+        tensor_map = ndarray_map_to_tensor_map(self.array_map)
+        self.assertTrue(all(len(v.data) == 0 for v in tensor_map.tensorMap.values()))
+        result = self.round_trip()
+        np.testing.assert_array_equal(result["input"], self.array_map["input"])
+        np.testing.assert_array_equal(result["target"], self.array_map["target"])
+
+    def test_downcast(self):
+        for tensor_dtype in ["float16", "bfloat16"]:
+            result = self.round_trip(tensor_dtype=tensor_dtype)
+            self.assertEqual(result["input"].dtype, np.float32)
+            self.assertEqual(result["input"].shape, (4, 3, 2))
+            np.testing.assert_allclose(result["input"], self.array_map["input"], rtol=1e-2)
+            # only floating tensors are downcast
+            np.testing.assert_array_equal(result["target"], self.array_map["target"])
+
+
+if __name__ == '__main__':
+    unittest.main()
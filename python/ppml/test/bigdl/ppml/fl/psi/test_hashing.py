@@ -27,7 +27,16 @@ class TestHashing(FLTest):
         ids = ['1', '2', '4', '5']
         salt = str(uuid4())
         hex_string = to_hex_string(ids, salt)
-        hex_string
+        assert len(hex_string) == len(ids)
+        # hash of an id does not depend on other ids
+        assert to_hex_string(ids[1:], salt) == hex_string[1:]
+
+    def test_parallel_hashing(self):
+        ids = [str(i) for i in range(1000)]
+        salt = str(uuid4())
+        hex_string = to_hex_string(ids, salt)
+        assert parallel_to_hex_string(ids, salt, num_workers=2, chunk_size=64) == hex_string
+        assert list(iter_hex_string(iter(ids), salt, num_workers=0, chunk_size=64)) == hex_string
 
 
 if __name__ == '__main__':
@@ -0,0 +1,78 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import tempfile
+import unittest
+
+import numpy as np
+
+from bigdl.ppml.fl.psi.psi_intersection import PsiIntersection
+from bigdl.ppml.fl.psi.utils import to_hex_string
+
+
+class TestPsiIntersection(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ids = [[str(i) for i in range(0, 1000)],
+                    [str(i) for i in range(500, 1500)]]
+        self.hashed = [to_hex_string(ids, "salt") for ids in self.ids]
+        self.expected = set(to_hex_string([str(i) for i in range(500, 1000)], "salt"))
+
+    def add_splits(self, psi, split_size):
+        for client_id, hashed in enumerate(self.hashed):
+            num_split = (len(hashed) + split_size - 1) // split_size
+            # splits could arrive in any order
+            for split in reversed(range(num_split)):
+                psi.add_split(client_id, hashed[split * split_size:(split + 1) * split_size],
+                              split, num_split)
+
+    def test_intersection(self):
+        psi = PsiIntersection(2)
+        self.assertIsNone(psi.intersection_size())
+        self.add_splits(psi, 300)
+        self.assertEqual(psi.intersection_size(), 500)
+        self.assertEqual(set(psi.get_intersection()), self.expected)
+        psi.close()
+
+    def test_intersection_split(self):
+        psi = PsiIntersection(2, num_partitions=4)
+        self.add_splits(psi, 1000)
+        splits = [psi.get_intersection_split(i, 120) for i in range(5)]
+        self.assertEqual([len(s) for s in splits], [120, 120, 120, 120, 20])
+        self.assertEqual(set(sum(splits, [])), self.expected)
+        psi.close()
+
+    def test_partition_balanced(self):
+        psi = PsiIntersection(2, num_partitions=16)
+        hashed = np.array(to_hex_string([str(i) for i in range(100000)], "salt"),
+                          dtype=np.bytes_)
+        counts = np.bincount(psi.partition(hashed), minlength=16)
+        self.assertEqual(len(counts), 16)
+        # every partition gets about 1/16 of the ids
+        self.assertTrue(np.all(counts > 100000 / 16 * 0.9), counts)
+        self.assertTrue(np.all(counts < 100000 / 16 * 1.1), counts)
+        psi.close()
+
+    def test_spill(self):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            psi = PsiIntersection(2, spill_dir=spill_dir)
+            psi._store.spill_threshold = 100
+            self.add_splits(psi, 300)
+            self.assertEqual(set(psi.get_intersection()), self.expected)
+            psi.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -81,6 +81,18 @@ class TestFGBoostRegression(FLTest):
         result = fgboost_regression.predict(x)
         result
 
+    def test_predict_bulk(self):
+        self.fl_server.set_client_num(1)
+        self.fl_server.build()
+        self.fl_server.start()
+        x, y = np.random.rand(100, 3), np.random.rand(100)
+        fgboost_regression = FGBoostRegression()
+        fgboost_regression.fit(x, y, num_round=2)
+        result = fgboost_regression.predict(x)
+        for transfer in ["jtensor", "file"]:
+            result_bulk = fgboost_regression.predict_bulk(x, batchsize=16, transfer=transfer)
+            assert np.allclose(result, result_bulk)
+
     def test_save_load(self):
         self.fl_server.set_client_num(1)
         self.fl_server.build()
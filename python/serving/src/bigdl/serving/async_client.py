@@ -0,0 +1,262 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import json
+import math
+import time
+import uuid
+
+import httpx
+import redis
+import redis.asyncio as aioredis
+from bigdl.serving.client import InputQueue, OutputQueue, request_to_ndarray_dict, \
+    RESULT_PREFIX, RESULT_NOTIFY_PREFIX, SERDE_ARROW_BINARY
+from bigdl.serving.log4Error import invalidInputError, invalidOperationError
+
+
+class AsyncAPI:
+    """
+    asyncio version of API, one connection pool is shared by all coroutines,
+    requires redis-py >= 4.2 for redis.asyncio
+    """
+    def __init__(self, host=None, port=None, name="serving_stream", max_connections=100,
+                 pool_timeout=20):
+        """
+        :param max_connections: max number of connections of the Redis connection pool
+        :param pool_timeout: max seconds to wait for a free connection when all the
+        connections are in use, None means waiting forever
+        """
+        self.name = name
+        self.host = host if host else "localhost"
+        self.port = port if port else "6379"
+        # waiting results holds a connection in BLPOP, so callers wait for a free
+        # connection instead of failing with too many connections
+        pool = aioredis.BlockingConnectionPool(host=self.host, port=self.port, db=0,
+                                               max_connections=max_connections,
+                                               timeout=pool_timeout)
+        # consumer group of the stream is created by the backend source
+        self.db = aioredis.StrictRedis(connection_pool=pool)
+
+    async def close(self):
+        await self.db.close()
+        # the pool is not closed with the client when it is passed in
+        await self.db.connection_pool.disconnect()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+class AsyncInputQueue(AsyncAPI):
+    # encoding does not touch the connection, share it with InputQueue
+    data_to_buffer = InputQueue.data_to_buffer
+    data_to_b64 = InputQueue.data_to_b64
+    base64_encode_image = staticmethod(InputQueue.base64_encode_image)
+
+    def __init__(self, frontend_url=None, binary=False, fixed_shape=False, max_connections=100,
+                 max_keepalive_connections=20, **kwargs):
+        """
+        :param frontend_url: url of http frontend, if provided, requests are sent to frontend
+        :param binary: whether to write raw Arrow bytes to Redis instead of base64 string
+        :param fixed_shape: whether to encode ndarray as fixed-shape tensor
+        :param max_connections: max number of connections of Redis or http connection pool,
+        which bounds the number of predict calls in flight, others wait for a free connection
+        :param max_keepalive_connections: max number of idle http connections kept alive
+        """
+        super().__init__(max_connections=max_connections, **kwargs)
+        self.frontend_url = frontend_url
+        self.binary = binary
+        self.fixed_shape = fixed_shape
+        if self.frontend_url:
+            limits = httpx.Limits(max_keepalive_connections=max_keepalive_connections,
+                                  max_connections=max_connections)
+            self.cli = httpx.AsyncClient(limits=limits)
+        else:
+            # blocking wait of results holds a connection, so use another pool
+            self.output_queue = AsyncOutputQueue(max_connections=max_connections, **kwargs)
+
+        self.input_threshold = 0.6
+        self.interval_if_error = 1
+
+    async def predict(self, request_data, timeout=5):
+        """
+        :param request_data: same as InputQueue.predict
+        :param timeout: max seconds to wait for the result
+        :return:
+        """
+        if self.frontend_url:
+            response = await self.cli.post(self.frontend_url + "/predict",
+                                           data=request_data, timeout=timeout)
+            predictions = json.loads(response.text)['predictions']
+            processed = predictions[0].lstrip("{value=").rstrip("}")
+        else:
+            input_dict = request_to_ndarray_dict(request_data)
+            uri = str(uuid.uuid4())
+            await self.enqueue(uri, **input_dict)
+            processed = await self.output_queue.wait_and_delete(uri, timeout)
+        return processed
+
+    async def predict_batch(self, request_list, timeout=5):
+        """
+        :param request_list: list of (uri, data), data is a dict of input name to value
+        :param timeout: max seconds to wait for all the results, of 1 second granularity
+        :return: dict of uri to result, result is "[]" if not returned before timeout
+        """
+        invalidInputError(not self.frontend_url,
+                          "predict_batch is only supported without frontend_url")
+        await self.enqueue_batch(request_list)
+        return await self.output_queue.wait_and_delete_batch(
+            [uri for uri, _ in request_list], timeout)
+
+    async def enqueue(self, uri, **data):
+        await self.enqueue_batch([(uri, data)])
+
+    async def enqueue_batch(self, request_list):
+        """
+        :param request_list: list of (uri, data), data is a dict of input name to value
+        """
+        data_list = [self.__record(uri, data) for uri, data in request_list]
+        inf = await self.db.info()
+        try:
+            if inf['used_memory'] >= inf['maxmemory'] * self.input_threshold\
+                    and inf['maxmemory'] != 0:
+                invalidInputError(False, "redis connetion error")
+            pipe = self.db.pipeline(transaction=False)
+            for data in data_list:
+                pipe.xadd(self.name, data)
+            await pipe.execute()
+        except redis.exceptions.ConnectionError as e:
+            # raise instead of dropping the requests, or predict only times out
+            invalidOperationError(False, f"Failed to enqueue to Redis: {e}", cause=e)
+
+        except redis.exceptions.ResponseError as e:
+            print(e, "Please check if Redis version > 5, "
+                     "if yes, memory may be full, try dequeue or delete.")
+            await asyncio.sleep(self.interval_if_error)
+
+    def __record(self, uri, data):
+        if self.binary:
+            return {"uri": uri, "data": memoryview(self.data_to_buffer(**data)),
+                    "serde": SERDE_ARROW_BINARY}
+        return {"uri": uri, "data": self.data_to_b64(**data)}
+
+    async def close(self):
+        if self.frontend_url:
+            await self.cli.aclose()
+        else:
+            await self.output_queue.close()
+        await super().close()
+
+
+class AsyncOutputQueue(AsyncAPI):
+    # decoding does not touch the connection, share it with OutputQueue
+    decode_result = OutputQueue.decode_result
+    get_ndarray_from_b64 = OutputQueue.get_ndarray_from_b64
+    get_ndarray_from_bytes = OutputQueue.get_ndarray_from_bytes
+    get_ndarray_from_record_batch = OutputQueue.get_ndarray_from_record_batch
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    async def dequeue(self, max_items=None, chunk_size=1000):
+        """
+        :param max_items: max number of results to dequeue, None means all
+        :param chunk_size: number of results read and deleted per pipeline round trip
+        :return: dict of uri to result, the results are deleted from Redis
+        """
+        prefix = RESULT_PREFIX + self.name + ':'
+        decoded = {}
+        chunk = []
+        async for key in self.db.scan_iter(match=prefix + '*', count=chunk_size):
+            if max_items is not None and len(decoded) + len(chunk) >= max_items:
+                break
+            chunk.append(key)
+            if len(chunk) >= chunk_size:
+                decoded.update(await self.__dequeue_chunk(chunk))
+                chunk = []
+        decoded.update(await self.__dequeue_chunk(chunk))
+        return decoded
+
+    async def __dequeue_chunk(self, keys):
+        if not keys:
+            return {}
+        prefix = RESULT_PREFIX + self.name + ':'
+        uris = [key.decode('utf-8')[len(prefix):] for key in keys]
+        pipe = self.db.pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(key)
+        for uri in uris:
+            pipe.delete(prefix + uri, RESULT_NOTIFY_PREFIX + self.name + ':' + uri)
+        res_list = (await pipe.execute())[:len(keys)]
+        return {uri: self.decode_result(res_dict[b'value'])
+                for uri, res_dict in zip(uris, res_list) if res_dict}
+
+    async def query_and_delete(self, uri):
+        return await self.query(uri, True)
+
+    async def query(self, uri, delete=False):
+        res_dict = await self.db.hgetall(RESULT_PREFIX + self.name + ':' + uri)
+
+        if not res_dict or len(res_dict) == 0:
+            return "[]"
+        if delete:
+            await self.db.delete(RESULT_PREFIX + self.name + ':' + uri,
+                                 RESULT_NOTIFY_PREFIX + self.name + ':' + uri)
+        return self.decode_result(res_dict[b'value'])
+
+    async def wait_and_delete(self, uri, timeout=5):
+        """
+        :param uri: uri of the request
+        :param timeout: max seconds to wait, of 1 second granularity, see
+        OutputQueue.wait_and_delete
+        :return: ndarray result, "NaN" if inference failed, "[]" if timeout
+        """
+        res = await self.wait_and_delete_batch([uri], timeout)
+        return res[uri]
+
+    async def wait_and_delete_batch(self, uri_list, timeout=5):
+        """
+        Same as OutputQueue.wait_and_delete_batch, but other coroutines keep running
+        while waiting
+        :param uri_list: list of uris of the requests
+        :param timeout: max seconds to wait, of 1 second granularity
+        :return: dict of uri to result, result is "[]" if not returned before timeout
+        """
+        prefix = RESULT_NOTIFY_PREFIX + self.name + ':'
+        pending = {prefix + uri: uri for uri in uri_list}
+        deadline = time.time() + timeout
+        while pending:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            res = await self.db.blpop(list(pending.keys()),
+                                      timeout=max(1, int(math.ceil(remaining))))
+            if res is None:
+                break
+            pending.pop(res[0].decode('utf-8'))
+
+        # notifications are only markers, read all the results from the hashes
+        pipe = self.db.pipeline(transaction=False)
+        for uri in uri_list:
+            pipe.hgetall(RESULT_PREFIX + self.name + ':' + uri)
+        for uri in uri_list:
+            pipe.delete(RESULT_PREFIX + self.name + ':' + uri, prefix + uri)
+        res_list = await pipe.execute()
+        return {uri: self.decode_result(res_dict[b'value']) if res_dict else "[]"
+                for uri, res_dict in zip(uri_list, res_list)}
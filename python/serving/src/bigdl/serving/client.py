@@ -16,6 +16,7 @@
 
 import redis
 import time
+import math
 from bigdl.serving.schema import *
 import httpx
 import json
@@ -24,6 +25,11 @@ from bigdl.serving.log4Error import invalidInputError
 
 
 RESULT_PREFIX = "cluster-serving_"
+RESULT_NOTIFY_PREFIX = "cluster-serving-notify_"
+SERDE_ARROW_BINARY = "arrow"
+# Arrow IPC stream message starts with continuation token 0xFFFFFFFF,
+# which never appears in base64 string, used to tell binary result from base64
+ARROW_CONTINUATION = b"\xff\xff\xff\xff"
 
 
 def http_json_to_ndarray(json_str):
@@ -58,6 +64,30 @@ def http_response_to_ndarray(response):
     return "[]"
 
 
+def request_to_ndarray_dict(request_data):
+    """
+    :param request_data: json string of http request format, dict of input name
+    to value, or a single input value
+    :return: dict of input name to value
+    """
+    def json_to_ndarray_dict(json_str):
+        ndarray_dict = {}
+        data_dict = json.loads(json_str)['instances'][0]
+        for key in data_dict.keys():
+            ndarray_dict[key] = np.array(data_dict[key])
+        return ndarray_dict
+
+    try:
+        json.loads(request_data)
+        input_dict = json_to_ndarray_dict(request_data)
+    except Exception as e:
+        if isinstance(request_data, dict):
+            input_dict = request_data
+        else:
+            input_dict = {'t': request_data}
+    return input_dict
+
+
 def perdict(frontend_url, request_str):
     httpx.post(frontend_url + "/predict", data=request_str)
 
@@ -82,16 +112,25 @@ class API:
 
 
 class InputQueue(API):
-    def __init__(self, frontend_url=None, **kwargs):
+    def __init__(self, frontend_url=None, binary=False, fixed_shape=False, **kwargs):
+        """
+        :param frontend_url: url of http frontend, if provided, requests are sent to frontend
+        :param binary: whether to write raw Arrow bytes to Redis instead of base64 string,
+        which saves the encoding cost and 1/3 of the payload size
+        :param fixed_shape: whether to encode ndarray as fixed-shape tensor, which is
+        built without converting to Python list, requires the backend supporting it
+        """
         super().__init__(**kwargs)
         self.frontend_url = frontend_url
+        self.binary = binary
+        self.fixed_shape = fixed_shape
         if self.frontend_url:
             # frontend_url is provided, using frontend
             try:
                 res = httpx.get(frontend_url)
                 if res.status_code == 200:
-                    httpx.PoolLimits(max_keepalive=1, max_connections=1)
-                    self.cli = httpx.Client()
+                    limits = httpx.Limits(max_keepalive_connections=1, max_connections=1)
+                    self.cli = httpx.Client(limits=limits)
                     print("Attempt connecting to Cluster Serving frontend success")
                 else:
                     invalidInputError(False, "connection error")
@@ -107,53 +146,69 @@ class InputQueue(API):
     def predict(self, request_data, timeout=5):
         """
         :param request_data:
-        :param time_sleep:
+        :param timeout: max seconds to wait for the result, the result is
+        delivered by backend notification, so no polling is done while waiting.
+        Of 1 second granularity, see OutputQueue.wait_and_delete
         :return:
         """
-        def json_to_ndarray_dict(json_str):
-            ndarray_dict = {}
-            data_dict = json.loads(json_str)['instances'][0]
-            for key in data_dict.keys():
-                ndarray_dict[key] = np.array(data_dict[key])
-            return ndarray_dict
-
         if self.frontend_url:
             response = self.cli.post(self.frontend_url + "/predict", data=request_data)
             predictions = json.loads(response.text)['predictions']
             processed = predictions[0].lstrip("{value=").rstrip("}")
         else:
-            try:
-                json.loads(request_data)
-                input_dict = json_to_ndarray_dict(request_data)
-            except Exception as e:
-                if isinstance(request_data, dict):
-                    input_dict = request_data
-                else:
-                    input_dict = {'t': request_data}
-
+            input_dict = request_to_ndarray_dict(request_data)
             uri = str(uuid.uuid4())
             self.enqueue(uri, **input_dict)
-            processed = "[]"
-            time_sleep = 0.001
-            while time_sleep < timeout:
-                processed = self.output_queue.query_and_delete(uri)
-                if processed != "[]":
-                    break
-                time.sleep(time_sleep)
-                time_sleep += 0.001
+            processed = self.output_queue.wait_and_delete(uri, timeout)
         return processed
 
+    def predict_batch(self, request_list, timeout=5):
+        """
+        :param request_list: list of (uri, data), data is a dict of input name to value,
+        e.g. [("uri-1", {"t": ndarray}), ("uri-2", {"t": ndarray})]
+        :param timeout: max seconds to wait for all the results, of 1 second granularity
+        :return: dict of uri to result, result is "[]" if not returned before timeout
+        """
+        invalidInputError(not self.frontend_url,
+                          "predict_batch is only supported without frontend_url")
+        self.enqueue_batch(request_list)
+        return self.output_queue.wait_and_delete_batch(
+            [uri for uri, _ in request_list], timeout)
+
     def enqueue(self, uri, **data):
-        b64str = self.data_to_b64(**data)
-        d = {"uri": uri, "data": b64str}
-        self.__enqueue_data(d)
+        self.__enqueue_data(self.__record(uri, data))
+
+    def enqueue_batch(self, request_list):
+        """
+        Enqueue a list of requests, Redis memory is checked once and all the
+        records are written in one pipeline round trip
+        :param request_list: list of (uri, data), data is a dict of input name to value
+        """
+        data_list = [self.__record(uri, data) for uri, data in request_list]
+        self.__enqueue_data_batch(data_list)
+
+    def __record(self, uri, data):
+        if self.binary:
+            # pyarrow Buffer supports buffer protocol, redis writes it without copy
+            return {"uri": uri, "data": memoryview(self.data_to_buffer(**data)),
+                    "serde": SERDE_ARROW_BINARY}
+        return {"uri": uri, "data": self.data_to_b64(**data)}
 
     def data_to_b64(self, **data):
+        b = self.data_to_buffer(**data).to_pybytes()
+        b64str = self.base64_encode_image(b)
+        return b64str
+
+    def data_to_buffer(self, **data):
+        """
+        :param data: dict of input name to value
+        :return: pyarrow Buffer of Arrow IPC stream
+        """
         sink = pa.BufferOutputStream()
         field_list = []
         data_list = []
         for key, value in data.items():
-            field, data = get_field_and_data(key, value)
+            field, data = get_field_and_data(key, value, self.fixed_shape)
             field_list.append(field)
             data_list.append(data)
 
@@ -164,10 +219,7 @@ class InputQueue(API):
         writer = pa.RecordBatchStreamWriter(sink, batch.schema)
         writer.write_batch(batch)
         writer.close()
-        buf = sink.getvalue()
-        b = buf.to_pybytes()
-        b64str = self.base64_encode_image(b)
-        return b64str
+        return sink.getvalue()
 
     def enqueue_tensor(self, uri, data):
         """
@@ -212,12 +264,21 @@ class InputQueue(API):
         self.__enqueue_data(d)
 
     def __enqueue_data(self, data):
+        self.__enqueue_data_batch([data])
+
+    def __enqueue_data_batch(self, data_list):
         inf = self.db.info()
         try:
             if inf['used_memory'] >= inf['maxmemory'] * self.input_threshold\
                     and inf['maxmemory'] != 0:
                 invalidInputError(False, "redis connetion error")
-            self.db.xadd(self.name, data)
+            if len(data_list) == 1:
+                self.db.xadd(self.name, data_list[0])
+            else:
+                pipe = self.db.pipeline(transaction=False)
+                for data in data_list:
+                    pipe.xadd(self.name, data)
+                pipe.execute()
             print("Write to Redis successful")
         except redis.exceptions.ConnectionError:
             print("Redis queue is full, please wait for inference "
@@ -239,19 +300,61 @@ class OutputQueue(API):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-    def dequeue(self):
-        res_list = self.db.keys(RESULT_PREFIX + self.name + ':*')
-        decoded = {}
-        for res in res_list:
-            res_dict = self.db.hgetall(res.decode('utf-8'))
-            res_id = res.decode('utf-8').split(":")[1]
-            res_value = res_dict[b'value'].decode('utf-8')
-            if res_value == "NaN":
-                decoded[res_id] = "NaN"
-            else:
-                decoded[res_id] = self.get_ndarray_from_b64(res_value)
-            self.db.delete(res)
-        return decoded
+    def dequeue(self, max_items=None, chunk_size=1000):
+        """
+        :param max_items: max number of results to dequeue, None means all
+        :param chunk_size: number of results read and deleted per pipeline round trip
+        :return: dict of uri to result, the results are deleted from Redis
+        """
+        return dict(self.dequeue_iter(max_items, chunk_size))
+
+    def dequeue_iter(self, max_items=None, chunk_size=1000):
+        """
+        Streaming version of dequeue, result keys are found by SCAN cursor instead of
+        KEYS, which blocks Redis over the whole keyspace, and read in pipelined chunks.
+        A result is deleted once yielded, results not consumed are left in Redis
+        :param max_items: max number of results to dequeue, None means all
+        :param chunk_size: number of results read and deleted per pipeline round trip
+        :return: generator of (uri, result)
+        """
+        count = 0
+        chunk = []
+        for key in self.db.scan_iter(match=RESULT_PREFIX + self.name + ':*',
+                                     count=chunk_size):
+            if max_items is not None and count + len(chunk) >= max_items:
+                break
+            chunk.append(key)
+            if len(chunk) >= chunk_size:
+                # yield from closes the chunk as well if the caller stops early
+                count += yield from self.__dequeue_chunk(chunk)
+                chunk = []
+        yield from self.__dequeue_chunk(chunk)
+
+    def __dequeue_chunk(self, keys):
+        if not keys:
+            return 0
+        prefix = RESULT_PREFIX + self.name + ':'
+        pipe = self.db.pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(key)
+        res_list = pipe.execute()
+        yielded = []
+        try:
+            for key, res_dict in zip(keys, res_list):
+                # SCAN may return a key more than once, which is already deleted
+                if res_dict:
+                    uri = key.decode('utf-8')[len(prefix):]
+                    result = self.decode_result(res_dict[b'value'])
+                    yielded.append(uri)
+                    yield uri, result
+        finally:
+            # only delete the results handed to the caller
+            if yielded:
+                pipe = self.db.pipeline(transaction=False)
+                for uri in yielded:
+                    pipe.delete(prefix + uri, RESULT_NOTIFY_PREFIX + self.name + ':' + uri)
+                pipe.execute()
+        return len(yielded)
 
     def query_and_delete(self, uri):
         return self.query(uri, True)
@@ -262,17 +365,79 @@ class OutputQueue(API):
         if not res_dict or len(res_dict) == 0:
             return "[]"
         if delete:
-            self.db.delete(RESULT_PREFIX + self.name + ':' + uri)
-        s = res_dict[b'value'].decode('utf-8')
-        if s == "NaN":
-            return s
-        return self.get_ndarray_from_b64(s)
+            self.db.delete(RESULT_PREFIX + self.name + ':' + uri,
+                           RESULT_NOTIFY_PREFIX + self.name + ':' + uri)
+        return self.decode_result(res_dict[b'value'])
+
+    def wait_and_delete(self, uri, timeout=5):
+        """
+        Block until backend notifies the result of uri or timeout, then delete
+        the result from Redis
+        :param uri: uri of the request
+        :param timeout: max seconds to wait, rounded up to whole seconds, as Redis < 6 only
+        accepts integer timeout of BLPOP, e.g. timeout=0.1 waits up to 1 second
+        :return: ndarray result, "NaN" if inference failed, "[]" if timeout
+        """
+        notify_key = RESULT_NOTIFY_PREFIX + self.name + ':' + uri
+        # 0 would block forever
+        self.db.blpop(notify_key, timeout=max(1, int(math.ceil(timeout))))
+        # the notification is only a marker, read the result from the hash, which is
+        # also checked once on timeout, as backend may not write notification
+        return self.query_and_delete(uri)
+
+    def wait_and_delete_batch(self, uri_list, timeout=5):
+        """
+        Block until backend notifies the results of all uris or timeout, then
+        delete the results from Redis
+        :param uri_list: list of uris of the requests
+        :param timeout: max seconds to wait, of 1 second granularity like wait_and_delete
+        :return: dict of uri to result, result is "[]" if not returned before timeout
+        """
+        prefix = RESULT_NOTIFY_PREFIX + self.name + ':'
+        pending = {prefix + uri: uri for uri in uri_list}
+        deadline = time.time() + timeout
+        while pending:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            # BLPOP on all pending keys returns as soon as any result arrives
+            res = self.db.blpop(list(pending.keys()),
+                                timeout=max(1, int(math.ceil(remaining))))
+            if res is None:
+                break
+            pending.pop(res[0].decode('utf-8'))
+        return self.__read_and_delete(uri_list)
+
+    def __read_and_delete(self, uri_list):
+        # notifications are only markers, read all the results from the hashes, the
+        # pending ones are checked once as backend may not write notification
+        pipe = self.db.pipeline(transaction=False)
+        for uri in uri_list:
+            pipe.hgetall(RESULT_PREFIX + self.name + ':' + uri)
+        for uri in uri_list:
+            pipe.delete(RESULT_PREFIX + self.name + ':' + uri,
+                        RESULT_NOTIFY_PREFIX + self.name + ':' + uri)
+        res_list = pipe.execute()
+        return {uri: self.decode_result(res_dict[b'value']) if res_dict else "[]"
+                for uri, res_dict in zip(uri_list, res_list)}
+
+    def decode_result(self, b):
+        """
+        :param b: bytes of result value read from Redis, either raw Arrow bytes,
+        base64 string of Arrow bytes or "NaN"
+        """
+        if b == b"NaN":
+            return "NaN"
+        if b[:4] == ARROW_CONTINUATION:
+            return self.get_ndarray_from_bytes(b)
+        return self.get_ndarray_from_b64(b.decode('utf-8'))
 
     def get_ndarray_from_b64(self, b64str):
-        b = base64.b64decode(b64str)
-        a = pa.BufferReader(b)
-        c = a.read_buffer()
-        myreader = pa.ipc.open_stream(c)
+        return self.get_ndarray_from_bytes(base64.b64decode(b64str))
+
+    def get_ndarray_from_bytes(self, b):
+        # py_buffer wraps bytes without copy, so does open_stream on it
+        myreader = pa.ipc.open_stream(pa.py_buffer(b))
         r = [i for i in myreader]
         invalidInputError(len(r) > 0, f"len(r) should be positive, but got ${len(r)}")
         if len(r) == 1:
@@ -285,7 +450,9 @@ class OutputQueue(API):
 
     def get_ndarray_from_record_batch(self, record_batch):
         data = record_batch[0].to_numpy()
-        shape_list = record_batch[1].to_pylist()
-        shape = [i for i in shape_list if i]
+        # shape column is padded with nulls to the length of data column,
+        # do not filter by value, which drops zero-length dimensions
+        shape_array = record_batch[1]
+        shape = shape_array.slice(0, len(shape_array) - shape_array.null_count).to_numpy()
         ndarray = data.reshape(shape)
         return ndarray
@@ -14,8 +14,9 @@
 # limitations under the License.
 #
 from kafka import KafkaProducer, KafkaConsumer
-from kafka.errors import kafka_errors
+from kafka.errors import KafkaError
 import json
+import traceback
 from bigdl.serving.schema import *
 from bigdl.serving.log4Error import invalidInputError
 
@@ -23,7 +24,16 @@ from bigdl.serving.log4Error import invalidInputError
 RESULT_PREFIX = "cluster-serving_"
 
 class InputQueue:
-    def __init__(self, frontend_url=None, **kwargs):
+    def __init__(self, frontend_url=None, linger_ms=0, batch_size=16384,
+                 compression_type=None, **kwargs):
+        """
+        :param frontend_url: not used, kept for consistency with Redis InputQueue
+        :param linger_ms: max milliseconds producer waits to batch records of same partition
+        :param batch_size: max bytes of a record batch of one partition
+        :param compression_type: compression of record batches, one of None, 'gzip',
+        'snappy', 'lz4' and 'zstd', larger batch is compressed better
+        :param kwargs: host, port, topic_name and other KafkaProducer configs
+        """
         host = kwargs.get("host") if kwargs.get("host") else "localhost"
         port = kwargs.get("port") if kwargs.get("port") else "9092"
         self.topic_name = kwargs.get("topic_name") if kwargs.get("topic_name") else "serving_stream"
@@ -35,12 +45,46 @@ class InputQueue:
         self.db = KafkaProducer(bootstrap_servers=host+":"+port,
                                 key_serializer=lambda k: json.dumps(k).encode('utf-8'),
                                 value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+                                linger_ms=linger_ms,
+                                batch_size=batch_size,
+                                compression_type=compression_type,
                                 **kwargs)
         
     def enqueue(self, uri, **data):
         b64str = self.data_to_b64(**data)
         d = {"key":uri, "value":{"uri":uri, "data":b64str}}        
         self.__enqueue_data(d)
+
+    def enqueue_async(self, uri, **data):
+        """
+        Send a request without waiting for the delivery, records are batched by
+        producer according to linger_ms and batch_size
+        :return: kafka FutureRecordMetadata, call get(timeout) to wait for the delivery
+        """
+        b64str = self.data_to_b64(**data)
+        return self.db.send(self.topic_name, key=uri, value={"uri": uri, "data": b64str})
+
+    def enqueue_batch(self, request_list, timeout=10):
+        """
+        Send a list of requests and wait for all of them delivered, the records are
+        sent in batches instead of one round trip per record
+        :param request_list: list of (uri, data), data is a dict of input name to value
+        :param timeout: max seconds to wait for the delivery
+        :return: list of uris failed to deliver
+        """
+        futures = [(uri, self.enqueue_async(uri, **data)) for uri, data in request_list]
+        self.db.flush(timeout=timeout)
+        failed = []
+        for uri, future in futures:
+            try:
+                future.get(timeout=timeout)
+            except KafkaError:
+                print(traceback.format_exc())
+                failed.append(uri)
+        return failed
+
+    def flush(self, timeout=None):
+        self.db.flush(timeout=timeout)
     
     def data_to_b64(self, **data):
         sink = pa.BufferOutputStream()
@@ -68,8 +112,8 @@ class InputQueue:
         future = self.db.send(self.topic_name, **data)
         try:
             future.get(timeout=10) # check if send successfully
-        except kafka_errors:  # throw kafka_errors if failed
-            traceback.format_exc()
+        except KafkaError:  # throw KafkaError if failed
+            print(traceback.format_exc())
         print("Write to Kafka successful")
     
     @staticmethod
@@ -95,23 +139,56 @@ class OutputQueue:
         self.db = KafkaConsumer(self.topic_name, bootstrap_servers=host+":"+port, 
                                 group_id=group_id, auto_offset_reset=auto_offset_reset, **kwargs)
         
-    def dequeue(self):
+    def dequeue(self, max_records=None, timeout_ms=500):
+        """
+        :param max_records: max number of records of one poll, None means the
+        max_poll_records config of consumer
+        :param timeout_ms: max milliseconds to wait if no record is available
+        :return: dict of uri to result
+        """
         # poll get records
-        records = self.db.poll(timeout_ms = 500)
+        records = self.db.poll(timeout_ms=timeout_ms, max_records=max_records)
         self.db.commit()
-        decoded = {}
-        for tp, messages in records.items():
-                for message in messages:
-                    res_id = message.key.decode()
-                    res_value = message.value.decode()
-                    decoded[res_id] = self.get_ndarray_from_b64(res_value)  # decode value
-        return decoded
+        messages = [message for tp_messages in records.values() for message in tp_messages]
+        return self.decode_messages(messages)
+
+    def dequeue_batch(self, num_records, timeout_ms=500):
+        """
+        Poll until num_records results are received or a poll returns nothing,
+        offsets are committed once for all the polls
+        :param num_records: number of results to receive
+        :param timeout_ms: max milliseconds to wait for one poll
+        :return: dict of uri to result
+        """
+        messages = []
+        while len(messages) < num_records:
+            records = self.db.poll(timeout_ms=timeout_ms,
+                                   max_records=num_records - len(messages))
+            if not records:
+                break
+            for tp_messages in records.values():
+                messages.extend(tp_messages)
+        self.db.commit()
+        return self.decode_messages(messages)
+
+    def decode_messages(self, messages):
+        """
+        Decode polled messages, "NaN" is returned for failed records. Each result is a
+        separate Arrow stream, so messages are still decoded one by one, only the polls
+        and commits are batched by dequeue and dequeue_batch
+        :return: dict of uri to result
+        """
+        keys = [message.key.decode() for message in messages]
+        values = [message.value for message in messages]
+        raw = [None if v == b"NaN" else base64.b64decode(v) for v in values]
+        return {k: "NaN" if b is None else self.get_ndarray_from_bytes(b)
+                for k, b in zip(keys, raw)}
     
     def get_ndarray_from_b64(self, b64str):
-        b = base64.b64decode(b64str)
-        a = pa.BufferReader(b)
-        c = a.read_buffer()
-        myreader = pa.ipc.open_stream(c)
+        return self.get_ndarray_from_bytes(base64.b64decode(b64str))
+
+    def get_ndarray_from_bytes(self, b):
+        myreader = pa.ipc.open_stream(pa.py_buffer(b))
         r = [i for i in myreader]
         invalidInputError(len(r) > 0, f"expect len(r) be positive, but got ${len(r)}")
         if len(r) == 1:
@@ -124,8 +201,8 @@ class OutputQueue:
 
     def get_ndarray_from_record_batch(self, record_batch):
         data = record_batch[0].to_numpy()
-        shape_list = record_batch[1].to_pylist()
-        shape = [i for i in shape_list if i]
+        shape_array = record_batch[1]
+        shape = shape_array.slice(0, len(shape_array) - shape_array.null_count).to_numpy()
         ndarray = data.reshape(shape)
         return ndarray
     
@@ -21,7 +21,16 @@ import base64
 from bigdl.serving.log4Error import invalidInputError
 
 
-def get_field_and_data(key, value):
+def get_field_and_data(key, value, fixed_shape=False):
+    """
+    :param key: name of the input
+    :param value: value of the input
+    :param fixed_shape: whether to encode ndarray as fixed-shape tensor, see
+    get_fixed_shape_field_and_data
+    :return: Arrow field and Arrow array of the input
+    """
+    if fixed_shape and isinstance(value, np.ndarray):
+        return get_fixed_shape_field_and_data(key, value)
     if isinstance(value, list):
         invalidInputError(len(value) > 0, "empty list is not supported")
         sample = value[0]
@@ -107,6 +116,34 @@ def get_field_and_data(key, value):
                           "please check.")
 
 
+def get_fixed_shape_field_and_data(key, value):
+    """
+    Encode ndarray as one FixedSizeList of float32 with the shape in field metadata,
+    the data buffer is built from ndarray without converting to Python list
+    :param key: name of the input
+    :param value: ndarray
+    :return: Arrow field and Arrow array of the input
+    """
+    invalidInputError(value.size > 0, "empty ndarray is not supported in fixed shape encoding")
+    d = np.ascontiguousarray(value, dtype="float32").reshape(-1)
+    field = pa.field(key, pa.list_(pa.float32(), d.size),
+                     metadata={"shape": ",".join(str(i) for i in value.shape)})
+    data = pa.FixedSizeListArray.from_arrays(pa.array(d), d.size)
+    return field, data
+
+
+def get_ndarray_from_fixed_shape(field, array):
+    """
+    Decode the result of get_fixed_shape_field_and_data without copy
+    :param field: Arrow field of the input
+    :param array: Arrow FixedSizeListArray of the input
+    :return: ndarray, read only as it shares the memory of Arrow buffer
+    """
+    shape_str = field.metadata[b"shape"].decode("utf-8")
+    shape = [int(i) for i in shape_str.split(",")] if shape_str else []
+    return array.flatten().to_numpy().reshape(shape)
+
+
 def encode_image(img):
     """
     :param id: String you use to identify this record
@@ -14,7 +14,13 @@
 # limitations under the License.
 #
 
+import asyncio
+
+import numpy as np
+import pytest
+
 from bigdl.serving.client import InputQueue, OutputQueue
+from bigdl.serving.async_client import AsyncInputQueue, AsyncOutputQueue
 
 
 class TestClient:
@@ -50,3 +56,200 @@ class TestClient:
         assert output_api.name == "my-test"
         assert output_api.host == "1.1.1.1"
         assert output_api.port == "1111"
+
+    def test_wait_and_delete(self):
+        class NotifiedRedis:
+            def __init__(self):
+                self.deleted = []
+
+            def blpop(self, key, timeout):
+                assert key == "cluster-serving-notify_my-test:uri-1"
+                # rounded up to whole seconds
+                assert timeout == 1
+                # the notification is a marker, the result is in the hash
+                return key.encode(), b"1"
+
+            def hgetall(self, key):
+                assert key == "cluster-serving_my-test:uri-1"
+                return {b"value": b"NaN"}
+
+            def delete(self, *keys):
+                self.deleted.extend(keys)
+
+        output_api = OutputQueue(host="1.1.1.1", port="1111", name="my-test")
+        output_api.db = NotifiedRedis()
+        assert output_api.wait_and_delete("uri-1", timeout=0.1) == "NaN"
+        assert "cluster-serving_my-test:uri-1" in output_api.db.deleted
+        assert "cluster-serving-notify_my-test:uri-1" in output_api.db.deleted
+
+    def test_wait_and_delete_batch(self):
+        class FakePipeline:
+            def __init__(self, db):
+                self.db = db
+                self.results = []
+
+            def hgetall(self, key):
+                self.results.append(self.db.hashes.get(key, {}))
+
+            def delete(self, *keys):
+                self.db.deleted.extend(keys)
+                self.results.append(len(keys))
+
+            def execute(self):
+                return self.results
+
+        class NotifiedRedis:
+            def __init__(self):
+                self.deleted = []
+                self.hashes = {"cluster-serving_my-test:uri-1": {b"value": b"NaN"}}
+
+            def blpop(self, keys, timeout):
+                if "cluster-serving-notify_my-test:uri-1" in keys:
+                    return b"cluster-serving-notify_my-test:uri-1", b"1"
+                return None
+
+            def pipeline(self, transaction=True):
+                return FakePipeline(self)
+
+        output_api = OutputQueue(host="1.1.1.1", port="1111", name="my-test")
+        output_api.db = NotifiedRedis()
+        res = output_api.wait_and_delete_batch(["uri-1", "uri-2"], timeout=1)
+        assert res == {"uri-1": "NaN", "uri-2": "[]"}
+        assert "cluster-serving_my-test:uri-2" in output_api.db.deleted
+
+    def test_dequeue_iter(self):
+        class FakePipeline:
+            def __init__(self, db):
+                self.db = db
+                self.results = []
+
+            def hgetall(self, key):
+                self.results.append(self.db.hashes.get(key, {}))
+
+            def delete(self, *keys):
+                for key in keys:
+                    self.db.hashes.pop(key.encode(), None)
+                self.results.append(len(keys))
+
+            def execute(self):
+                return self.results
+
+        class ResultRedis:
+            def __init__(self):
+                self.hashes = {("cluster-serving_my-test:uri-%d" % i).encode(): {b"value": b"NaN"}
+                               for i in range(5)}
+
+            def scan_iter(self, match, count):
+                return iter(list(self.hashes.keys()))
+
+            def pipeline(self, transaction=True):
+                return FakePipeline(self)
+
+        output_api = OutputQueue(host="1.1.1.1", port="1111", name="my-test")
+        output_api.db = ResultRedis()
+        res = dict(output_api.dequeue_iter(max_items=3, chunk_size=2))
+        assert len(res) == 3
+        assert len(output_api.db.hashes) == 2
+        assert output_api.dequeue() == {"uri-3": "NaN", "uri-4": "NaN"}
+
+    def test_dequeue_iter_stop_in_chunk(self):
+        class FakePipeline:
+            def __init__(self, db):
+                self.db = db
+                self.results = []
+
+            def hgetall(self, key):
+                self.results.append(self.db.hashes.get(key, {}))
+
+            def delete(self, *keys):
+                for key in keys:
+                    self.db.hashes.pop(key.encode(), None)
+                self.results.append(len(keys))
+
+            def execute(self):
+                return self.results
+
+        class ResultRedis:
+            def __init__(self):
+                self.hashes = {("cluster-serving_my-test:uri-%d" % i).encode(): {b"value": b"NaN"}
+                               for i in range(5)}
+
+            def scan_iter(self, match, count):
+                return iter(list(self.hashes.keys()))
+
+            def pipeline(self, transaction=True):
+                return FakePipeline(self)
+
+        output_api = OutputQueue(host="1.1.1.1", port="1111", name="my-test")
+        output_api.db = ResultRedis()
+        it = output_api.dequeue_iter(chunk_size=4)
+        # stop at the 2nd result of the 1st chunk
+        assert [next(it), next(it)] == [("uri-0", "NaN"), ("uri-1", "NaN")]
+        it.close()
+        # the rest of the chunk is not deleted
+        assert output_api.dequeue() == {"uri-%d" % i: "NaN" for i in range(2, 5)}
+        assert not output_api.db.hashes
+
+    def test_async_default_config(self):
+        input_api = AsyncInputQueue(host="1.1.1.1", port="1111", name="my-test")
+        input_api2 = AsyncInputQueue(frontend_url="1.1.1.1:1", max_connections=8)
+        assert input_api.name == "my-test"
+        assert input_api.output_queue.name == "my-test"
+        assert input_api.output_queue.host == "1.1.1.1"
+        assert input_api2.frontend_url == "1.1.1.1:1"
+
+    def test_async_connection_pool(self):
+        import redis.asyncio as aioredis
+        input_api = AsyncInputQueue(name="my-test", max_connections=8, pool_timeout=1)
+        for db in [input_api.db, input_api.output_queue.db]:
+            assert isinstance(db.connection_pool, aioredis.BlockingConnectionPool)
+            assert db.connection_pool.max_connections == 8
+            assert db.connection_pool.timeout == 1
+
+    def test_async_enqueue_connection_error(self):
+        import redis
+
+        class FailedPipeline:
+            def xadd(self, name, data):
+                pass
+
+            async def execute(self):
+                raise redis.exceptions.ConnectionError("No connection available.")
+
+        class FailedRedis:
+            async def info(self):
+                return {"used_memory": 0, "maxmemory": 0}
+
+            def pipeline(self, transaction=True):
+                return FailedPipeline()
+
+        input_api = AsyncInputQueue(name="my-test")
+        input_api.db = FailedRedis()
+        # the request is not dropped silently
+        with pytest.raises(redis.exceptions.ConnectionError):
+            asyncio.run(input_api.enqueue("uri-1", t=np.array([1, 2])))
+
+    def test_async_wait_and_delete(self):
+        class AsyncPipeline:
+            def __init__(self):
+                self.results = []
+
+            def hgetall(self, key):
+                self.results.append({b"value": b"NaN"})
+
+            def delete(self, *keys):
+                self.results.append(len(keys))
+
+            async def execute(self):
+                return self.results
+
+        class AsyncNotifiedRedis:
+            async def blpop(self, keys, timeout):
+                return keys[0].encode(), b"1"
+
+            def pipeline(self, transaction=True):
+                return AsyncPipeline()
+
+        output_api = AsyncOutputQueue(name="my-test")
+        output_api.db = AsyncNotifiedRedis()
+        assert asyncio.run(output_api.wait_and_delete("uri-1", timeout=1)) == "NaN"
@@ -0,0 +1,127 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import base64
+from collections import namedtuple
+
+import numpy as np
+import pyarrow as pa
+from kafka.errors import KafkaError
+
+import bigdl.serving.kafka.client as kafka_client
+from bigdl.serving.kafka.client import InputQueue, OutputQueue
+
+Message = namedtuple("Message", ["key", "value"])
+
+
+class FakeFuture:
+    def __init__(self, error=None):
+        self.error = error
+
+    def get(self, timeout=None):
+        if self.error:
+            raise self.error
+        return None
+
+
+class FakeProducer:
+    def __init__(self, **kwargs):
+        self.sent = []
+        self.flushed = 0
+
+    def send(self, topic, key, value):
+        self.sent.append((topic, key, value))
+        return FakeFuture(KafkaError("failed") if key == "uri-bad" else None)
+
+    def flush(self, timeout=None):
+        self.flushed += 1
+
+
+class FakeConsumer:
+    def __init__(self, *topics, **kwargs):
+        self.messages = []
+        self.max_poll_records = 500
+        self.polls = []
+        self.commits = 0
+
+    def poll(self, timeout_ms, max_records=None):
+        self.polls.append(max_records)
+        num = self.max_poll_records if max_records is None \
+            else min(max_records, self.max_poll_records)
+        polled, self.messages = self.messages[:num], self.messages[num:]
+        return {"partition-0": polled} if polled else {}
+
+    def commit(self):
+        self.commits += 1
+
+
+def result_message(uri, arr):
+    # result of serving: a record batch of flattened data and shape padded with nulls
+    data = arr.astype("float32").flatten()
+    shape = list(arr.shape) + [None] * (len(data) - arr.ndim)
+    batch = pa.RecordBatch.from_arrays([pa.array(data), pa.array(shape, type=pa.int32())],
+                                       ["data", "shape"])
+    sink = pa.BufferOutputStream()
+    writer = pa.RecordBatchStreamWriter(sink, batch.schema)
+    writer.write_batch(batch)
+    writer.close()
+    return Message(uri.encode(), base64.b64encode(sink.getvalue().to_pybytes()))
+
+
+class TestKafkaClient:
+    def test_enqueue_batch(self, monkeypatch):
+        monkeypatch.setattr(kafka_client, "KafkaProducer", FakeProducer)
+        input_api = InputQueue(topic_name="my-test")
+        requests = [("uri-%d" % i, {"t": np.ones((2, 2)) * i}) for i in range(3)]
+        failed = input_api.enqueue_batch(requests + [("uri-bad", {"t": np.ones(2)})])
+        assert failed == ["uri-bad"]
+        assert input_api.db.flushed == 1
+        assert [(topic, key) for topic, key, _ in input_api.db.sent] == \
+            [("my-test", "uri-%d" % i) for i in range(3)] + [("my-test", "uri-bad")]
+        assert input_api.db.sent[1][2] == {"uri": "uri-1",
+                                           "data": input_api.data_to_b64(t=np.ones((2, 2)))}
+
+    def test_dequeue(self, monkeypatch):
+        monkeypatch.setattr(kafka_client, "KafkaConsumer", FakeConsumer)
+        output_api = OutputQueue(topic_name="my-test")
+        output_api.db.messages = [result_message("uri-%d" % i, np.arange(6).reshape(2, 3) + i)
+                                  for i in range(3)] + [Message(b"uri-3", b"NaN")]
+        res = output_api.dequeue(max_records=2, timeout_ms=10)
+        assert list(res.keys()) == ["uri-0", "uri-1"]
+        np.testing.assert_array_equal(res["uri-1"], np.arange(6).reshape(2, 3) + 1)
+        assert output_api.db.polls == [2] and output_api.db.commits == 1
+        res = output_api.dequeue()
+        assert res["uri-3"] == "NaN"
+        assert res["uri-2"].shape == (2, 3)
+        assert output_api.dequeue() == {}
+
+    def test_dequeue_batch(self, monkeypatch):
+        monkeypatch.setattr(kafka_client, "KafkaConsumer", FakeConsumer)
+        output_api = OutputQueue(topic_name="my-test")
+        output_api.db.messages = [result_message("uri-%d" % i, np.ones(4) * i)
+                                  for i in range(5)]
+        # each poll asks for the remaining records only, offsets are committed once
+        output_api.db.max_poll_records = 2
+        res = output_api.dequeue_batch(4)
+        assert list(res.keys()) == ["uri-%d" % i for i in range(4)]
+        np.testing.assert_array_equal(res["uri-3"], np.ones(4) * 3)
+        assert output_api.db.polls == [4, 2]
+        assert output_api.db.commits == 1
+        # stops when a poll returns nothing
+        res = output_api.dequeue_batch(4)
+        assert list(res.keys()) == ["uri-4"]
+        assert output_api.db.polls[2:] == [4, 3]
+
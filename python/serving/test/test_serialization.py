@@ -31,6 +31,13 @@ class TestSerialization:
         b64 = input_api.data_to_b64(t1=np.array([1, 2]), t2=np.array([3, 4]))
         byte = base64.b64decode(b64)
 
+    def test_encode_binary(self):
+        input_api = InputQueue(binary=True)
+        buf = input_api.data_to_buffer(t1=np.array([1, 2]), t2=np.array([3, 4]))
+        b64 = input_api.data_to_b64(t1=np.array([1, 2]), t2=np.array([3, 4]))
+        assert buf.to_pybytes() == base64.b64decode(b64)
+        assert buf.to_pybytes()[:4] == b"\xff\xff\xff\xff"
+
     def test_http_response_to_ndarray(self):
         with open(os.path.join(resource_path, "http_response")) as f:
             data = f.read()
@@ -38,3 +45,12 @@ class TestSerialization:
             assert isinstance(arr, np.ndarray)
             assert len(arr.shape) == 1
             assert arr.shape[0] == 128
+
+    def test_fixed_shape_round_trip(self):
+        from bigdl.serving.schema import get_field_and_data, get_ndarray_from_fixed_shape
+        arr = np.arange(24).reshape(2, 3, 4)
+        field, data = get_field_and_data("t", arr, fixed_shape=True)
+        res = get_ndarray_from_fixed_shape(field, data)
+        assert res.shape == (2, 3, 4)
+        assert res.dtype == np.float32
+        assert np.array_equal(res, arr)
@@ -110,6 +110,22 @@ abstract class FGBoostModel(continuous: Boolean,
       Tensor[Float](Array(value), Array(1))
     }
   }
+  /**
+   * Predict input in batches, each batch is one predict request to FLServer,
+   * so all the clients should use the same batchSize
+   * @param feature the input data
+   * @param batchSize number of records per predict request
+   * @return predict result
+   */
+  def predictInBatch(feature: Array[Tensor[Float]], batchSize: Int): Array[Float] = {
+    Log4Error.invalidInputError(batchSize > 0, s"batchSize should be positive, got $batchSize")
+    val result = new Array[Float](feature.length)
+    feature.grouped(batchSize).zipWithIndex.foreach { case (batch, i) =>
+      val batchResult = predictTree(batch)
+      System.arraycopy(batchResult, 0, result, i * batchSize, batchResult.length)
+    }
+    result
+  }
   /**
    * Use server tree to predict input
    * @param inputs the input data
@@ -25,6 +25,8 @@ import com.intel.analytics.bigdl.ppml.fl.algorithms.{FGBoostRegression, PSI}
 import com.intel.analytics.bigdl.ppml.fl.fgboost.FGBoostModel
 import com.intel.analytics.bigdl.ppml.fl.utils.{FLClientClosable, TimingSupportive}
 
+import java.nio.{ByteBuffer, ByteOrder}
+import java.nio.file.{Files, Paths}
 import java.util.{List => JList}
 import scala.collection.JavaConverters._
 import scala.collection.mutable.ArrayBuffer
@@ -171,6 +173,44 @@ class PythonPPML[T: ClassTag](implicit ev: TensorNumeric[T])
     val result = model.predict(tensorArray).map(_.storage().array())
     JTensor(result.flatten, Array(result.length, result(0).length), bigdlType = "float")
   }
+  def fgBoostPredictInBatch(model: FGBoostModel, feature: JTensor, batchSize: Int): JTensor = {
+    val tensorArray = jTensorToTensorArray(feature)
+    val result = model.predictInBatch(tensorArray, batchSize)
+    JTensor(result, Array(result.length), bigdlType = "float")
+  }
+
+  /**
+   * Predict the feature in a file written by numpy tofile, and write the result to resultPath
+   * in the same way, so large data is not transferred through Py4J
+   * @param featurePath path of little endian float32 feature, row major
+   * @param featureNum number of columns of feature
+   * @param resultPath path to write little endian float32 result
+   * @param batchSize number of records per predict request
+   * @return number of records predicted
+   */
+  def fgBoostPredictFile(model: FGBoostModel,
+                         featurePath: String,
+                         featureNum: Int,
+                         resultPath: String,
+                         batchSize: Int): Int = {
+    val storage = timing("Read feature file") {
+      val buffer = ByteBuffer.wrap(Files.readAllBytes(Paths.get(featurePath)))
+        .order(ByteOrder.LITTLE_ENDIAN).asFloatBuffer()
+      val array = new Array[Float](buffer.remaining())
+      buffer.get(array)
+      array
+    }
+    val tensorArray = storage.grouped(featureNum).map(array => {
+      Tensor[Float](array, Array(array.length))
+    }).toArray
+    val result = model.predictInBatch(tensorArray, batchSize)
+    timing("Write result file") {
+      val buffer = ByteBuffer.allocate(result.length * 4).order(ByteOrder.LITTLE_ENDIAN)
+      buffer.asFloatBuffer().put(result)
+      Files.write(Paths.get(resultPath), buffer.array())
+    }
+    result.length
+  }
   def fgBoostRegressionSave(model: FGBoostRegression, dest: String): Unit = {
     model.saveModel(dest)
   }
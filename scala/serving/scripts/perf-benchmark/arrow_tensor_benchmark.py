@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+# Micro-benchmark of tensor encoding of Cluster Serving client,
+# compares the default struct encoding with the fixed shape encoding.
+
+import argparse
+import time
+
+import numpy as np
+import pyarrow as pa
+from bigdl.serving.schema import get_field_and_data, get_ndarray_from_fixed_shape
+
+
+def encode(arr, fixed_shape):
+    field, data = get_field_and_data("t", arr, fixed_shape)
+    batch = pa.RecordBatch.from_arrays([data], pa.schema([field]))
+    sink = pa.BufferOutputStream()
+    writer = pa.RecordBatchStreamWriter(sink, batch.schema)
+    writer.write_batch(batch)
+    writer.close()
+    return sink.getvalue()
+
+
+def decode(buf, fixed_shape):
+    batch = pa.ipc.open_stream(buf).read_next_batch()
+    if fixed_shape:
+        return get_ndarray_from_fixed_shape(batch.schema.field(0), batch.column(0))
+    # struct encoding, rows are indiceData, indiceShape, data, shape
+    column = batch.column(0)
+    data = column.field("data")[2].values.to_numpy()
+    shape = column.field("shape")[3].values.to_pylist()
+    return data.reshape(shape)
+
+
+def bench(name, arr, fixed_shape, iterations):
+    buf = encode(arr, fixed_shape)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        encode(arr, fixed_shape)
+    encode_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode(buf, fixed_shape)
+    decode_time = time.perf_counter() - start
+    np.testing.assert_allclose(decode(buf, fixed_shape), arr.astype("float32"))
+    print("%-12s %-12s encode %10.1f /s, decode %10.1f /s, %d bytes"
+          % (name, "fixed_shape" if fixed_shape else "struct",
+             iterations / encode_time, iterations / decode_time, buf.size))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--iterations', type=int, default=200,
+                        help="number of encode and decode per case")
+    args = parser.parse_args()
+    cases = {"image": np.random.rand(224, 224, 3).astype("float32"),
+             "embedding": np.random.rand(1024).astype("float32")}
+    for name, arr in cases.items():
+        for fixed_shape in [False, True]:
+            bench(name, arr, fixed_shape, args.iterations)
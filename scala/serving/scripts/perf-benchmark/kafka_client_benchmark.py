@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+# Benchmark of Kafka Cluster Serving client against an in-process Kafka stand-in,
+# compares per record send/poll with batched send/poll.
+
+import argparse
+import base64
+import json
+import time
+from collections import namedtuple
+
+import numpy as np
+import pyarrow as pa
+from bigdl.serving.kafka.client import InputQueue, OutputQueue
+
+Message = namedtuple("Message", ["key", "value"])
+
+
+class StandInFuture:
+    def __init__(self, broker):
+        self.broker = broker
+        self.done = False
+
+    def get(self, timeout=None):
+        while not self.done:
+            self.broker.round_trip()
+
+
+class StandInBroker:
+    """
+    Costs one network round trip of rtt seconds per produce or fetch request,
+    pending records are sent in batches of at most batch_records
+    """
+    def __init__(self, rtt, batch_records):
+        self.rtt = rtt
+        self.batch_records = batch_records
+        self.pending = []
+        self.log = []
+
+    def round_trip(self):
+        time.sleep(self.rtt)
+        batch, self.pending = self.pending[:self.batch_records], self.pending[self.batch_records:]
+        for future, message in batch:
+            future.done = True
+            self.log.append(message)
+
+    # producer API
+    def send(self, topic, key=None, value=None):
+        future = StandInFuture(self)
+        self.pending.append((future, Message(json.dumps(key).encode(),
+                                             json.dumps(value).encode())))
+        return future
+
+    def flush(self, timeout=None):
+        while self.pending:
+            self.round_trip()
+
+    # consumer API
+    def poll(self, timeout_ms=0, max_records=None):
+        time.sleep(self.rtt)
+        max_records = max_records if max_records else 500
+        records, self.log = self.log[:max_records], self.log[max_records:]
+        return {0: records} if records else {}
+
+    def commit(self):
+        pass
+
+
+def result_message(uri, arr):
+    data = pa.array(arr.reshape(-1))
+    shape = pa.array(list(arr.shape) + [None] * (arr.size - arr.ndim), type=pa.int32())
+    batch = pa.RecordBatch.from_arrays([data, shape], ["data", "shape"])
+    sink = pa.BufferOutputStream()
+    writer = pa.RecordBatchStreamWriter(sink, batch.schema)
+    writer.write_batch(batch)
+    writer.close()
+    return Message(uri.encode(), base64.b64encode(sink.getvalue().to_pybytes()))
+
+
+def bench_input(args):
+    requests = [("uri-%d" % i, {"t": np.random.rand(args.dim).astype("float32")})
+                for i in range(args.num)]
+    input_api = InputQueue.__new__(InputQueue)
+    input_api.topic_name = "serving_stream"
+
+    input_api.db = StandInBroker(args.rtt, args.batch_records)
+    start = time.perf_counter()
+    for uri, data in requests:
+        input_api.enqueue(uri, **data)
+    print("enqueue per record:    %10.1f records/s" % (args.num / (time.perf_counter() - start)))
+
+    input_api.db = StandInBroker(args.rtt, args.batch_records)
+    start = time.perf_counter()
+    input_api.enqueue_batch(requests)
+    print("enqueue_batch:         %10.1f records/s" % (args.num / (time.perf_counter() - start)))
+
+
+def bench_output(args):
+    messages = [result_message("uri-%d" % i, np.random.rand(args.dim).astype("float32"))
+                for i in range(args.num)]
+    output_api = OutputQueue.__new__(OutputQueue)
+
+    output_api.db = StandInBroker(args.rtt, args.batch_records)
+    output_api.db.log = list(messages)
+    start = time.perf_counter()
+    for _ in range(args.num):
+        output_api.dequeue(max_records=1)
+    print("dequeue per record:    %10.1f records/s" % (args.num / (time.perf_counter() - start)))
+
+    output_api.db = StandInBroker(args.rtt, args.batch_records)
+    output_api.db.log = list(messages)
+    start = time.perf_counter()
+    res = output_api.dequeue_batch(args.num)
+    assert len(res) == args.num
+    print("dequeue_batch:         %10.1f records/s" % (args.num / (time.perf_counter() - start)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--num', type=int, default=2000, help="number of records")
+    parser.add_argument('-d', '--dim', type=int, default=1024, help="dim of each tensor")
+    parser.add_argument('--rtt', type=float, default=0.0005,
+                        help="seconds of one round trip to the stand-in broker")
+    parser.add_argument('--batch_records', type=int, default=500,
+                        help="max records of one produce request")
+    args = parser.parse_args()
+    bench_input(args)
+    bench_output(args)
@@ -53,6 +53,7 @@ class ClusterServingHelper
   @BeanProperty var redisUrl = "localhost:6379"
   @BeanProperty var redisMaxMemory = "4g"
   @BeanProperty var redisTimeout = 5000
+  @BeanProperty var redisBinaryResult = false
 
   // secure attributes
   @BeanProperty var redisSecureEnabled = false
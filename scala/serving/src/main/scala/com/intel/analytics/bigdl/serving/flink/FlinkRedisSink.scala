@@ -55,7 +55,12 @@ class FlinkRedisSink(helperSer: ClusterServingHelper)
     val ppl = jedis.pipelined()
     var cnt = 0
     value.foreach(v => {
-      RedisUtils.writeHashMap(ppl, v._1, v._2, helper.jobName)
+      if (helper.redisBinaryResult && v._2 != "NaN") {
+        RedisUtils.writeBinary(ppl, v._1, v._2, helper.jobName)
+      } else {
+        RedisUtils.writeHashMap(ppl, v._1, v._2, helper.jobName)
+        RedisUtils.writeNotification(ppl, v._1, helper.jobName)
+      }
       if (v._2 != "NaN") {
         cnt += 1
       }
@@ -16,7 +16,7 @@
 
 package com.intel.analytics.bigdl.serving.flink
 
-import java.util.AbstractMap.SimpleEntry
+import java.nio.charset.StandardCharsets
 import java.util.UUID
 
 import com.intel.analytics.bigdl.serving.{ClusterServing, ClusterServingHelper}
@@ -48,26 +48,42 @@ class FlinkRedisSource()
     val consumerName = "consumer-" + UUID.randomUUID().toString
     val readNumPerTime = if (helper.modelType == "openvino") helper.threadPerModel else 1
 
+    // read with binary API, data field of binary serde is not valid UTF-8
     val response = jedis.xreadGroup(
-      groupName,
-      consumerName,
+      groupName.getBytes(StandardCharsets.UTF_8),
+      consumerName.getBytes(StandardCharsets.UTF_8),
       readNumPerTime,
       1,
       false,
-      new SimpleEntry(helper.jobName, StreamEntryID.UNRECEIVED_ENTRY))
+      Map(helper.jobName.getBytes(StandardCharsets.UTF_8) ->
+        StreamEntryID.UNRECEIVED_ENTRY.toString.getBytes(StandardCharsets.UTF_8)).asJava)
     if (response != null) {
-      for (streamMessages <- response.asScala) {
-        val key = streamMessages.getKey
-        val entries = streamMessages.getValue.asScala
-        val it = entries.map(e => {
-          (e.getFields.get("uri"), e.getFields.get("data"), e.getFields.get("serde"))
-        }).toList
+      // binary reply is raw nested lists, each stream reply is
+      // [streamName, [[entryId, [field, value, ...]], ...]]
+      for (streamMessages <- response.asInstanceOf[java.util.List[AnyRef]].asScala) {
+        val entries = streamMessages.asInstanceOf[java.util.List[AnyRef]].get(1)
+          .asInstanceOf[java.util.List[java.util.List[AnyRef]]].asScala
+        val it = entries.map(e => parseEntry(e.get(1)
+          .asInstanceOf[java.util.List[Array[Byte]]].asScala)).toList
         sourceContext.collect(it)
       }
       RedisUtils.checkMemory(jedis, 0.6, 0.5)
     }
   }
 
+  def parseEntry(fieldValues: Seq[Array[Byte]]): (String, String, String) = {
+    val fields = fieldValues.grouped(2).map(kv =>
+      (new String(kv.head, StandardCharsets.UTF_8), kv.last)).toMap
+    val serde = fields.get("serde").map(new String(_, StandardCharsets.UTF_8)).orNull
+    // latin-1 maps every byte to one char, PreProcessing restores the raw bytes
+    val charset = if (serde == Conventions.SERDE_ARROW_BINARY) {
+      StandardCharsets.ISO_8859_1
+    } else StandardCharsets.UTF_8
+    (fields.get("uri").map(new String(_, StandardCharsets.UTF_8)).orNull,
+      fields.get("data").map(new String(_, charset)).orNull,
+      serde)
+  }
+
   override def cancel(): Unit = {
     jedis.close()
     logger.info("Flink source cancelled")
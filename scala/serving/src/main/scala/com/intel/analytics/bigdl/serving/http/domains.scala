@@ -648,6 +648,20 @@ object Instances {
           } else if (fieldVector.isInstanceOf[VarBinaryVector]) {
             val vector = fieldVector.asInstanceOf[VarBinaryVector]
             (vector.getName, new String(vector.getObject(0).asInstanceOf[Array[Byte]]))
+          } else if (fieldVector.isInstanceOf[FixedSizeListVector]) {
+            // fixed shape tensor, shape is stored in field metadata, e.g. "224,224,3"
+            val listVector = fieldVector.asInstanceOf[FixedSizeListVector]
+            val shapeStr = listVector.getField.getMetadata.get("shape")
+            val shape = new ArrayBuffer[Int]()
+            if (shapeStr != null && shapeStr.nonEmpty) {
+              shapeStr.split(",").foreach(s => shape.append(s.trim.toInt))
+            }
+            val dataFloatVector = listVector.getDataVector.asInstanceOf[Float4Vector]
+            val data = new ArrayBuffer[Float](dataFloatVector.getValueCount)
+            for (i <- 0 until dataFloatVector.getValueCount) {
+              data.append(dataFloatVector.get(i))
+            }
+            (listVector.getName, (shape, data, new ArrayBuffer[Int](), new ArrayBuffer[Int]()))
           } else if (fieldVector.isInstanceOf[StructVector]) {
             val structVector = fieldVector.asInstanceOf[StructVector]
             val shapeVector = structVector.getChild("shape")
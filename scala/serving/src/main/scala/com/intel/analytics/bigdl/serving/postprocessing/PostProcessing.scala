@@ -16,10 +16,12 @@
 
 package com.intel.analytics.bigdl.serving.postprocessing
 
+import java.nio.charset.StandardCharsets
 import java.util.Base64
 
 import com.intel.analytics.bigdl.dllib.nn.abstractnn.Activity
 import com.intel.analytics.bigdl.dllib.tensor.Tensor
+import com.intel.analytics.bigdl.serving.ClusterServing
 import com.intel.analytics.bigdl.serving.serialization.ArrowSerializer
 import com.intel.analytics.bigdl.serving.utils.TensorUtils
 import com.intel.analytics.bigdl.dllib.utils.Log4Error
@@ -157,7 +159,13 @@ object PostProcessing {
   def apply(t: Activity, filter: String = "", index: Int = -1): String = {
     if (filter == "") {
       val byteArr = ArrowSerializer.activityBatchToByte(t, index)
-      Base64.getEncoder.encodeToString(byteArr)
+      val helper = ClusterServing.helper
+      if (helper != null && helper.redisBinaryResult && helper.queueUsed == "redis") {
+        // latin-1 maps every byte to one char, so sink could restore the raw bytes
+        new String(byteArr, StandardCharsets.ISO_8859_1)
+      } else {
+        Base64.getEncoder.encodeToString(byteArr)
+      }
     }
     else {
       if (t.isTable) {
@@ -35,6 +35,7 @@ import org.opencv.imgproc.Imgproc
 
 import scala.collection.JavaConverters._
 import redis.clients.jedis.Jedis
+import java.nio.charset.StandardCharsets
 import com.intel.analytics.bigdl.dllib.utils.Log4Error
 
 class PreProcessing()
@@ -74,6 +75,10 @@ class PreProcessing()
       val instance = if (serde == "stream") {
         Seq(JsonInputDeserializer.deserialize(s, this))
 
+      } else if (serde == Conventions.SERDE_ARROW_BINARY) {
+        byteBuffer = s.getBytes(StandardCharsets.ISO_8859_1)
+        val ins = Instances.fromArrow(byteBuffer)
+        getInputFromInstance(ins)
       } else {
         byteBuffer = java.util.Base64.getDecoder.decode(s)
         val ins = Instances.fromArrow(byteBuffer)
@@ -91,7 +96,10 @@ class PreProcessing()
           val tmpJedis = RedisUtils.getRedisClient(ClusterServing.jedisPool)
           val hKey = Conventions.RESULT_PREFIX + ClusterServing.helper.jobName + ":" + key
           val hValue = Map[String, String]("value" -> "NaN").asJava
-          tmpJedis.hset(hKey, hValue)
+          val ppl = tmpJedis.pipelined()
+          ppl.hset(hKey, hValue)
+          RedisUtils.writeNotification(ppl, key, ClusterServing.helper.jobName)
+          ppl.sync()
           tmpJedis.close()
         }
 
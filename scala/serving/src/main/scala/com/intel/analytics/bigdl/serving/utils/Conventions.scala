@@ -25,6 +25,12 @@ object Conventions {
   val SECURE_TMP_DIR = "secure"
   val SERVING_CONF_TMP_PATH = "cluster-serving-conf.yaml"
   val RESULT_PREFIX = "cluster-serving_"
+  val RESULT_NOTIFY_PREFIX = "cluster-serving-notify_"
+  val RESULT_NOTIFY_EXPIRE_SECONDS = 60
+  // the notification only tells the result is ready, it is read from the result hash
+  val RESULT_NOTIFY_MARKER = "1"
+  // serde of records whose data field is raw Arrow IPC bytes instead of base64 string
+  val SERDE_ARROW_BINARY = "arrow"
   val TMP_MANAGER_YAML = "/tmp/cluster-serving-jobs.yaml"
   val ARROW_INT = new ArrowType.Int(32, true)
   val ARROW_FLOAT = new ArrowType.FloatingPoint(FloatingPointPrecision.SINGLE)
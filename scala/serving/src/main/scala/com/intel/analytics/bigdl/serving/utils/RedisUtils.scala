@@ -17,6 +17,8 @@
 package com.intel.analytics.bigdl.serving.utils
 
 import org.apache.logging.log4j.LogManager
+import java.nio.charset.StandardCharsets
+
 import redis.clients.jedis.exceptions.JedisConnectionException
 import redis.clients.jedis.{Jedis, JedisPool, Pipeline, StreamEntryID}
 
@@ -111,6 +113,30 @@ object RedisUtils {
     val hValue = Map[String, String]("value" -> value).asJava
     ppl.hmset(hKey, hValue)
   }
+  /**
+   * Push a marker to a per-request notification list after the result hash is written,
+   * so that the client could do a blocking pop with timeout instead of polling the
+   * result hash. The result is only kept in the hash, and the list expires if nobody
+   * consumes it.
+   */
+  def writeNotification(ppl: Pipeline, key: String, name: String): Unit = {
+    val notifyKey = Conventions.RESULT_NOTIFY_PREFIX + name + ":" + key
+    ppl.rpush(notifyKey, Conventions.RESULT_NOTIFY_MARKER)
+    ppl.expire(notifyKey, Conventions.RESULT_NOTIFY_EXPIRE_SECONDS)
+  }
+  /**
+   * Binary version of writeHashMap and writeNotification, value is a latin-1 string
+   * holding raw bytes, see PostProcessing
+   */
+  def writeBinary(ppl: Pipeline, key: String, value: String, name: String): Unit = {
+    val hKey = (Conventions.RESULT_PREFIX + name + ":" + key).getBytes(StandardCharsets.UTF_8)
+    val notifyKey = (Conventions.RESULT_NOTIFY_PREFIX + name + ":" + key)
+      .getBytes(StandardCharsets.UTF_8)
+    val bytes = value.getBytes(StandardCharsets.ISO_8859_1)
+    ppl.hset(hKey, "value".getBytes(StandardCharsets.UTF_8), bytes)
+    ppl.rpush(notifyKey, Conventions.RESULT_NOTIFY_MARKER.getBytes(StandardCharsets.UTF_8))
+    ppl.expire(notifyKey, Conventions.RESULT_NOTIFY_EXPIRE_SECONDS)
+  }
   def writeXstream(ppl: Pipeline, key: String, value: String, name: String): Unit = {
     val streamKey = Conventions.RESULT_PREFIX + name + ":" + key
     val streamValue = Map[String, String]("value" -> value).asJava